@@ -0,0 +1,98 @@
+"""
+This module contains the AsyncBattleTower class
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Tuple
+from poke_team import Trainer
+from tower import BattleTower
+
+
+class AsyncBattleTower:
+    """
+    Drives a BattleTower from an asyncio event loop. Battles are played round by round, giving control back to the
+    event loop every round_interval rounds, or played whole in an executor, so that many towers can run concurrently
+    without blocking other coroutines.
+    """
+
+    DEFAULT_ROUND_INTERVAL = 50
+
+    def __init__(self, tower: BattleTower, round_interval: int = DEFAULT_ROUND_INTERVAL,
+                 executor: Executor = None) -> None:
+        """
+        Initializes a new instance of the AsyncBattleTower class.
+
+        :complexity: Best and worst case is O(1)
+
+        Args:
+            tower (BattleTower): The tower to drive, with the player and enemy trainers already set.
+            round_interval (int, optional): The number of rounds played between each yield to the event loop.
+                                            Defaults to DEFAULT_ROUND_INTERVAL.
+            executor (Executor, optional): If given, each battle is played whole in this executor instead of round by
+                                           round. The battle is shared with the executor, so it must run in this
+                                           process, such as a ThreadPoolExecutor. Defaults to None.
+        """
+        self.tower = tower
+        self.round_interval = max(1, round_interval)
+        self.executor = executor
+
+    async def play_battle(self, enemy: Trainer) -> Trainer | None:
+        """
+        Plays one battle between the player team and an enemy team that has been served from the queue, and updates
+        the lives of both.
+
+        :complexity: Best and worse case O(n*max(k1,k2) + r), the same as the play_battle method of the BattleTower.
+
+        Args:
+            enemy (Trainer): The enemy trainer served from the queue.
+
+        Returns:
+            Trainer | None: The winning trainer of the battle, None if it is a draw
+        """
+        battle = self.tower.prepare_battle(enemy)
+        if self.executor is not None:
+            winner = await asyncio.get_running_loop().run_in_executor(self.executor, battle.commence_battle)
+        else:
+            rounds_played = 0
+            for _ in battle.rounds():
+                rounds_played += 1
+                if rounds_played % self.round_interval == 0:
+                    await asyncio.sleep(0)
+            winner = battle.get_winner()
+        self.tower.record_battle(enemy, winner)
+        return winner
+
+    async def next_battle(self) -> Tuple[Trainer, Trainer, Trainer, int, int]:
+        """
+        Plays one battle in the tower, between the player team and the next enemy team.
+
+        :complexity: Best and worse case O(n*max(k1,k2) + r), the same as the next_battle method of the BattleTower.
+
+        Returns:
+            Tuple[Trainer, Trainer, Trainer, int, int]: The battle result, the player trainer, the enemy trainer,
+            the player lives remaining after the battle, and the enemy lives remaining after the battle
+        """
+        enemy = self.tower.enemies.serve()
+        winner = await self.play_battle(enemy)
+        return winner, self.tower.trainer, enemy, self.tower.trainer.lives, self.tower.enemy_lives
+
+    async def results(self):
+        """
+        Yields the result of each battle, in the same format as next_battle, until there are no battles remaining.
+
+        :complexity: Best and worse case O(b*p) where b is the number of battles remaining and p is the complexity of
+                     next_battle.
+        """
+        while self.tower.battles_remaining():
+            yield await self.next_battle()
+
+    def __aiter__(self):
+        """
+        Returns an async iterator over the result of each remaining battle.
+
+        :complexity: Best and worst case is O(1)
+        """
+        return self.results()
@@ -1,20 +1,134 @@
 """
-This module contains the Battle Class
+This module contains the RoundSummary and Battle Classes
 """
 
 __author__ = "Jonah Yip Mathivanan"
 
-from math import ceil
-from pokemon import Pokemon
+from array import array
+from math import ceil, nan
+from pokemon import Pokemon, TypeEffectiveness
 from poke_team import Trainer, PokeTeam
 from battle_mode import BattleMode
+from damage_model import DamageModel, DefaultDamage
+from outcome import get_outcome
+
+
+class RoundSummary:
+    """
+    Represents the outcome of one round of a battle, returned by the step method of the Battle class.
+    """
+
+    def __init__(self, round_number: int, pokemon_1: Pokemon, pokemon_2: Pokemon, team_count_1: int,
+                 team_count_2: int) -> None:
+        """
+        Initializes a new instance of the RoundSummary class.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            round_number (int): The number of rounds played so far in the battle, including this one.
+            pokemon_1 (Pokemon): Trainer 1's pokemon that fought in the round
+            pokemon_2 (Pokemon): Trainer 2's pokemon that fought in the round
+            team_count_1 (int): The number of Pokemon left in trainer 1's team after the round
+            team_count_2 (int): The number of Pokemon left in trainer 2's team after the round
+        """
+        self.round_number = round_number
+        self.name_1 = pokemon_1.get_name()
+        self.name_2 = pokemon_2.get_name()
+        self.health_1 = pokemon_1.get_health()
+        self.health_2 = pokemon_2.get_health()
+        self.team_count_1 = team_count_1
+        self.team_count_2 = team_count_2
+
+    def __str__(self) -> str:
+        """
+        Returns a string of the following format:
+        Round <round_number>: <name_1> (<health_1> health) vs <name_2> (<health_2> health)
+
+        :complexity: Best and worse case O(1)
+
+        Returns:
+            str: The round summary as a string.
+        """
+        return (f"Round {self.round_number}: {self.name_1} ({self.health_1} health) vs {self.name_2} "
+                f"({self.health_2} health)")
+
+
+def get_completion_tables(completions) -> tuple[array, array]:
+    """
+    Returns the Pokedex completion ratio of trainer 1 over trainer 2 and its reciprocal for every pair of numbers of
+    types seen, where the ratio for counts k1 and k2 is at index k1*n + k2 and n is the number of completions. Each
+    value is computed with the same division as the battle loops and battle rounds, and is NaN where that division
+    would be by zero.
+
+    :complexity: Best and worse case O(n^2) where n is the number of completions.
+
+    Args:
+        completions (array): The Pokedex completion for each number of types seen.
+
+    Returns:
+        tuple[array, array]: The ratios and their reciprocals.
+    """
+    size = len(completions)
+    ratios = array("d", bytes(8 * size * size))
+    inverses = array("d", bytes(8 * size * size))
+    for seen_1 in range(size):
+        for seen_2 in range(size):
+            index = seen_1 * size + seen_2
+            ratio = completions[seen_1] / completions[seen_2] if completions[seen_2] != 0 else nan
+            ratios[index] = ratio
+            inverses[index] = 1 / ratio if ratio != 0 else nan
+    return ratios, inverses
+
+
+def play_match(species_1: list, species_2: list, battle_mode: BattleMode, criterion: str = "health") -> int:
+    """
+    Plays a battle between two new teams of the given species, in the given order, with each team structured for the
+    battle mode by regenerate_team.
+
+    :complexity: Best and worse case O(n*m + b) where n is the number of Pokemon in each team, m is the number of
+                 Pokemon in the POKE_LIST and b is the complexity of commence_battle.
+
+    Args:
+        species_1 (list): The Pokemon classes, or the names of the Pokemon classes, in team 1.
+        species_2 (list): The Pokemon classes, or the names of the Pokemon classes, in team 2.
+        battle_mode (BattleMode): The battle mode.
+        criterion (str, optional): The criterion to sort the teams for Optimise mode. Defaults to "health".
+
+    Returns:
+        int: WIN, LOSS or DRAW for team 1.
+    """
+    trainer_1 = Trainer("Team 1")
+    trainer_2 = Trainer("Team 2")
+    trainer_1.pick_species(species_1)
+    trainer_2.pick_species(species_2)
+    trainer_1.get_team().regenerate_team(battle_mode, criterion)
+    trainer_2.get_team().regenerate_team(battle_mode, criterion)
+    winner = Battle(trainer_1, trainer_2, battle_mode, criterion).commence_battle()
+    return get_outcome(winner, trainer_1, trainer_2)
 
 
 class Battle:
-    def __init__(self, trainer_1: Trainer, trainer_2: Trainer, battle_mode: BattleMode, criterion="health") -> None:
+    TERMINATION_MODES = ["safe", "approximate"]
+    CHECK_INTERVAL = 10
+    COMPLETION_SIZE = len(Trainer.COMPLETIONS)
+    COMPLETION_RATIOS, COMPLETION_INVERSES = get_completion_tables(Trainer.COMPLETIONS)
+
+    def __init__(self, trainer_1: Trainer, trainer_2: Trainer, battle_mode: BattleMode, criterion="health",
+                 termination: str = None, confidence: float = 0.95, damage_model: DamageModel = None) -> None:
         """
         Initializes a new instance of the Battle class.
 
+        The battle keeps the TypeEffectiveness tables that are current when it is created, so a reload of the type
+        effectiveness CSV only affects battles created after it.
+
+        The damage of each attack is found by the damage model. The standard formula of DefaultDamage is computed in
+        battle_attack directly, so only other models are called for each attack.
+
+        With a termination mode, commence_battle checks every CHECK_INTERVAL rounds whether the winner is already
+        known and stops the battle early if it is, setting cut_short. The "safe" mode only stops when the winner is
+        certain, while the "approximate" mode also stops when one team is estimated to win with the given confidence.
+
         :complexity: Best and worse case O(1)
 
         Args:
@@ -22,40 +136,133 @@ class Battle:
             trainer_2 (Trainer): Another trainer in the battle
             battle_mode (BattleMode): The battle mode
             criterion (str, optional): The criterion to sort the team for Optimise mode. Defaults to "health".
+            termination (str, optional): "safe" or "approximate" to stop the battle early. Defaults to None.
+            confidence (float, optional): The confidence needed to stop early in the approximate mode. Defaults to
+                                          0.95.
+            damage_model (DamageModel, optional): The damage formula. Defaults to None for DefaultDamage.
+
+        Raises:
+            Exception: If the termination mode is not valid
+            Exception: If the confidence is not between 0.5 and 1
         """
+        if termination is not None and termination not in self.TERMINATION_MODES:
+            raise Exception("Invalid termination")
+        if not 0.5 <= confidence < 1:
+            raise Exception("Invalid confidence")
         self.trainer_1 = trainer_1
         self.trainer_2 = trainer_2
         self.battle_mode = battle_mode
         self.criterion = criterion
+        self.termination = termination
+        self.confidence = confidence
+        self.cut_short = False
+        self.predicted_winner = None
+        self.tables = TypeEffectiveness.TABLES
+        self.flat_table = self.tables.flat_table
+        self.damage_model = DefaultDamage() if damage_model is None else damage_model
+        self.model_damage = None if type(self.damage_model) is DefaultDamage else self.damage_model.get_damage
+        # Looks up the criterion once so that each OPTIMISE round reads the order attribute directly
+        self.order_getter = PokeTeam.get_order_getter(criterion) if battle_mode.value == 2 else None
+        self.rounds_played = 0
+        self._round_generator = None
 
     def commence_battle(self) -> Trainer | None:
         """
         Commences the battle between two trainers
 
-        :complexity: If the battle mode is Set, Best case O(n*max(k1,k2)) if each of a trainer's pokemon faints in one
-                     round, and worse case O(n*(m+max(k1,k2))) if it takes multiple rounds for pokemon to faint, where n
-                     is the number of pokemon in each team, m is the number of rounds played until one of the pokemon
-                     wins and k1 and k2 are the size of the bit vector of the Pokedex for trainer 1 and 2.
-                     If the battle mode is Rotate, best and worse case O(n*max(k1,k2)), where n is the number of rounds
-                     played until one of the teams win and k1 and k2 are the size of the bit vector of the Pokedex for
-                     trainer 1 and 2.
-                     If the battle mode is Optimise, best and worse case O(n*(m+max(k1,k2))), where n is the number of
-                     rounds played until one of the teams win, m is the number of pokemon in each team and k1 and k2 are
-                     the size of the bit vector of the Pokedex for trainer 1 and 2.
+        :complexity: If the battle mode is Set, Best case O(n) if each of a trainer's pokemon faints in one round, and
+                     worse case O(n*m) if it takes multiple rounds for pokemon to faint, where n is the number of
+                     pokemon in each team and m is the number of rounds played until one of the pokemon wins.
+                     If the battle mode is Rotate, best and worse case O(n), where n is the number of rounds played
+                     until one of the teams win.
+                     If the battle mode is Optimise, best and worse case O(n*m), where n is the number of rounds played
+                     until one of the teams win and m is the number of pokemon in each team.
 
         Returns:
             Trainer | None: The winning trainer of the battle, None if it is a draw
         """
+        # Continues from the last step if the battle has been advanced with step
+        round_generator = self._round_generator if self._round_generator is not None else self.rounds()
+        rounds_played = self.rounds_played
+        termination = self.termination
+        for _ in round_generator:
+            rounds_played += 1
+            if termination is not None and rounds_played % self.CHECK_INTERVAL == 0:
+                if termination == "safe":
+                    predicted_winner = self.get_safe_winner()
+                else:
+                    predicted_winner = self.get_approximate_winner()
+                if predicted_winner is not None:
+                    self.cut_short = True
+                    self.predicted_winner = predicted_winner
+                    break
+        self.rounds_played = rounds_played
+        self._round_generator = None
+        return self.get_winner()
+
+    def rounds(self):
+        """
+        Plays the battle one round at a time in the battle mode, yielding the two Pokemon that fought after each round
+        so the caller can pause the battle between rounds. The winner can be found with get_winner once the generator
+        is exhausted.
+
+        :complexity: Per round, the same as set_rounds, rotate_rounds or optimise_rounds for the battle mode. Over the
+                     whole battle, the same as commence_battle.
+        """
         # Assigns the battle modes
         mode_value = self.battle_mode.value
         if mode_value == 0:
-            winning_team = self.set_battle()
+            yield from self.set_rounds()
         elif mode_value == 1:
-            winning_team = self.rotate_battle()
+            yield from self.rotate_rounds()
         elif mode_value == 2:
-            winning_team = self.optimise_battle()
+            yield from self.optimise_rounds()
+
+    def step(self) -> RoundSummary | None:
+        """
+        Plays the next round of the battle, so that a battle can be advanced one round at a time and interleaved with
+        other battles or stopped early.
+
+        :complexity: Best and worse case the same as one round of the rounds method.
 
-        # Gets the winner of the battle
+        Returns:
+            RoundSummary | None: The summary of the round, or None if the battle has already finished, in which case
+            the winner can be found with get_winner.
+        """
+        if self._round_generator is None:
+            self._round_generator = self.rounds()
+        fighters = next(self._round_generator, None)
+        if fighters is None:
+            return None
+        self.rounds_played += 1
+        pokemon_1, pokemon_2 = fighters
+        return RoundSummary(self.rounds_played, pokemon_1, pokemon_2, len(self.trainer_1.get_team()),
+                            len(self.trainer_2.get_team()))
+
+    def steps(self):
+        """
+        Yields the summary of each remaining round of the battle.
+
+        :complexity: Best and worse case the same as commence_battle over the remaining rounds.
+        """
+        summary = self.step()
+        while summary is not None:
+            yield summary
+            summary = self.step()
+
+    def get_winner(self) -> Trainer | None:
+        """
+        Gets the winning trainer of the battle once it has finished
+
+        :complexity: Best and worse case O(1)
+
+        Returns:
+            Trainer | None: The winning trainer of the battle, or the predicted winner if the battle was cut short,
+            None if it is a draw
+        """
+        if self.cut_short:
+            return self.predicted_winner
+        winning_team = self.get_battle_winner()
         if winning_team == self.trainer_1.get_team():
             winner = self.trainer_1
         elif winning_team == self.trainer_2.get_team():
@@ -64,6 +271,151 @@ class Battle:
             winner = None
         return winner
 
+    def snapshot(self) -> tuple:
+        """
+        Returns the state of both trainers in the battle as a tuple of values, so that the battle can be restored to
+        this point later, for example to branch a simulation from the middle of a battle.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in each team.
+
+        Returns:
+            tuple: The state of trainer 1 and trainer 2, and the number of rounds played.
+        """
+        return (self.trainer_1.snapshot(), self.trainer_2.snapshot(), self.rounds_played)
+
+    def restore(self, state: tuple) -> None:
+        """
+        Restores both trainers in the battle from a tuple returned by snapshot.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in each team.
+
+        Args:
+            state (tuple): The state of the battle returned by snapshot.
+        """
+        trainer_1_state, trainer_2_state, self.rounds_played = state
+        self.trainer_1.restore(trainer_1_state)
+        self.trainer_2.restore(trainer_2_state)
+        self._round_generator = None
+        self.cut_short = False
+        self.predicted_winner = None
+
+    @staticmethod
+    def get_team_bounds(trainer: Trainer) -> tuple[float, int, int, float]:
+        """
+        Returns values of the alive Pokemon of a trainer that bound how the rest of the battle can go. Evolving
+        multiplies the health and battle power of a Pokemon by 1.5 for each stage left in its evolution line, so the
+        potential health and battle power assume every Pokemon evolves to its final stage.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the team.
+
+        Args:
+            trainer (Trainer): The trainer.
+
+        Returns:
+            tuple[float, int, int, float]: The total health, the total potential health rounded up for each Pokemon,
+            the number of alive Pokemon and the highest potential battle power.
+        """
+        team = trainer.get_team()
+        potential_health = 0
+        max_battle_power = 0
+        for pokemon in team.original_team:
+            if pokemon.health > 0:
+                growth = 1.5 ** (pokemon.FINAL_STAGE - pokemon.stage)
+                potential_health += ceil(pokemon.health * growth)
+                max_battle_power = max(max_battle_power, pokemon.battle_power * growth)
+        return team.get_total_health(), potential_health, team.get_alive_count(), max_battle_power
+
+    @staticmethod
+    def get_max_multiplier(attacking_trainer: Trainer, defending_trainer: Trainer, flat_table=None) -> float:
+        """
+        Returns the highest type effectiveness of an alive Pokemon of one trainer against an alive Pokemon of the
+        other.
+
+        :complexity: Best and worse case O(n^2) where n is the number of Pokemon in each team.
+
+        Args:
+            attacking_trainer (Trainer): The trainer of the attacking Pokemon.
+            defending_trainer (Trainer): The trainer of the defending Pokemon.
+            flat_table (array, optional): The flat type effectiveness table to use. Defaults to None for the current
+                                          TypeEffectiveness.FLAT_TABLE.
+
+        Returns:
+            float: The highest multiplier.
+        """
+        if flat_table is None:
+            flat_table = TypeEffectiveness.FLAT_TABLE
+        multiplier = 0
+        for attacking_pokemon in attacking_trainer.get_team().original_team:
+            if attacking_pokemon.health > 0:
+                for defending_pokemon in defending_trainer.get_team().original_team:
+                    if defending_pokemon.health > 0:
+                        multiplier = max(multiplier, flat_table[attacking_pokemon.TYPE_OFFSET
+                                                                + defending_pokemon.TYPE_ID])
+        return multiplier
+
+    def get_safe_winner(self) -> Trainer | None:
+        """
+        Returns the winner of the battle if it is certain, without playing the remaining rounds.
+
+        Every round either a Pokemon faints or both Pokemon lose at least 1 health, so a team is empty within its
+        total potential health plus the number of alive Pokemon of both teams in rounds. A team loses at most the
+        largest damage the other team can deal plus 1 health each round, where the damage is bounded by the potential
+        battle power, the highest type effectiveness and the Pokedex ratio, since a Pokedex never shrinks and the
+        completion of the other trainer is at most 1. A team wins if the other team must be empty before it can be.
+        The damage bound only holds for the standard formula, so the winner is never certain with another damage model.
+
+        :complexity: Best and worse case O(n^2) where n is the number of Pokemon in each team.
+
+        Returns:
+            Trainer | None: The certain winner, None if the winner is not yet certain.
+        """
+        if self.model_damage is not None:
+            return None
+        health_1, potential_1, alive_1, battle_power_1 = self.get_team_bounds(self.trainer_1)
+        health_2, potential_2, alive_2, battle_power_2 = self.get_team_bounds(self.trainer_2)
+        if alive_1 == 0 or alive_2 == 0:
+            return None
+        completion_1 = self.trainer_1.get_pokedex_completion()
+        completion_2 = self.trainer_2.get_pokedex_completion()
+
+        # The damage a Pokemon deals is at most its battle power rounded up, before the multipliers
+        max_damage_1 = ceil(ceil(battle_power_1) * self.get_max_multiplier(self.trainer_1, self.trainer_2,
+                                                                         self.flat_table) / completion_2)
+        max_damage_2 = ceil(ceil(battle_power_2) * self.get_max_multiplier(self.trainer_2, self.trainer_1,
+                                                                         self.flat_table) / completion_1)
+        max_rounds = alive_1 + alive_2
+        if (potential_2 + max_rounds) * (max_damage_2 + 1) < health_1:
+            return self.trainer_1
+        if (potential_1 + max_rounds) * (max_damage_1 + 1) < health_2:
+            return self.trainer_2
+        return None
+
+    def get_approximate_winner(self) -> Trainer | None:
+        """
+        Returns the likely winner of the battle, without playing the remaining rounds. Each team is estimated to need
+        the total health of the other team divided by the damage of its strongest Pokemon plus 1 in rounds to win,
+        and a team is predicted to win when the other team needs at least confidence / (1 - confidence) times as many
+        rounds. This is a heuristic, so the confidence is the odds of the estimate rather than a measured accuracy.
+
+        :complexity: Best and worse case O(1)
+
+        Returns:
+            Trainer | None: The likely winner, None if neither team is far enough ahead.
+        """
+        team_1 = self.trainer_1.get_team()
+        team_2 = self.trainer_2.get_team()
+        if team_1.get_alive_count() == 0 or team_2.get_alive_count() == 0:
+            return None
+        ratio = self.get_completion_ratio()[0]
+        rounds_1 = team_2.get_total_health() / (team_1.get_max_battle_power() * ratio + 1)
+        rounds_2 = team_1.get_total_health() / (team_2.get_max_battle_power() / ratio + 1)
+        odds = self.confidence / (1 - self.confidence)
+        if rounds_2 >= odds * rounds_1:
+            return self.trainer_1
+        if rounds_1 >= odds * rounds_2:
+            return self.trainer_2
+        return None
+
     def _create_teams(self) -> None:
         """
         Randomly picks a team for each trainer and assembles the battle team based on the battle mode and criterion
@@ -101,6 +453,26 @@ class Battle:
         self.trainer_2.register_pokemon(pokemon_1)
         self.trainer_2.register_pokemon(pokemon_2)
 
+    def get_completion_ratio(self) -> tuple[float, float]:
+        """
+        Returns the Pokedex completion ratio of trainer 1 over trainer 2 and its reciprocal, looked up in
+        COMPLETION_RATIOS and COMPLETION_INVERSES by the number of types in each Pokedex.
+
+        :complexity: Best and worse case O(1)
+
+        Raises:
+            ZeroDivisionError: If the Pokedex of either trainer is empty, the same as dividing by its completion
+
+        Returns:
+            tuple[float, float]: The ratio and its reciprocal.
+        """
+        index = (self.trainer_1.pokedex.elems.bit_count() * self.COMPLETION_SIZE
+                 + self.trainer_2.pokedex.elems.bit_count())
+        inverse = self.COMPLETION_INVERSES[index]
+        if inverse != inverse:
+            raise ZeroDivisionError("float division by zero")
+        return self.COMPLETION_RATIOS[index], inverse
+
     def battle_attack(self, attacking_pokemon: Pokemon, defending_pokemon: Pokemon, ratio: float) -> None:
         """
         Calculates the attacking damage and defends the defending pokemon
@@ -112,10 +484,15 @@ class Battle:
             defending_pokemon (Pokemon): The defending pokemon
             ratio (float): The pokedex completion ratio of the attacker over the defender
         """
-        attacking_damage = ceil(attacking_pokemon.attack(defending_pokemon) * ratio)
+        model_damage = self.model_damage
+        if model_damage is None:
+            attacking_damage = ceil(attacking_pokemon.attack(defending_pokemon, self.flat_table) * ratio)
+        else:
+            attacking_damage = model_damage(attacking_pokemon, defending_pokemon, ratio, self.flat_table)
         defending_pokemon.defend(attacking_damage)
 
-    def faster_round(self, pokemon_1: Pokemon, pokemon_2: Pokemon, ratio: float) -> Pokemon | None:
+    def faster_round(self, pokemon_1: Pokemon, pokemon_2: Pokemon, ratio: float,
+                     inverse: float = None) -> Pokemon | None:
         """
         Plays round where the pokemon_1 of trainer 1 is faster than pokemon_2 of trainer 2
 
@@ -125,17 +502,21 @@ class Battle:
             pokemon_1 (Pokemon): Trainer 1's current pokemon
             pokemon_2 (Pokemon): Trainer 2's current pokemon
             ratio (float): The pokedex completion ratio of the attacker over the defender
+            inverse (float, optional): The reciprocal of the ratio. Defaults to None, where it is computed as 1 / ratio.
 
         Returns:
             Pokemon | None: The winning pokemon of the battle round if a pokemon wins, else None
         """
+        if inverse is None:
+            inverse = 1 / ratio
         self.battle_attack(pokemon_1, pokemon_2, ratio)
         if not pokemon_2.is_alive():
             return self.end_round(pokemon_1, pokemon_2)
-        self.battle_attack(pokemon_2, pokemon_1, 1 / ratio)
+        self.battle_attack(pokemon_2, pokemon_1, inverse)
         return self.end_round(pokemon_1, pokemon_2)
 
-    def slower_round(self, pokemon_1: Pokemon, pokemon_2: Pokemon, ratio: float) -> Pokemon | None:
+    def slower_round(self, pokemon_1: Pokemon, pokemon_2: Pokemon, ratio: float,
+                     inverse: float = None) -> Pokemon | None:
         """
         Plays round where the pokemon_1 of trainer 1 is slower than pokemon_2 of trainer 2
 
@@ -145,17 +526,21 @@ class Battle:
             pokemon_1 (Pokemon): Trainer 1's current pokemon
             pokemon_2 (Pokemon): Trainer 2's current pokemon
             ratio (float): The pokedex completion ratio of the attacker over the defender
+            inverse (float, optional): The reciprocal of the ratio. Defaults to None, where it is computed as 1 / ratio.
 
         Returns:
             Pokemon | None: The winning pokemon of the battle round if a pokemon wins, else None
         """
-        self.battle_attack(pokemon_2, pokemon_1, 1 / ratio)
+        if inverse is None:
+            inverse = 1 / ratio
+        self.battle_attack(pokemon_2, pokemon_1, inverse)
         if not pokemon_1.is_alive():
             return self.end_round(pokemon_1, pokemon_2)
         self.battle_attack(pokemon_1, pokemon_2, ratio)
         return self.end_round(pokemon_1, pokemon_2)
 
-    def simultaneous_round(self, pokemon_1: Pokemon, pokemon_2: Pokemon, ratio: float) -> Pokemon | None:
+    def simultaneous_round(self, pokemon_1: Pokemon, pokemon_2: Pokemon, ratio: float,
+                           inverse: float = None) -> Pokemon | None:
         """
         Plays round where the pokemon_1 of trainer 1 and pokemon_2 of trainer 2 have the same speed
 
@@ -165,13 +550,16 @@ class Battle:
             pokemon_1 (Pokemon): Trainer 1's current pokemon
             pokemon_2 (Pokemon): Trainer 2's current pokemon
             ratio (float): The pokedex completion ratio of the attacker over the defender
+            inverse (float, optional): The reciprocal of the ratio. Defaults to None, where it is computed as 1 / ratio.
 
         Returns:
             Pokemon | None: The winning pokemon of the battle round if a pokemon wins, else None
         """
+        if inverse is None:
+            inverse = 1 / ratio
         # If both pokemon have the same speed
         self.battle_attack(pokemon_1, pokemon_2, ratio)
-        self.battle_attack(pokemon_2, pokemon_1, 1 / ratio)
+        self.battle_attack(pokemon_2, pokemon_1, inverse)
         return self.end_round(pokemon_1, pokemon_2)
 
     def end_round(self, pokemon_1: Pokemon, pokemon_2: Pokemon) -> Pokemon | None:
@@ -192,8 +580,8 @@ class Battle:
         if not pokemon_1.is_alive() and not pokemon_2.is_alive():
             return None
         elif pokemon_1.is_alive() and pokemon_2.is_alive():
-            pokemon_1.health -= 1
-            pokemon_2.health -= 1
+            pokemon_1.set_health(pokemon_1.health - 1)
+            pokemon_2.set_health(pokemon_2.health - 1)
             if pokemon_1.is_alive() and pokemon_2.is_alive():
                 return None
 
@@ -207,7 +595,8 @@ class Battle:
             pokemon_1.level_up()
             return pokemon_1
 
-    def battle_round(self, pokemon_1: Pokemon, pokemon_2: Pokemon, ratio: float) -> Pokemon | None:
+    def battle_round(self, pokemon_1: Pokemon, pokemon_2: Pokemon, ratio: float,
+                     inverse: float = None) -> Pokemon | None:
         """
         Plays a round of battle between two pokemon
 
@@ -217,20 +606,24 @@ class Battle:
             pokemon_1 (Pokemon): Trainer 1's current pokemon
             pokemon_2 (Pokemon): Trainer 2's current pokemon
             ratio (float): The pokedex completion ratio of the attacker over the defender
+            inverse (float, optional): The reciprocal of the ratio. Defaults to None, where it is computed as 1 / ratio.
 
         Returns:
             Pokemon | None: The winning pokemon of the battle round if a pokemon wins, else None
         """
+        if inverse is None:
+            inverse = 1 / ratio
         # Checks the speed of both pokemon and plays the round accordingly
         if pokemon_1.get_speed() > pokemon_2.get_speed():
-            winning_pokemon = self.faster_round(pokemon_1, pokemon_2, ratio)
+            winning_pokemon = self.faster_round(pokemon_1, pokemon_2, ratio, inverse)
         elif pokemon_1.get_speed() < pokemon_2.get_speed():
-            winning_pokemon = self.slower_round(pokemon_1, pokemon_2, ratio)
+            winning_pokemon = self.slower_round(pokemon_1, pokemon_2, ratio, inverse)
         else:
-            winning_pokemon = self.simultaneous_round(pokemon_1, pokemon_2, ratio)
+            winning_pokemon = self.simultaneous_round(pokemon_1, pokemon_2, ratio, inverse)
         return winning_pokemon
 
-    def battle_rounds(self, pokemon_1: Pokemon, pokemon_2: Pokemon, ratio: float) -> Pokemon | None:
+    def battle_rounds(self, pokemon_1: Pokemon, pokemon_2: Pokemon, ratio: float,
+                      inverse: float = None) -> Pokemon | None:
         """
         Plays multiple rounds of battle between two pokemon
 
@@ -241,13 +634,16 @@ class Battle:
             pokemon_1 (Pokemon): Trainer 1's current pokemon
             pokemon_2 (Pokemon): Trainer 2's current pokemon
             ratio (float): The pokedex completion ratio of the attacker over the defender
+            inverse (float, optional): The reciprocal of the ratio. Defaults to None, where it is computed as 1 / ratio.
 
         Returns:
             Pokemon | None: The winning pokemon of the battle round if a pokemon wins, else None
         """
+        if inverse is None:
+            inverse = 1 / ratio
         winning_pokemon = None
         while pokemon_1.is_alive() and pokemon_2.is_alive():
-            winning_pokemon = self.battle_round(pokemon_1, pokemon_2, ratio)
+            winning_pokemon = self.battle_round(pokemon_1, pokemon_2, ratio, inverse)
         return winning_pokemon
 
     def get_battle_winner(self) -> PokeTeam | None:
@@ -272,22 +668,36 @@ class Battle:
         """
         Plays the battle in Set mode
 
-        :complexity: Best case O(n*max(k1,k2)) if each of a trainer's pokemon faints in one round, and worse case
-                     O(n*(m+max(k1,k2))) if it takes multiple rounds for pokemon to faint, where n is the number of
-                     pokemon in each team, m is the number of rounds played until one of the pokemon wins and k1 and k2
-                     are the size of the bit vector of the Pokedex for trainer 1 and 2.
+        :complexity: Best case O(n) if each of a trainer's pokemon faints in one round, and worse case O(n*m) if it
+                     takes multiple rounds for pokemon to faint, where n is the number of pokemon in each team and m is
+                     the number of rounds played until one of the pokemon wins.
 
         Returns:
             PokeTeam | None: The winning PokeTeam of the battle, else None if it is a draw
         """
+        for _ in self.set_rounds():
+            pass
+        return self.get_battle_winner()
+
+    def set_rounds(self):
+        """
+        Plays the battle in Set mode, yielding the two Pokemon that fought after each round
+
+        :complexity: Best and worse case O(1) per round.
+        """
         team1 = self.trainer_1.get_team().team
         team2 = self.trainer_2.get_team().team
         while not team1.is_empty() and not team2.is_empty():
             pokemon_1 = team1.peek()
             pokemon_2 = team2.peek()
             self.update_pokedexes(pokemon_1, pokemon_2)
-            ratio = self.trainer_1.get_pokedex_completion() / self.trainer_2.get_pokedex_completion()
-            winning_pokemon = self.battle_rounds(pokemon_1, pokemon_2, ratio)
+            ratio, inverse = self.get_completion_ratio()
+            # Plays the same rounds as battle_rounds, pausing between them
+            winning_pokemon = None
+            while pokemon_1.is_alive() and pokemon_2.is_alive():
+                winning_pokemon = self.battle_round(pokemon_1, pokemon_2, ratio, inverse)
+                if pokemon_1.is_alive() and pokemon_2.is_alive():
+                    yield pokemon_1, pokemon_2
             if winning_pokemon is pokemon_1:
                 team2.pop()
             elif winning_pokemon is pokemon_2:
@@ -295,55 +705,74 @@ class Battle:
             else:
                 team1.pop()
                 team2.pop()
-        return self.get_battle_winner()
+            yield pokemon_1, pokemon_2
 
     def rotate_battle(self) -> PokeTeam | None:
         """
         Plays the battle in Rotate mode
 
-        :complexity: Best and worse case O(n*max(k1,k2)), where n is the number of rounds played until one of the teams
-                     win and k1 and k2 are the size of the bit vector of the Pokedex for trainer 1 and 2.
+        :complexity: Best and worse case O(n), where n is the number of rounds played until one of the teams win.
 
         Returns:
             PokeTeam | None: The winning PokeTeam of the battle, else None if it is a draw
         """
+        for _ in self.rotate_rounds():
+            pass
+        return self.get_battle_winner()
+
+    def rotate_rounds(self):
+        """
+        Plays the battle in Rotate mode, yielding the two Pokemon that fought after each round
+
+        :complexity: Best and worse case O(1) per round.
+        """
         team1 = self.trainer_1.get_team().team
         team2 = self.trainer_2.get_team().team
         while not team1.is_empty() and not team2.is_empty():
             pokemon_1 = team1.serve()
             pokemon_2 = team2.serve()
             self.update_pokedexes(pokemon_1, pokemon_2)
-            ratio = self.trainer_1.get_pokedex_completion() / self.trainer_2.get_pokedex_completion()
-            self.battle_round(pokemon_1, pokemon_2, ratio)
+            ratio, inverse = self.get_completion_ratio()
+            self.battle_round(pokemon_1, pokemon_2, ratio, inverse)
             if pokemon_1.is_alive():
                 team1.append(pokemon_1)
             if pokemon_2.is_alive():
                 team2.append(pokemon_2)
-        return self.get_battle_winner()
+            yield pokemon_1, pokemon_2
 
     def optimise_battle(self) -> PokeTeam | None:
         """
         Plays the battle in Optimise mode
 
-        :complexity: Best and worse case O(n*(m+max(k1,k2))), where n is the number of rounds played until one of the
-                     teams win, m is the number of pokemon in each team and k1 and k2 are the size of the bit vector of
-                     the Pokedex for trainer 1 and 2.
+        :complexity: Best and worse case O(n*m), where n is the number of rounds played until one of the teams win
+                     and m is the number of pokemon in each team.
 
         Returns:
             PokeTeam | None: The winning PokeTeam of the battle, else None if it is a draw
         """
-        team1 = self.trainer_1.get_team().team
-        team2 = self.trainer_2.get_team().team
+        for _ in self.optimise_rounds():
+            pass
+        return self.get_battle_winner()
+
+    def optimise_rounds(self):
+        """
+        Plays the battle in Optimise mode, yielding the two Pokemon that fought after each round. The Pokemon at the
+        front of each team fight in place and are then moved to their new position with reorder_front.
+
+        :complexity: Best case O(log m) per round if both Pokemon stay at the front, and worse case O(m) if they move
+                     to the end, where m is the number of pokemon in each team.
+        """
+        poke_team_1 = self.trainer_1.get_team()
+        poke_team_2 = self.trainer_2.get_team()
+        team1 = poke_team_1.team
+        team2 = poke_team_2.team
+        order_getter = self.order_getter
         while not team1.is_empty() and not team2.is_empty():
-            pokemon_1_item = team1.delete_at_index(0)
-            pokemon_2_item = team2.delete_at_index(0)
-            pokemon_1_key = pokemon_1_item.key
-            pokemon_2_key = pokemon_2_item.key
-            pokemon_1 = pokemon_1_item.value
-            pokemon_2 = pokemon_2_item.value
+            pokemon_1 = team1.array[0].value
+            pokemon_2 = team2.array[0].value
             self.update_pokedexes(pokemon_1, pokemon_2)
-            ratio = self.trainer_1.get_pokedex_completion() / self.trainer_2.get_pokedex_completion()
-            self.battle_round(pokemon_1, pokemon_2, ratio)
-            self.trainer_1.get_team().update_optimise_team(pokemon_1, pokemon_1_key, self.criterion)
-            self.trainer_2.get_team().update_optimise_team(pokemon_2, pokemon_2_key, self.criterion)
-        return self.get_battle_winner()
+            ratio, inverse = self.get_completion_ratio()
+            self.battle_round(pokemon_1, pokemon_2, ratio, inverse)
+            poke_team_1.reorder_front(order_getter)
+            poke_team_2.reorder_front(order_getter)
+            yield pokemon_1, pokemon_2
@@ -0,0 +1,208 @@
+"""
+This module contains benchmarks for the battle engine, run with: python benchmark.py
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+import gc
+import random
+import sys
+import time
+from battle import Battle
+from battle_mode import BattleMode
+from completion_reference import DivisionBattle, check_completion_tables
+from damage_model import DamageModel, DefaultDamage, LinearDamage
+from poke_team import Trainer
+from team_pool import TeamPool
+
+
+def play_battles(count: int, battle_mode: BattleMode, seed: int, pool: TeamPool = None,
+                 damage_model: DamageModel = None, battle_class: type = Battle) -> list:
+    """
+    Plays a number of battles between random teams. Without a pool, every battle creates new trainers and teams, the
+    same as creating a Battle and calling _create_teams. With a pool, the same two trainers are used for every battle
+    and release their teams to the pool after each one.
+
+    :complexity: Best and worse case O(c*b) where c is the number of battles and b is the complexity of
+                 commence_battle.
+
+    Args:
+        count (int): The number of battles.
+        battle_mode (BattleMode): The battle mode.
+        seed (int): The seed used to pick the teams.
+        pool (TeamPool, optional): The pool to reuse Pokemon and ADTs from. Defaults to None.
+        damage_model (DamageModel, optional): The damage formula of every battle. Defaults to None for DefaultDamage.
+        battle_class (type, optional): The class of every battle. Defaults to Battle.
+
+    Returns:
+        list: The name of the winning trainer of each battle, None for a draw.
+    """
+    random.seed(seed)
+    winners = []
+    if pool is None:
+        for _ in range(count):
+            battle = battle_class(Trainer("Gary"), Trainer("Ash"), battle_mode, damage_model=damage_model)
+            battle._create_teams()
+            winner = battle.commence_battle()
+            winners.append(winner.get_name() if winner is not None else None)
+        return winners
+
+    trainer_1 = Trainer("Gary", pool)
+    trainer_2 = Trainer("Ash", pool)
+    for _ in range(count):
+        battle = battle_class(trainer_1, trainer_2, battle_mode, damage_model=damage_model)
+        battle._create_teams()
+        winner = battle.commence_battle()
+        winners.append(winner.get_name() if winner is not None else None)
+        trainer_1.release()
+        trainer_2.release()
+    return winners
+
+
+def count_allocations(function, *args) -> tuple[int, list[int]]:
+    """
+    Calls a function and counts the objects of Python classes it constructs, along with the number of garbage
+    collections of each generation. An object is counted when the __init__ of its own class is called, so the
+    __init__ of a parent class called with super() is not counted again.
+
+    :complexity: Best and worse case the same as the function, with the overhead of a profiler on every call.
+
+    Args:
+        function (Callable): The function to call.
+        args (tuple): The arguments of the function.
+
+    Returns:
+        tuple[int, list[int]]: The number of objects constructed and the number of collections of each generation.
+    """
+    constructed = 0
+    collections = [0, 0, 0]
+
+    def profile(frame, event, _):
+        nonlocal constructed
+        if event == "call" and frame.f_code.co_name == "__init__":
+            instance = frame.f_locals.get("self")
+            if instance is not None and getattr(type(instance).__init__, "__code__", None) is frame.f_code:
+                constructed += 1
+
+    def on_collect(phase, info):
+        if phase == "start":
+            collections[info["generation"]] += 1
+
+    gc.collect()
+    gc.callbacks.append(on_collect)
+    sys.setprofile(profile)
+    try:
+        function(*args)
+    finally:
+        sys.setprofile(None)
+        gc.callbacks.remove(on_collect)
+    return constructed, collections
+
+
+def benchmark_pooling(count: int = 2000, seed: int = 0) -> None:
+    """
+    Prints the objects constructed, garbage collections and time per battle with and without a TeamPool in each
+    battle mode, and checks that both give the same winners.
+
+    :complexity: Best and worse case O(c*b) where c is the number of battles and b is the complexity of
+                 commence_battle.
+
+    Args:
+        count (int, optional): The number of battles in each battle mode. Defaults to 2000.
+        seed (int, optional): The seed used to pick the teams. Defaults to 0.
+
+    Raises:
+        Exception: If the winners with and without a pool are different
+    """
+    print(f"Pooling, {count} battles per mode")
+    for battle_mode in BattleMode:
+        for label, pool in (("new", None), ("pooled", TeamPool())):
+            start = time.perf_counter()
+            winners = play_battles(count, battle_mode, seed, pool)
+            seconds = time.perf_counter() - start
+            constructed, collections = count_allocations(play_battles, count, battle_mode, seed, pool)
+            if pool is None:
+                expected = winners
+            elif winners != expected:
+                raise Exception("Pooled battles have different winners")
+            print(f"{battle_mode.name:>8} {label:>6}: {constructed / count:6.1f} objects/battle, "
+                  f"{sum(collections) * 1000 / count:6.1f} collections/1000 battles {collections}, "
+                  f"{seconds * 1e6 / count:7.1f} us/battle")
+
+
+class CalledDefaultDamage(DefaultDamage):
+    """
+    Represents the standard damage formula called through get_damage like any other DamageModel, so that the cost of
+    the call can be compared with the fast path of DefaultDamage.
+    """
+    pass
+
+
+def benchmark_damage_models(count: int = 2000, seed: int = 0) -> None:
+    """
+    Prints the time per battle of the default damage formula, the same formula called as a DamageModel and
+    LinearDamage in each battle mode, and checks that the default formula gives the same winners both ways.
+
+    :complexity: Best and worse case O(c*b) where c is the number of battles and b is the complexity of
+                 commence_battle.
+
+    Args:
+        count (int, optional): The number of battles in each battle mode. Defaults to 2000.
+        seed (int, optional): The seed used to pick the teams. Defaults to 0.
+
+    Raises:
+        Exception: If the default formula gives different winners when called as a DamageModel
+    """
+    print(f"Damage models, {count} battles per mode")
+    for battle_mode in BattleMode:
+        for label, damage_model in (("default", None), ("called", CalledDefaultDamage()), ("linear", LinearDamage())):
+            # The best of three runs, since a single run is easily slowed down by other processes
+            seconds = None
+            for _ in range(3):
+                start = time.perf_counter()
+                winners = play_battles(count, battle_mode, seed, damage_model=damage_model)
+                elapsed = time.perf_counter() - start
+                seconds = elapsed if seconds is None else min(seconds, elapsed)
+            if damage_model is None:
+                expected = winners
+            elif label == "called" and winners != expected:
+                raise Exception("Called default damage has different winners")
+            print(f"{battle_mode.name:>8} {label:>7}: {seconds * 1e6 / count:7.1f} us/battle")
+
+
+def benchmark_completion_tables(count: int = 2000, seed: int = 0) -> None:
+    """
+    Checks the Pokedex completion tables against division, then prints the time per battle with the tables and with
+    division in each battle mode, and checks that both give the same winners.
+
+    :complexity: Best and worse case O(c*b) where c is the number of battles and b is the complexity of
+                 commence_battle.
+
+    Args:
+        count (int, optional): The number of battles in each battle mode. Defaults to 2000.
+        seed (int, optional): The seed used to pick the teams. Defaults to 0.
+
+    Raises:
+        Exception: If the tables and division give different winners
+    """
+    check_completion_tables()
+    print(f"Pokedex completion tables, {count} battles per mode")
+    for battle_mode in BattleMode:
+        for label, battle_class in (("tables", Battle), ("division", DivisionBattle)):
+            seconds = None
+            for _ in range(3):
+                start = time.perf_counter()
+                winners = play_battles(count, battle_mode, seed, battle_class=battle_class)
+                elapsed = time.perf_counter() - start
+                seconds = elapsed if seconds is None else min(seconds, elapsed)
+            if battle_class is Battle:
+                expected = winners
+            elif winners != expected:
+                raise Exception("Completion tables give different winners")
+            print(f"{battle_mode.name:>8} {label:>8}: {seconds * 1e6 / count:7.1f} us/battle")
+
+
+if __name__ == "__main__":
+    benchmark_pooling()
+    benchmark_damage_models()
+    benchmark_completion_tables()
@@ -0,0 +1,51 @@
+"""
+This module contains the DivisionBattle class and check_completion_tables, which the Pokedex completion tables are
+checked against
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+from battle import Battle
+from poke_team import Trainer
+from poke_type import TypeEffectiveness
+
+
+class DivisionBattle(Battle):
+    """
+    Represents a battle that finds the Pokedex completion ratio by dividing the rounded completions of the trainers,
+    the way every battle did before the ratio tables, to check that the tables give the same battles.
+    """
+
+    def get_completion_ratio(self) -> tuple[float, float]:
+        """
+        Returns the Pokedex completion ratio of trainer 1 over trainer 2 and its reciprocal by division.
+
+        :complexity: Best and worse case O(k) where k is the size of the bit vector of the Pokedex.
+
+        Returns:
+            tuple[float, float]: The ratio and its reciprocal.
+        """
+        type_count = len(TypeEffectiveness())
+        ratio = round(len(self.trainer_1.pokedex) / type_count, 2) / round(len(self.trainer_2.pokedex) / type_count, 2)
+        return ratio, 1 / ratio
+
+
+def check_completion_tables() -> None:
+    """
+    Checks that every value of the Pokedex completion tables is the same float as the division it replaces.
+
+    :complexity: Best and worse case O(n^2) where n is the number of types.
+
+    Raises:
+        Exception: If a value in the tables is different from the division
+    """
+    type_count = len(TypeEffectiveness())
+    for seen in range(type_count + 1):
+        if Trainer.COMPLETIONS[seen] != round(seen / type_count, 2):
+            raise Exception("Completion table is different")
+    for seen_1 in range(1, type_count + 1):
+        for seen_2 in range(1, type_count + 1):
+            ratio = round(seen_1 / type_count, 2) / round(seen_2 / type_count, 2)
+            index = seen_1 * Battle.COMPLETION_SIZE + seen_2
+            if Battle.COMPLETION_RATIOS[index] != ratio or Battle.COMPLETION_INVERSES[index] != 1 / ratio:
+                raise Exception("Completion ratio table is different")
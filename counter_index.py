@@ -0,0 +1,168 @@
+"""
+This module contains the CounterIndex class
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+import os
+from array import array
+from pokemon import SPECIES_STATS, TypeEffectiveness, get_all_pokemon_types
+from pokemon_base import get_base_damage
+
+
+class CounterIndex:
+    """
+    Stores the expected damage of every species against every defending PokeType, and the species ranked from the
+    best counter of each type to the worst, so that team selection can find counters in O(1).
+
+    The expected damage of a species against a type is the get_base_damage of its base battle power against the base
+    defence of each species of that type, averaged over those species, and multiplied by the type effectiveness. By
+    default the index is built from the current TypeEffectiveness tables and is built again by refresh when they have
+    been reloaded. An index of another CSV is built again by refresh when the file has been modified.
+    """
+
+    def __init__(self, path: str = None) -> None:
+        """
+        Initializes a new instance of the CounterIndex class and builds the index.
+
+        :complexity: Best and worse case O(t^2 + s^2 + t*s*log s) where t is the number of types and s is the number of
+                     species.
+
+        Args:
+            path (str, optional): The type effectiveness CSV. Defaults to None for the current TypeEffectiveness
+                                  tables.
+        """
+        self.path = path
+        self.modified = None
+        self.version = None
+        self.species_count = len(SPECIES_STATS)
+        self.type_count = 0
+        self.damage = array("d")
+        self.ranked = array("b")
+        self.build()
+
+    def build(self) -> None:
+        """
+        Builds the expected damage and ranked counters of every type from the type effectiveness tables. A type with
+        no species is treated as having no defence.
+
+        :complexity: Best and worse case O(t^2 + s^2 + t*s*log s) where t is the number of types and s is the number of
+                     species.
+        """
+        if self.path is None:
+            tables = TypeEffectiveness.TABLES
+            self.version = tables.version
+            flat_table = tables.flat_table
+        else:
+            self.modified = os.stat(self.path).st_mtime_ns
+            flat_table = TypeEffectiveness.get_flat_table(TypeEffectiveness.get_effect_table(self.path))
+        type_count = int(len(flat_table) ** 0.5)
+        species_count = self.species_count
+        all_pokemon = get_all_pokemon_types()
+
+        defences = [[] for _ in range(type_count)]
+        for species_id in range(species_count):
+            defences[all_pokemon[species_id].TYPE_ID].append(SPECIES_STATS[species_id].defence)
+
+        damage = array("d", bytes(8 * type_count * species_count))
+        ranked = array("b", bytes(type_count * species_count))
+        for type_id in range(type_count):
+            type_defences = defences[type_id] or [0]
+            offset = type_id * species_count
+            for species_id in range(species_count):
+                attack = SPECIES_STATS[species_id].battle_power
+                multiplier = flat_table[all_pokemon[species_id].TYPE_ID * type_count + type_id]
+                total = sum(get_base_damage(attack, defence) for defence in type_defences)
+                damage[offset + species_id] = total / len(type_defences) * multiplier
+            order = sorted(range(species_count), key=lambda i: (-damage[offset + i], i))
+            ranked[offset:offset + species_count] = array("b", order)
+
+        self.type_count = type_count
+        self.damage = damage
+        self.ranked = ranked
+
+    def refresh(self) -> "CounterIndex":
+        """
+        Builds the index again if the TypeEffectiveness tables have been reloaded, or the CSV of the index has been
+        modified, since it was last built. The default index reloads the TypeEffectiveness tables first if their CSV
+        has been modified.
+
+        :complexity: Best case O(1) if the index is up to date, and worse case the complexity of reload and build.
+
+        Returns:
+            CounterIndex: This index.
+        """
+        if self.path is None:
+            # Picks up changes to the CSV of the current tables, which bump the version
+            TypeEffectiveness.reload_if_modified()
+            if TypeEffectiveness.VERSION != self.version:
+                self.build()
+        elif os.stat(self.path).st_mtime_ns != self.modified:
+            self.build()
+        return self
+
+    def get_expected_damage(self, species_id: int, type_id: int) -> float:
+        """
+        Returns the expected damage of a species against a defending type.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            species_id (int): The species ID of the attacker.
+            type_id (int): The PokeType value of the defender.
+
+        Returns:
+            float: The expected damage.
+        """
+        return self.damage[type_id * self.species_count + species_id]
+
+    def get_counter(self, type_id: int, rank: int = 0) -> int:
+        """
+        Returns the species with a rank against a defending type, where rank 0 is the best counter.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            type_id (int): The PokeType value of the defender.
+            rank (int, optional): The rank of the counter. Defaults to 0.
+
+        Returns:
+            int: The species ID of the counter.
+        """
+        return self.ranked[type_id * self.species_count + rank]
+
+    def get_counters(self, type_id: int, count: int) -> array:
+        """
+        Returns the best counters of a defending type, from best to worst.
+
+        :complexity: Best and worse case O(c) where c is the number of counters.
+
+        Args:
+            type_id (int): The PokeType value of the defender.
+            count (int): The number of counters.
+
+        Returns:
+            array: The species IDs of the counters.
+        """
+        offset = type_id * self.species_count
+        return self.ranked[offset:offset + min(count, self.species_count)]
+
+
+_counter_index = None
+
+
+def get_counter_index() -> CounterIndex:
+    """
+    Returns the CounterIndex of the current TypeEffectiveness tables, building it on the first call and again
+    whenever the tables have been reloaded or their CSV has been modified.
+
+    :complexity: Best case O(1) if the index is up to date, and worse case the complexity of CounterIndex.build.
+
+    Returns:
+        CounterIndex: The shared index.
+    """
+    global _counter_index
+    if _counter_index is None:
+        _counter_index = CounterIndex()
+        return _counter_index
+    return _counter_index.refresh()
@@ -0,0 +1,101 @@
+"""
+This module contains the DamageModel, DefaultDamage and LinearDamage classes
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+from abc import ABC, abstractmethod
+from math import ceil
+from pokemon_base import Pokemon
+
+
+class DamageModel(ABC):
+    """
+    Represents a formula for the damage of one attack in a battle, so that battles can be played with different
+    balance formulas. A Battle given a DamageModel calls get_damage for every attack.
+    """
+
+    @abstractmethod
+    def get_damage(self, attacking_pokemon: Pokemon, defending_pokemon: Pokemon, ratio: float, flat_table) -> int:
+        """
+        Returns the damage of an attack, which is passed to the defend method of the defending Pokemon.
+
+        :complexity: Depends on the formula.
+
+        Args:
+            attacking_pokemon (Pokemon): The attacking Pokemon.
+            defending_pokemon (Pokemon): The defending Pokemon.
+            ratio (float): The pokedex completion ratio of the attacker over the defender.
+            flat_table (array): The flat type effectiveness table of the battle.
+
+        Returns:
+            int: The damage of the attack.
+        """
+        pass
+
+
+class DefaultDamage(DamageModel):
+    """
+    Represents the standard damage formula of Pokemon.attack, scaled by the Pokedex ratio and rounded up. A Battle
+    given a DefaultDamage uses its own battle_attack instead of calling get_damage, which gives the same damage.
+    """
+
+    def get_damage(self, attacking_pokemon: Pokemon, defending_pokemon: Pokemon, ratio: float, flat_table) -> int:
+        """
+        Returns the damage of an attack with the standard formula.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            attacking_pokemon (Pokemon): The attacking Pokemon.
+            defending_pokemon (Pokemon): The defending Pokemon.
+            ratio (float): The pokedex completion ratio of the attacker over the defender.
+            flat_table (array): The flat type effectiveness table of the battle.
+
+        Returns:
+            int: The damage of the attack.
+        """
+        return ceil(attacking_pokemon.attack(defending_pokemon, flat_table) * ratio)
+
+
+class LinearDamage(DamageModel):
+    """
+    Represents a damage formula where the battle power and defence are weighted linearly instead of split into
+    three cases, with at least minimum damage before the type effectiveness.
+    """
+
+    def __init__(self, attack_weight: float = 1.0, defence_weight: float = 0.5, minimum: float = 1.0) -> None:
+        """
+        Initializes a new instance of the LinearDamage class.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            attack_weight (float, optional): The weight of the battle power of the attacker. Defaults to 1.0.
+            defence_weight (float, optional): The weight of the defence of the defender. Defaults to 0.5.
+            minimum (float, optional): The smallest damage before the type effectiveness. Defaults to 1.0.
+        """
+        self.attack_weight = attack_weight
+        self.defence_weight = defence_weight
+        self.minimum = minimum
+
+    def get_damage(self, attacking_pokemon: Pokemon, defending_pokemon: Pokemon, ratio: float, flat_table) -> int:
+        """
+        Returns the weighted battle power minus the weighted defence, multiplied by the type effectiveness and Pokedex
+        ratio, and rounded up.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            attacking_pokemon (Pokemon): The attacking Pokemon.
+            defending_pokemon (Pokemon): The defending Pokemon.
+            ratio (float): The pokedex completion ratio of the attacker over the defender.
+            flat_table (array): The flat type effectiveness table of the battle.
+
+        Returns:
+            int: The damage of the attack.
+        """
+        damage = max(self.minimum, self.attack_weight * attacking_pokemon.battle_power
+                     - self.defence_weight * defending_pokemon.defence)
+        multiplier = flat_table[attacking_pokemon.TYPE_OFFSET + defending_pokemon.TYPE_ID]
+        return ceil(damage * multiplier * ratio)
@@ -0,0 +1,264 @@
+"""
+This module contains the WinEstimate and WinEstimator classes
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+import random
+from math import sqrt
+from concurrent.futures import ProcessPoolExecutor
+from battle import play_match
+from battle_mode import BattleMode
+from outcome import WIN, LOSS
+
+
+def play_samples(species_1: list, species_2: list, mode_value: int, criterion: str, seed: int, count: int) -> tuple:
+    """
+    Plays a number of battles between two teams, where each battle shuffles the order of both teams with its own seed.
+    Each batch of WinEstimator is played by one call, in a worker process if it has more than one worker.
+
+    :complexity: Best and worse case O(c*(n*m + b)), where c is the number of battles, n is the number of Pokemon in
+                 each team, m is the number of Pokemon in the POKE_LIST and b is the complexity of commence_battle.
+
+    Args:
+        species_1 (list): The names of the species in team 1.
+        species_2 (list): The names of the species in team 2.
+        mode_value (int): The value of the battle mode.
+        criterion (str): The criterion to sort the teams for Optimise mode.
+        seed (int): The seed of the first battle, which increases by one for each battle.
+        count (int): The number of battles to play.
+
+    Returns:
+        tuple: The number of wins, draws and losses for team 1.
+    """
+    battle_mode = BattleMode(mode_value)
+    wins = draws = losses = 0
+    for sample_seed in range(seed, seed + count):
+        generator = random.Random(sample_seed)
+        order_1 = list(species_1)
+        order_2 = list(species_2)
+        generator.shuffle(order_1)
+        generator.shuffle(order_2)
+
+        outcome = play_match(order_1, order_2, battle_mode, criterion)
+        if outcome == WIN:
+            wins += 1
+        elif outcome == LOSS:
+            losses += 1
+        else:
+            draws += 1
+    return wins, draws, losses
+
+
+class WinEstimate:
+    """
+    Represents the estimated probabilities of team 1 winning, drawing and losing against team 2, along with the half
+    width of the confidence interval of each probability.
+    """
+
+    def __init__(self, wins: int, draws: int, losses: int, z_score: float) -> None:
+        """
+        Initializes a new instance of the WinEstimate class.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            wins (int): The number of battles won by team 1.
+            draws (int): The number of battles drawn.
+            losses (int): The number of battles lost by team 1.
+            z_score (float): The z score of the confidence level.
+        """
+        self.wins = wins
+        self.draws = draws
+        self.losses = losses
+        self.samples = wins + draws + losses
+        self.win_probability, self.win_error = self.wilson_interval(wins, self.samples, z_score)
+        self.draw_probability, self.draw_error = self.wilson_interval(draws, self.samples, z_score)
+        self.loss_probability, self.loss_error = self.wilson_interval(losses, self.samples, z_score)
+
+    @staticmethod
+    def wilson_interval(successes: int, samples: int, z_score: float) -> tuple[float, float]:
+        """
+        Returns a proportion and the half width of its Wilson score interval, which stays meaningful when the
+        proportion is close to 0 or 1.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            successes (int): The number of successes.
+            samples (int): The number of samples.
+            z_score (float): The z score of the confidence level.
+
+        Returns:
+            tuple[float, float]: The proportion and the half width of the interval.
+        """
+        if samples == 0:
+            return 0.5, 0.5
+        proportion = successes / samples
+        z_squared = z_score * z_score
+        denominator = 1 + z_squared / samples
+        half_width = z_score * sqrt(proportion * (1 - proportion) / samples + z_squared / (4 * samples * samples))
+        return proportion, half_width / denominator
+
+    def get_max_error(self) -> float:
+        """
+        Returns the largest half width out of the win, draw and loss intervals.
+
+        :complexity: Best and worse case O(1)
+
+        Returns:
+            float: The largest half width.
+        """
+        return max(self.win_error, self.draw_error, self.loss_error)
+
+    def __str__(self) -> str:
+        """
+        Returns a string of the following format:
+        Win <win>% ± <error>%, Draw <draw>% ± <error>%, Loss <loss>% ± <error>% over <samples> battles
+
+        :complexity: Best and worse case O(1)
+
+        Returns:
+            str: The estimate as a string.
+        """
+        return (f"Win {self.win_probability:.1%} ± {self.win_error:.1%}, "
+                f"Draw {self.draw_probability:.1%} ± {self.draw_error:.1%}, "
+                f"Loss {self.loss_probability:.1%} ± {self.loss_error:.1%} over {self.samples} battles")
+
+
+class WinEstimator:
+    """
+    Estimates how often team 1 beats team 2 in a battle mode with repeated battles, where each battle shuffles the order
+    of the Pokemon in both teams with a different seed.
+    """
+
+    Z_SCORE = 1.96
+    MIN_SAMPLES = 30
+    BATCH_SIZE = 50
+
+    def __init__(self, species_1: list, species_2: list, battle_mode: BattleMode, criterion: str = "health",
+                 max_samples: int = 1000, tolerance: float = 0.02, seed: int = 0, workers: int = 1) -> None:
+        """
+        Initializes a new instance of the WinEstimator class.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in each team.
+
+        Args:
+            species_1 (list): The Pokemon classes, or the names of the Pokemon classes, in team 1.
+            species_2 (list): The Pokemon classes, or the names of the Pokemon classes, in team 2.
+            battle_mode (BattleMode): The battle mode.
+            criterion (str, optional): The criterion to sort the teams for Optimise mode. Defaults to "health".
+            max_samples (int, optional): The largest number of battles to play. Defaults to 1000.
+            tolerance (float, optional): The half width that every interval must be within to stop early. Defaults to
+                                         0.02.
+            seed (int, optional): The seed of the first battle. Defaults to 0.
+            workers (int, optional): The number of worker processes, where 1 plays every battle in this process.
+                                     Defaults to 1.
+        """
+        self.species_1 = [self.get_species_name(species) for species in species_1]
+        self.species_2 = [self.get_species_name(species) for species in species_2]
+        self.battle_mode = battle_mode
+        self.criterion = criterion
+        self.max_samples = max_samples
+        self.tolerance = tolerance
+        self.seed = seed
+        self.workers = workers
+
+    @staticmethod
+    def get_species_name(species) -> str:
+        """
+        Returns the name of a Pokemon class, so that the team can be sent to worker processes.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            species (type[Pokemon] | str): The Pokemon class or the name of the Pokemon class.
+
+        Returns:
+            str: The name of the Pokemon class.
+        """
+        return species if isinstance(species, str) else species.__name__
+
+    def _is_precise(self, estimate: WinEstimate) -> bool:
+        """
+        Returns True if enough battles have been played for the estimate to stop early.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            estimate (WinEstimate): The current estimate.
+
+        Returns:
+            bool: If every interval is within the tolerance.
+        """
+        return estimate.samples >= self.MIN_SAMPLES and estimate.get_max_error() <= self.tolerance
+
+    def _batches(self):
+        """
+        Yields the arguments of play_samples for each batch of battles, up to max_samples battles.
+
+        :complexity: Best and worse case O(1) per batch.
+        """
+        for start in range(0, self.max_samples, self.BATCH_SIZE):
+            count = min(self.BATCH_SIZE, self.max_samples - start)
+            yield (self.species_1, self.species_2, self.battle_mode.value, self.criterion, self.seed + start, count)
+
+    def _create_executor(self) -> ProcessPoolExecutor | None:
+        """
+        Creates a pool of worker processes, or returns None if only one worker is wanted or processes are not available
+        on this platform.
+
+        :complexity: Best and worse case O(w) where w is the number of workers.
+
+        Returns:
+            ProcessPoolExecutor | None: The pool of worker processes.
+        """
+        if self.workers <= 1:
+            return None
+        try:
+            return ProcessPoolExecutor(self.workers)
+        except (ImportError, NotImplementedError, OSError):
+            return None
+
+    def estimate(self) -> WinEstimate:
+        """
+        Plays battles in batches until every interval is within the tolerance or max_samples battles have been played.
+
+        :complexity: Best case O(b*k) if the estimate is precise after the first batches, and worse case O(s*k), where
+                     b is the BATCH_SIZE, s is max_samples and k is the complexity of one battle in play_samples.
+
+        Returns:
+            WinEstimate: The estimated probabilities of team 1 winning, drawing and losing.
+        """
+        wins = draws = losses = 0
+        estimate = WinEstimate(wins, draws, losses, self.Z_SCORE)
+        executor = self._create_executor()
+        if executor is None:
+            for batch in self._batches():
+                batch_wins, batch_draws, batch_losses = play_samples(*batch)
+                wins, draws, losses = wins + batch_wins, draws + batch_draws, losses + batch_losses
+                estimate = WinEstimate(wins, draws, losses, self.Z_SCORE)
+                if self._is_precise(estimate):
+                    break
+            return estimate
+
+        # Keeps one batch per worker running, and stops submitting once the estimate is precise
+        with executor:
+            batches = self._batches()
+            running = []
+            for batch in batches:
+                running.append(executor.submit(play_samples, *batch))
+                if len(running) == self.workers:
+                    break
+            while running:
+                batch_wins, batch_draws, batch_losses = running.pop(0).result()
+                wins, draws, losses = wins + batch_wins, draws + batch_draws, losses + batch_losses
+                estimate = WinEstimate(wins, draws, losses, self.Z_SCORE)
+                if self._is_precise(estimate):
+                    for future in running:
+                        future.cancel()
+                    break
+                batch = next(batches, None)
+                if batch is not None:
+                    running.append(executor.submit(play_samples, *batch))
+        return estimate
@@ -0,0 +1,293 @@
+"""
+This module contains the OrderSearch class
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+import os
+from math import factorial
+from itertools import permutations
+from battle import Battle, play_match
+from battle_mode import BattleMode
+from poke_team import PokeTeam, Trainer
+from outcome import WIN, LOSS, DRAW
+from worker_pool import run_bounded
+
+
+def search_set_orders(species_1: list, species_2: list, first_1: int, first_2: int) -> dict:
+    """
+    Plays every SET mode battle between the two teams where team 1 sends out first_1 and team 2 sends out first_2
+    first. OrderSearch runs one call for each pair of first Pokemon, in worker processes if it has more than one.
+
+    :complexity: Best and worse case O(p*r) where p is the number of positions in the search tree below the first
+                 Pokemon and r is the number of rounds in the longest duel.
+
+    Args:
+        species_1 (list): The names of the species in team 1.
+        species_2 (list): The names of the species in team 2.
+        first_1 (int): The position in species_1 of the first Pokemon sent out by team 1.
+        first_2 (int): The position in species_2 of the first Pokemon sent out by team 2.
+
+    Returns:
+        dict: The number of team 2 orders won, drawn and lost by each order in which team 1 sends out its Pokemon,
+        keyed by the positions in species_1 of the Pokemon sent out before the battle ended.
+    """
+    return SetOrderSearch(species_1, species_2).search(first_1, first_2)
+
+
+class SetOrderSearch:
+    """
+    Searches every order of two teams in SET mode. The battles are explored as a tree where each branch is the next
+    Pokemon a team sends out, so battles that start with the same Pokemon share the duels they have in common, and a
+    branch stops as soon as a team is empty, counting every order of the Pokemon that were not sent out at once.
+    """
+
+    def __init__(self, species_1: list, species_2: list) -> None:
+        """
+        Initializes a new instance of the SetOrderSearch class.
+
+        :complexity: Best and worse case O(n*m) where n is the number of Pokemon in each team and m is the number of
+                     Pokemon in the POKE_LIST.
+
+        Args:
+            species_1 (list): The names of the species in team 1.
+            species_2 (list): The names of the species in team 2.
+        """
+        # The trainers register their own team in their Pokedex, the same as a battle with these teams
+        self.trainer_1 = Trainer("Team 1")
+        self.trainer_2 = Trainer("Team 2")
+        self.trainer_1.pick_species(species_1)
+        self.trainer_2.pick_species(species_2)
+        self.team_1 = list(self.trainer_1.get_team().original_team)
+        self.team_2 = list(self.trainer_2.get_team().original_team)
+        self.battle = Battle(self.trainer_1, self.trainer_2, BattleMode.SET)
+        self.counts = {}
+        self.duels = {}
+
+    def search(self, first_1: int = None, first_2: int = None) -> dict:
+        """
+        Plays every battle, or every battle starting with the given Pokemon.
+
+        :complexity: Best and worse case O(p*r) where p is the number of positions in the search tree and r is the
+                     number of rounds in the longest duel.
+
+        Args:
+            first_1 (int, optional): The position of the first Pokemon sent out by team 1. Defaults to None for any.
+            first_2 (int, optional): The position of the first Pokemon sent out by team 2. Defaults to None for any.
+
+        Returns:
+            dict: The number of team 2 orders won, drawn and lost by each order in which team 1 sends out its Pokemon,
+            keyed by the positions of the Pokemon sent out before the battle ended.
+        """
+        remaining_1 = tuple(range(len(self.team_1)))
+        remaining_2 = tuple(range(len(self.team_2)))
+        self.counts = {}
+        if first_1 is None or first_2 is None:
+            self._search(remaining_1, remaining_2, None, None, ())
+        else:
+            self._search(tuple(i for i in remaining_1 if i != first_1), tuple(i for i in remaining_2 if i != first_2),
+                         first_1, first_2, (first_1,))
+        return self.counts
+
+    def _search(self, remaining_1: tuple, remaining_2: tuple, current_1: int | None, current_2: int | None,
+                sent_1: tuple) -> None:
+        """
+        Plays every battle from the current position of the search tree, restoring the Pokemon, Pokedexes and team
+        counts before returning, since a duel lowers the team count of the losing team.
+
+        :complexity: Best and worse case O(p*r) where p is the number of positions in the tree below this one and r is
+                     the number of rounds in the longest duel.
+
+        Args:
+            remaining_1 (tuple): The positions of the Pokemon team 1 has not sent out.
+            remaining_2 (tuple): The positions of the Pokemon team 2 has not sent out.
+            current_1 (int | None): The position of team 1's Pokemon in battle, None if it needs a new one.
+            current_2 (int | None): The position of team 2's Pokemon in battle, None if it needs a new one.
+            sent_1 (tuple): The positions of the Pokemon sent out by team 1 so far, in order.
+        """
+        empty_1 = current_1 is None and not remaining_1
+        empty_2 = current_2 is None and not remaining_2
+        if empty_1 or empty_2:
+            if empty_1 and empty_2:
+                outcome = 1
+            elif empty_1:
+                outcome = 2
+            else:
+                outcome = 0
+            counts = self.counts.get(sent_1)
+            if counts is None:
+                counts = self.counts[sent_1] = [0, 0, 0]
+            # Every order of the Pokemon team 2 did not send out gives the same result
+            counts[outcome] += factorial(len(remaining_2))
+            return
+
+        if current_1 is None:
+            for position in remaining_1:
+                self._search(tuple(i for i in remaining_1 if i != position), remaining_2, position, current_2,
+                             sent_1 + (position,))
+            return
+        if current_2 is None:
+            for position in remaining_2:
+                self._search(remaining_1, tuple(i for i in remaining_2 if i != position), current_1, position, sent_1)
+            return
+
+        pokemon_1 = self.team_1[current_1]
+        pokemon_2 = self.team_2[current_2]
+        state_1 = pokemon_1.snapshot()
+        state_2 = pokemon_2.snapshot()
+        pokedex_1 = self.trainer_1.pokedex.elems
+        pokedex_2 = self.trainer_2.pokedex.elems
+        team_count_1 = self.trainer_1.get_team().team_count
+        team_count_2 = self.trainer_2.get_team().team_count
+
+        self.battle.update_pokedexes(pokemon_1, pokemon_2)
+        ratio, inverse = self.battle.get_completion_ratio()
+        # Duels between Pokemon of the same species in the same state are played once
+        key = (pokemon_1.SPECIES_ID, state_1, pokemon_2.SPECIES_ID, state_2, ratio)
+        duel = self.duels.get(key)
+        if duel is None:
+            winning_pokemon = self.battle.battle_rounds(pokemon_1, pokemon_2, ratio, inverse)
+            winner = 1 if winning_pokemon is pokemon_1 else 2 if winning_pokemon is pokemon_2 else 0
+            duel = self.duels[key] = (winner, pokemon_1.snapshot(), pokemon_2.snapshot())
+        else:
+            pokemon_1.restore(duel[1])
+            pokemon_2.restore(duel[2])
+
+        winner = duel[0]
+        self._search(remaining_1, remaining_2, current_1 if winner == 1 else None,
+                     current_2 if winner == 2 else None, sent_1)
+
+        pokemon_1.restore(state_1)
+        pokemon_2.restore(state_2)
+        self.trainer_1.pokedex.elems = pokedex_1
+        self.trainer_2.pokedex.elems = pokedex_2
+        self.trainer_1.get_team().team_count = team_count_1
+        self.trainer_2.get_team().team_count = team_count_2
+
+
+class OrderSearch:
+    """
+    Finds the OPTIMISE mode criterion and the SET mode order of team 1 that give the best result against team 2, along
+    with the result of every criterion and every order. The SET mode orders are searched exhaustively and each gets
+    the number of team 2 orders it wins, draws and loses. Both teams are sorted by the criterion in OPTIMISE mode, so
+    each criterion is a single battle and its result is one outcome rather than a win rate, with no pruning or shared
+    prefixes.
+    """
+
+    def __init__(self, species_1: list, species_2: list, workers: int = None) -> None:
+        """
+        Initializes a new instance of the OrderSearch class.
+
+        :complexity: Best and worst case is O(1)
+
+        Args:
+            species_1 (list): The names of the species in team 1.
+            species_2 (list): The names of the species in team 2.
+            workers (int, optional): The number of processes to search the SET mode orders with, where 1 searches them
+                                     in this process, as does any number if processes are not available. Defaults to
+                                     None for the number of CPUs.
+        """
+        self.species_1 = [species if isinstance(species, str) else species.__name__ for species in species_1]
+        self.species_2 = [species if isinstance(species, str) else species.__name__ for species in species_2]
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+
+    def search_criteria(self) -> dict:
+        """
+        Plays an OPTIMISE mode battle between the teams in the given order with each criterion in the CRITERION_LIST.
+        Each criterion is played once, since the order of both teams comes from the criterion, so the result of a
+        criterion is a single outcome rather than a win rate.
+
+        :complexity: Best and worse case O(c*b) where c is the number of criteria and b is the complexity of
+                     play_match.
+
+        Returns:
+            dict: WIN, LOSS or DRAW for team 1 with each criterion.
+        """
+        outcomes = {}
+        for criterion in PokeTeam.CRITERION_LIST:
+            outcomes[criterion] = play_match(self.species_1, self.species_2, BattleMode.OPTIMISE, criterion)
+        return outcomes
+
+    def get_best_criterion(self) -> tuple[str, dict]:
+        """
+        Returns the criterion that gives team 1 the best single outcome, preferring a win over a draw over a loss and
+        earlier criteria in the CRITERION_LIST when tied.
+
+        :complexity: Best and worse case the same as search_criteria.
+
+        Returns:
+            tuple[str, dict]: The best criterion and the outcome of every criterion.
+        """
+        outcomes = self.search_criteria()
+        rank = {WIN: 0, DRAW: 1, LOSS: 2}
+        best = min(outcomes, key=lambda criterion: rank[outcomes[criterion]])
+        return best, outcomes
+
+    def search_orders(self) -> dict:
+        """
+        Plays every SET mode battle between every order of team 1 and every order of team 2.
+
+        :complexity: Best and worse case O(p*r + a*n) where p is the number of positions in the search tree, r is the
+                     number of rounds in the longest duel, a is the number of orders of team 1 and n is the number of
+                     Pokemon in team 1.
+
+        Returns:
+            dict: The number of team 2 orders won, drawn and lost by each order of team 1, keyed by the positions of
+            the species in species_1 in the order they are picked, so the last one is sent out first.
+        """
+        tasks = [(first_1, first_2) for first_1 in range(len(self.species_1)) for first_2 in range(len(self.species_2))]
+        counts = {}
+
+        def merge(result: dict) -> None:
+            for sent, (wins, draws, losses) in result.items():
+                total = counts.get(sent)
+                if total is None:
+                    total = counts[sent] = [0, 0, 0]
+                total[0] += wins
+                total[1] += draws
+                total[2] += losses
+
+        run_bounded(search_set_orders, ((self.species_1, self.species_2, *task) for task in tasks), merge, self.workers)
+
+        # Each order gets the results of every battle that ended after it sent out the Pokemon at its start
+        table = {}
+        for sent_order in permutations(range(len(self.species_1))):
+            wins = draws = losses = 0
+            for length in range(1, len(sent_order) + 1):
+                total = counts.get(sent_order[:length])
+                if total is not None:
+                    wins += total[0]
+                    draws += total[1]
+                    losses += total[2]
+            table[sent_order[::-1]] = (wins, draws, losses)
+        return table
+
+    def get_best_order(self) -> tuple[list, dict]:
+        """
+        Returns the SET mode order of team 1 that wins against the most orders of team 2, with fewer losses and then
+        the earliest order breaking ties.
+
+        :complexity: Best and worse case the same as search_orders.
+
+        Returns:
+            tuple[list, dict]: The names of the species of team 1 in the best order to pick them, and the outcome table
+            returned by search_orders.
+        """
+        table = self.search_orders()
+        best = min(table, key=lambda order: (-table[order][0], table[order][2]))
+        return [self.species_1[position] for position in best], table
+
+    def search(self) -> tuple[str, dict, list, dict]:
+        """
+        Searches every OPTIMISE mode criterion and every SET mode order of team 1, and returns the best of each with
+        the outcome of every criterion and the outcome table of every order.
+
+        :complexity: Best and worse case the complexity of search_criteria plus the complexity of search_orders.
+
+        Returns:
+            tuple[str, dict, list, dict]: The best criterion, the outcome of every criterion, the names of the species
+            of team 1 in the best order to pick them, and the outcome table returned by search_orders.
+        """
+        best_criterion, outcomes = self.get_best_criterion()
+        best_order, table = self.get_best_order()
+        return best_criterion, outcomes, best_order, table
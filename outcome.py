@@ -0,0 +1,32 @@
+"""
+This module contains the outcome constants of matches and duels
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+# Outcome from the point of view of the first trainer or Pokemon, stored in arrays of type "b"
+UNPLAYED = 0
+WIN = 1
+LOSS = 2
+DRAW = 3
+
+
+def get_outcome(winner, first, second) -> int:
+    """
+    Returns the outcome of a battle for the first side from the winner returned by the battle.
+
+    :complexity: Best and worse case O(1)
+
+    Args:
+        winner (Trainer | Pokemon | None): The winner of the battle, None for a draw.
+        first (Trainer | Pokemon): The first side of the battle.
+        second (Trainer | Pokemon): The second side of the battle.
+
+    Returns:
+        int: WIN, LOSS or DRAW for the first side.
+    """
+    if winner is first:
+        return WIN
+    elif winner is second:
+        return LOSS
+    return DRAW
@@ -12,24 +12,63 @@ from data_structures.stack_adt import ArrayStack
 from data_structures.queue_adt import CircularQueue
 from data_structures.array_sorted_list import ArraySortedList
 from data_structures.sorted_list_adt import ListItem
+import csv
+import io
+import json
 import random
+from array import array
+from operator import attrgetter
 from battle_mode import BattleMode
+from counter_index import get_counter_index
+from team_pool import TeamPool
+from team_stats import TeamStats
+
+
+class CompositeKey(tuple):
+    """
+    Represents the order attribute of a Pokemon for a lexicographic criterion, such as ("level", "health"). It compares
+    the same as a tuple, and negating it negates every value so that the special method of OPTIMISE mode can reverse
+    the order the same as it does for a single attribute.
+    """
+
+    def __neg__(self) -> "CompositeKey":
+        """
+        Returns the key with every value negated.
+
+        :complexity: Best and worse case O(n) where n is the number of values in the key.
+
+        Returns:
+            CompositeKey: The negated key.
+        """
+        return CompositeKey(-value for value in self)
 
 
 class PokeTeam:
     TEAM_LIMIT = 6
     POKE_LIST = get_all_pokemon_types()
-    CRITERION_LIST = ["health", "experience", "defence", "battle_power", "level"]
+    BASE_STATS = SPECIES_STATS
+    CRITERION_LIST = ["health", "experience", "defence", "battle_power", "level", "speed"]
+    OUTPUT_FORMATS = ["text", "csv", "json"]
+    CSV_COLUMNS = ("name", "level", "health", "experience", "battle_power", "defence", "speed")
+    TEXT_ROW = "%s (Level %s) with %s health and %s experience\n"
 
-    def __init__(self) -> None:
+    def __init__(self, pool: TeamPool = None) -> None:
         """
         Initializes a new instance of the PokeTeam class.
 
         :complexity: Best and worse case O(1).
+
+        Args:
+            pool (TeamPool, optional): The pool to take the Pokemon, arrays and ADTs of the team from, and to return
+                                       them to with release. Defaults to None, where new ones are always created.
         """
-        self.team = ArrayR(self.TEAM_LIMIT)
+        self.pool = pool
+        self.team = ArrayR(self.TEAM_LIMIT) if pool is None else pool.acquire(ArrayR, self.TEAM_LIMIT)
         self.team_count = 0
         self.original_team = None
+        self.stats = None
+        # Whether optimise_special has negated the keys of the OPTIMISE team
+        self.flipped = False
 
     def choose_manually(self) -> None:
         """
@@ -78,6 +117,7 @@ class PokeTeam:
 
         self.team = team
         self.original_team = self.team
+        self.track_stats()
 
     def choose_randomly(self) -> None:
         """
@@ -89,17 +129,136 @@ class PokeTeam:
 
         where n is the number of Pokemon chosen for the team.
         """
-        all_pokemon = get_all_pokemon_types()
+        all_pokemon = self.POKE_LIST
         self.team_count = 0
         for i in range(self.TEAM_LIMIT):
             rand_int = random.randint(0, len(all_pokemon) - 1)
-            self.team[i] = all_pokemon[rand_int]()
+            self.team[i] = self.create_pokemon(all_pokemon[rand_int])
             self.team_count += 1
         self.original_team = self.team
+        self.track_stats()
+
+    def choose_species(self, species: list) -> None:
+        """
+        Generates a team with one new Pokemon of each given species, in the given order.
+
+        :complexity: Best and worse case O(n*m) where n is the number of species given and m is the number of Pokemon
+                     in the POKE_LIST.
+
+        Args:
+            species (list): The Pokemon classes, or the names of the Pokemon classes, in the team.
+
+        Raises:
+            Exception: If the number of species is not between 1 and 6
+            Exception: If a species is not in POKE_LIST
+        """
+        if len(species) < 1 or len(species) > self.TEAM_LIMIT:
+            raise Exception("Invalid number of Pokemon")
+
+        team = self.create_structure(ArrayR, len(species))
+        for i, pokemon_species in enumerate(species):
+            for pokemon_type in self.POKE_LIST:
+                if pokemon_type is pokemon_species or pokemon_type.__name__ == pokemon_species:
+                    team[i] = self.create_pokemon(pokemon_type)
+                    break
+            else:
+                raise Exception("Invalid Pokemon")
+        self.team = team
+        self.team_count = len(species)
+        self.original_team = self.team
+        self.track_stats()
+
+    def choose_counters(self, defend_types: list, count: int = TEAM_LIMIT) -> None:
+        """
+        Generates a team of the best counters of the given defending types from the CounterIndex, taking the next best
+        counter of each type in turn and skipping species already in the team.
+
+        :complexity: Best and worse case O(n*m) where n is the number of Pokemon chosen and m is the number of Pokemon
+                     in the POKE_LIST.
+
+        Args:
+            defend_types (list[PokeType]): The types of the opposing team.
+            count (int, optional): The number of Pokemon in the team. Defaults to TEAM_LIMIT.
+
+        Raises:
+            Exception: If no types are given
+            Exception: If the count is not between 1 and the TEAM_LIMIT, or is more than the number of species
+        """
+        if len(defend_types) == 0:
+            raise Exception("Invalid types")
+        if count < 1 or count > self.TEAM_LIMIT or count > len(self.POKE_LIST):
+            raise Exception("Invalid number of Pokemon")
+
+        counter_index = get_counter_index()
+        ranks = [0] * len(defend_types)
+        chosen = []
+        turn = 0
+        while len(chosen) < count:
+            position = turn % len(defend_types)
+            species_id = counter_index.get_counter(defend_types[position].value, ranks[position])
+            ranks[position] += 1
+            if species_id not in chosen:
+                chosen.append(species_id)
+                turn += 1
+        self.choose_species([self.POKE_LIST[species_id] for species_id in chosen])
+
+    def track_stats(self) -> None:
+        """
+        Starts keeping the TeamStats of the original team, replacing the stats of any previous team.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the original team.
+        """
+        if self.stats is not None:
+            self.stats.detach()
+        self.stats = TeamStats(self.original_team)
+
+    def get_alive_count(self) -> int:
+        """
+        Returns the number of Pokemon in the team that have not fainted.
+
+        :complexity: Best and worse case O(1).
+
+        Returns:
+            int: The number of alive Pokemon.
+        """
+        return self.stats.get_alive_count()
+
+    def get_total_health(self) -> float:
+        """
+        Returns the sum of the health of the Pokemon in the team that have not fainted.
+
+        :complexity: Best and worse case O(1).
+
+        Returns:
+            float: The total health left in the team.
+        """
+        return self.stats.get_total_health()
+
+    def get_strongest(self) -> Pokemon | None:
+        """
+        Returns the alive Pokemon in the team with the highest battle power.
+
+        :complexity: Best and worse case O(1).
+
+        Returns:
+            Pokemon | None: The strongest alive Pokemon, None if every Pokemon has fainted.
+        """
+        return self.stats.get_strongest()
+
+    def get_max_battle_power(self) -> float:
+        """
+        Returns the highest battle power of the alive Pokemon in the team.
+
+        :complexity: Best and worse case O(1).
+
+        Returns:
+            float: The highest battle power, 0 if every Pokemon has fainted.
+        """
+        return self.stats.get_max_battle_power()
 
     def regenerate_team(self, battle_mode: BattleMode, criterion=None) -> None:
         """
-        Heals all of the pokemon to their original HP while preserving their level and evolution.
+        Heals all of the pokemon to the maximum HP of their evolution stage while preserving their level and evolution.
         
         :complexity: For SET or ROTATE, best and worse case O(n)
                      For OPTIMISE, best O(n*log n) if the order attribute is at the end of the ArraySortedList, worse 
@@ -125,16 +284,170 @@ class PokeTeam:
         
         :complexity: Best and worse case O(n) where n is the number of Pokemon in the original team.
         """
-        # Heals each pokemon to their original health
+        # Heals each pokemon to the maximum health of its current evolution stage
         for pokemon in self.original_team:
-            original_pokemon = type(pokemon)()
-            original_health = original_pokemon.get_health()
-            pokemon.health = original_health
+            pokemon.set_health(self.BASE_STATS[pokemon.SPECIES_ID].get_max_health(pokemon.stage))
             
         # Resets the team and team count to the original
+        if self.pool is not None and self.team is not self.original_team:
+            self.pool.release(self.team)
         self.team = self.original_team
         self.team_count = len(self.original_team)
 
+    def create_pokemon(self, pokemon_type: type[Pokemon]) -> Pokemon:
+        """
+        Returns a new Pokemon of a species, taken from the pool if the team has one.
+
+        :complexity: Best and worse case O(1).
+
+        Args:
+            pokemon_type (type[Pokemon]): The species of the Pokemon.
+
+        Returns:
+            Pokemon: A Pokemon with the stats of a new Pokemon of the species.
+        """
+        if self.pool is None:
+            return pokemon_type()
+        return self.pool.acquire_pokemon(pokemon_type)
+
+    def create_structure(self, structure_type: type, capacity: int):
+        """
+        Returns an empty ArrayR, ArrayStack, CircularQueue or ArraySortedList, taken from the pool if the team has one.
+
+        :complexity: Best and worse case O(n) where n is the capacity, or O(1) if it is reused from the pool.
+
+        Args:
+            structure_type (type): The class of the structure.
+            capacity (int): The capacity of the structure.
+
+        Returns:
+            ArrayR | ArrayStack | CircularQueue | ArraySortedList: The empty structure.
+        """
+        if self.pool is None:
+            return structure_type(capacity)
+        return self.pool.acquire(structure_type, capacity)
+
+    def create_item(self, pokemon: Pokemon, key: float) -> ListItem:
+        """
+        Returns a ListItem for a Pokemon in an OPTIMISE team, taken from the pool if the team has one.
+
+        :complexity: Best and worse case O(1).
+
+        Args:
+            pokemon (Pokemon): The Pokemon.
+            key (float): The order attribute of the Pokemon.
+
+        Returns:
+            ListItem: The item.
+        """
+        if self.pool is None:
+            return ListItem(pokemon, key)
+        return self.pool.acquire_item(pokemon, key)
+
+    def replace_team(self, team) -> None:
+        """
+        Replaces the battle team, returning the previous ADT to the pool if the team has one.
+
+        :complexity: Best and worse case O(1), or O(n) if the previous team is an ArraySortedList, where n is the
+                     number of Pokemon in it.
+
+        Args:
+            team (ArrayR | ArrayStack | CircularQueue | ArraySortedList): The new battle team.
+        """
+        if self.pool is not None and self.team is not self.original_team and self.team is not team:
+            self.pool.release(self.team)
+        self.team = team
+
+    def release(self) -> None:
+        """
+        Returns the Pokemon, arrays and ADTs of the team to the pool so that they can be reused by later teams. The
+        team must not be used again until a new team is chosen.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the original team.
+        """
+        if self.pool is None or self.original_team is None:
+            return
+        if self.team is not self.original_team:
+            self.pool.release(self.team)
+        self.stats = None
+        for pokemon in self.original_team:
+            self.pool.release_pokemon(pokemon)
+        self.pool.release(self.original_team)
+        self.team = self.pool.acquire(ArrayR, self.TEAM_LIMIT)
+        self.team_count = 0
+        self.original_team = None
+
+    def snapshot(self) -> tuple:
+        """
+        Returns the state of the team as a tuple of values, so that it can be restored later. The Pokemon in the battle
+        team are stored as their positions in the original team rather than as copies.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the original team.
+
+        Returns:
+            tuple: The structure of the team (the battle mode value, or -1 for an ArrayR), the team count, the order
+            of the Pokemon in the team, the keys of the Pokemon for OPTIMISE mode, whether the keys are flipped and
+            the state of each Pokemon in the original team.
+        """
+        positions = {}
+        states = []
+        for position, pokemon in enumerate(self.original_team):
+            positions[id(pokemon)] = position
+            states.append(pokemon.snapshot())
+
+        # Reads the order of the team without changing the ADT
+        keys = None
+        if type(self.team) is ArrayStack:
+            structure = BattleMode.SET.value
+            order = tuple(positions[id(self.team.array[i])] for i in range(len(self.team)))
+        elif type(self.team) is CircularQueue:
+            structure = BattleMode.ROTATE.value
+            size = len(self.team.array)
+            order = tuple(positions[id(self.team.array[(self.team.front + i) % size])] for i in range(len(self.team)))
+        elif type(self.team) is ArraySortedList:
+            structure = BattleMode.OPTIMISE.value
+            order = tuple(positions[id(self.team[i].value)] for i in range(len(self.team)))
+            keys = tuple(self.team[i].key for i in range(len(self.team)))
+        else:
+            structure = -1
+            order = tuple(range(len(self.original_team)))
+        return (structure, self.team_count, order, keys, self.flipped, tuple(states))
+
+    def restore(self, state: tuple) -> None:
+        """
+        Restores the team from a tuple returned by snapshot, rebuilding the battle team from the original team.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the original team.
+
+        Args:
+            state (tuple): The state of the team returned by snapshot.
+        """
+        structure, team_count, order, keys, flipped, states = state
+        for pokemon, pokemon_state in zip(self.original_team, states):
+            pokemon.restore(pokemon_state)
+
+        # Rebuilds the battle team in the same order
+        capacity = len(self.original_team)
+        if structure == BattleMode.SET.value:
+            team = self.create_structure(ArrayStack, capacity)
+            for position in order:
+                team.push(self.original_team[position])
+        elif structure == BattleMode.ROTATE.value:
+            team = self.create_structure(CircularQueue, capacity)
+            for position in order:
+                team.append(self.original_team[position])
+        elif structure == BattleMode.OPTIMISE.value:
+            # Items are placed directly so that Pokemon with equal keys keep their order
+            team = self.create_structure(ArraySortedList, capacity)
+            for i, position in enumerate(order):
+                team.array[i] = self.create_item(self.original_team[position], keys[i])
+            team.length = len(order)
+        else:
+            team = self.original_team
+        self.replace_team(team)
+        self.team_count = team_count
+        self.flipped = flipped
+
     def __getitem__(self, index: int) -> type[Pokemon]:
         """
         Returns the pokemon in position index.
@@ -186,43 +499,77 @@ class PokeTeam:
         """
         return self.team_count
 
+    def get_battle_order(self):
+        """
+        Yields the Pokemon in the team in the order they will battle, by reading the internal array of the ADT so that
+        the team is not changed.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the team.
+        """
+        team = self.team
+        if type(team) is ArrayR:
+            for i in range(len(team)):
+                yield team[i]
+        elif type(team) is ArrayStack:
+            for i in range(len(team) - 1, -1, -1):
+                yield team.array[i]
+        elif type(team) is CircularQueue:
+            size = len(team.array)
+            for i in range(len(team)):
+                yield team.array[(team.front + i) % size]
+        elif type(team) is ArraySortedList:
+            for i in range(len(team)):
+                yield team.array[i].value
+
+    def write(self, stream, output_format: str = "text") -> None:
+        """
+        Writes one row for each Pokemon in the team to a text stream, in the order they will battle, without changing
+        the team. The "text" format has the same rows as __str__ of each Pokemon, formatted with TEXT_ROW. The "csv"
+        format has a header row of CSV_COLUMNS followed by their values, and the "json" format has one JSON object per
+        line with the same values.
+
+        :complexity: Best and worse case O(n*m) where n is the number of Pokemon in the team and m is the length of
+                     each row.
+
+        Args:
+            stream (TextIO): The stream to write to, such as a file or io.StringIO.
+            output_format (str, optional): "text", "csv" or "json". Defaults to "text".
+
+        Raises:
+            Exception: If the output format is not valid
+        """
+        if output_format not in self.OUTPUT_FORMATS:
+            raise Exception("Invalid output format")
+
+        columns = self.CSV_COLUMNS
+        if output_format == "text":
+            get_values = attrgetter(*columns[:4])
+            text_row = self.TEXT_ROW
+            stream.write("".join([text_row % get_values(pokemon) for pokemon in self.get_battle_order()]))
+        elif output_format == "csv":
+            get_values = attrgetter(*columns)
+            writer = csv.writer(stream, lineterminator="\n")
+            writer.writerow(columns)
+            writer.writerows(get_values(pokemon) for pokemon in self.get_battle_order())
+        else:
+            get_values = attrgetter(*columns)
+            for pokemon in self.get_battle_order():
+                stream.write(json.dumps(dict(zip(columns, get_values(pokemon)))) + "\n")
+
     def __str__(self) -> str:
         """
         Return a string representation of the PokeTeam instance with the current members of the team, with each member
         on a new line based on the order in the team.
 
-        :complexity: If the team is an ArrayR, best and worse case O(n*m^2).
-                     If the team is an ArrayStack, best and worse case O(n*m^2).
-                     If the team is a CircularQueue, best and worse case O(n*m^2).
-                     If the team is an ArraySortedList, best and worse case O(n*m^2).
-                     Where n is the number of Pokemon in the team and m is the number of characters in the string 
-                     representation of the Pokemon for each case.
+        :complexity: Best and worse case O(n*m) where n is the number of Pokemon in the team and m is the number of
+                     characters in the string representation of the Pokemon.
+
         Returns:
             str: The string representation of the PokeTeam instance
         """
-        text = ""
-        # Checks the structure of the team and adds the Pokemon to the text acccordingly
-        if type(self.team) is ArrayR:
-            for pokemon in self.team:
-                text += str(pokemon) + "\n"
-        elif type(self.team) is ArrayStack:
-            stack = ArrayStack(len(self))
-            for _ in range(len(self)):
-                pokemon = self.team.pop()
-                text += str(pokemon) + "\n"
-                stack.push(pokemon)
-            for _ in range(len(self)):
-                self.team.push(stack.pop())
-        elif type(self.team) is CircularQueue:
-            for _ in range(len(self)):
-                pokemon = self.team.serve()
-                text += str(pokemon) + "\n"
-                self.team.append(pokemon)
-        elif type(self.team) is ArraySortedList:
-            for i in range(len(self)):
-                pokemon = self.team[i].value
-                text += str(pokemon) + "\n"
-        return text
+        text = io.StringIO()
+        self.write(text)
+        return text.getvalue()
 
     def get_order_attribute(self, pokemon: type[Pokemon], criterion: str) -> int:
         """
@@ -230,18 +577,21 @@ class PokeTeam:
 
         :complexity: Best case O(Comp==) if the criterion is the first element in the CRITERION_LIST. Worse case 
                      O(n*Comp==) if the criterion is at the end of the CRITERION_LIST, where n is the number of elements
-                     in the criterion list, and Comp== is the complexity of string comparison.
+                     in the criterion list, and Comp== is the complexity of string comparison. For a composite
+                     criterion, the same as get_order_getter.
         
         Args:
             pokemon (Pokemon): The Pokemon to get the order attribute for.
-            criterion (str): The criterion for sorting the battle team.
+            criterion (str | tuple | dict): The criterion for sorting the battle team.
 
         Raises:
             Exception: When the criterion is not valid
 
         Returns:
-            float: The order attribute for the Pokemon based on the criterion
+            float | CompositeKey: The order attribute for the Pokemon based on the criterion
         """ 
+        if not isinstance(criterion, str):
+            return self.get_order_getter(criterion)(pokemon)
         if criterion not in self.CRITERION_LIST:
             raise Exception("Invalid criterion")
         
@@ -257,8 +607,60 @@ class PokeTeam:
             order_attribute = pokemon.get_battle_power()
         elif index == 4:
             order_attribute = pokemon.get_level()       
+        elif index == 5:
+            order_attribute = pokemon.get_speed()
         return order_attribute
 
+    @classmethod
+    def get_order_getter(cls, criterion):
+        """
+        Returns a function that gets the order attribute of a Pokemon for the criterion, so that the criterion only
+        has to be looked up once instead of every round.
+
+        The criterion is either one attribute in the CRITERION_LIST, a tuple of attributes compared in order such as
+        ("level", "health"), or a dict of attributes and weights such as {"battle_power": 2, "speed": 1} whose order
+        attribute is the weighted sum.
+
+        :complexity: Best and worse case O(c*n*Comp==) where c is the number of attributes in the criterion, n is the
+                     number of elements in the CRITERION_LIST and Comp== is the complexity of string comparison.
+
+        Args:
+            criterion (str | tuple | dict): The criterion for sorting the battle team.
+
+        Raises:
+            Exception: When the criterion is not valid
+
+        Returns:
+            Callable[[Pokemon], float | CompositeKey]: The function returning the order attribute of a Pokemon.
+        """
+        if isinstance(criterion, str):
+            attributes = [criterion]
+        elif isinstance(criterion, (tuple, list, dict)):
+            attributes = list(criterion)
+        else:
+            raise Exception("Invalid criterion")
+        if len(attributes) == 0 or any(attribute not in cls.CRITERION_LIST for attribute in attributes):
+            raise Exception("Invalid criterion")
+
+        # Each attribute in the CRITERION_LIST is the name of the attribute returned by its getter
+        if isinstance(criterion, str):
+            return attrgetter(criterion)
+        elif isinstance(criterion, dict):
+            weights = tuple((attrgetter(attribute), weight) for attribute, weight in criterion.items())
+
+            def weighted_sum(pokemon: Pokemon) -> float:
+                total = 0
+                for getter, weight in weights:
+                    total += weight * getter(pokemon)
+                return total
+
+            return weighted_sum
+        elif len(attributes) == 1:
+            getter = attrgetter(attributes[0])
+            return lambda pokemon: CompositeKey((getter(pokemon),))
+        getter = attrgetter(*attributes)
+        return lambda pokemon: CompositeKey(getter(pokemon))
+
     def assign_team(self, criterion: str = None) -> None:
         """
         Assigns the order of the team based on the chosen attribute.
@@ -270,12 +672,14 @@ class PokeTeam:
             criterion (str): The chosen attribute for sorting the battle team.
         """
         # Adds each pokemon with their order attribute to the ordered team      
-        ordered_team = ArraySortedList(len(self))
+        ordered_team = self.create_structure(ArraySortedList, len(self))
+        order_getter = self.get_order_getter(criterion)
         for pokemon in self.team:
-            order_attribute = self.get_order_attribute(pokemon, criterion)
-            pokemon_item = ListItem(pokemon, order_attribute)
+            order_attribute = order_getter(pokemon)
+            pokemon_item = self.create_item(pokemon, order_attribute)
             ordered_team.add(pokemon_item)
-        self.team = ordered_team
+        self.replace_team(ordered_team)
+        self.flipped = False
 
     def assemble_team(self, battle_mode: BattleMode) -> None:
         """
@@ -294,16 +698,16 @@ class PokeTeam:
         # Assembles the team based on the battle mode
         mode_value = battle_mode.value
         if mode_value == 0:
-            team = ArrayStack(len(self))
+            team = self.create_structure(ArrayStack, len(self))
             for pokemon in self.original_team:
                 team.push(pokemon)
         elif mode_value == 1:
-            team = CircularQueue(len(self))
+            team = self.create_structure(CircularQueue, len(self))
             for pokemon in self.original_team:
                 team.append(pokemon)
         else:
             raise Exception("Invalid battle mode")
-        self.team = team
+        self.replace_team(team)
 
     def set_special(self):
         """
@@ -347,20 +751,19 @@ class PokeTeam:
 
     def optimise_special(self):
         """
-        Special method for OPTIMISE mode which toggles the sorting order (ascending or descending)
-        
-        :complexity: Best O(n*log n) if the order attribute is at the end of the ArraySortedList, worse O(n^2) if the 
-                     order_attribute is at the start of the ArraySortedList, where n is the number of Pokemon in the 
-                     team.
+        Special method for OPTIMISE mode which toggles the sorting order (ascending or descending). Negating every key
+        of a sorted team reverses its order, so the items are reversed in place, and flipped records that the keys
+        are negated so that keys of any sign are updated the same way afterwards.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the team.
         """
-        # Changes the order attribute of each pokemon to the negative of the current order attribute
-        negative = self.team[0].key < 0
-            
-        for i in range(len(self.team)):
-            index = 0 if negative else i
-            item = self.team.delete_at_index(index)
-            item.key = -item.key
-            self.team.add(item)
+        array = self.team.array
+        length = len(self.team)
+        for i in range(length // 2):
+            array[i], array[length - 1 - i] = array[length - 1 - i], array[i]
+        for i in range(length):
+            array[i].key = -array[i].key
+        self.flipped = not self.flipped
 
     def special(self, battle_mode: BattleMode):
         """
@@ -384,7 +787,62 @@ class PokeTeam:
         elif mode_value == 2:
             self.optimise_special()
     
-    def update_optimise_team(self, pokemon: Pokemon, key: float, criterion: str) -> None:
+    def reorder_front(self, order_getter) -> None:
+        """
+        Updates the optimise team after the Pokemon at the front has fought a round, removing it if it fainted or moving
+        it to its new position otherwise. The Pokemon ends up in the same position as removing it before the round and
+        adding it back with update_optimise_team, but the items in front of its new position are shifted once, and
+        nothing is searched or moved if its key has not changed.
+
+        :complexity: Best case O(1) if the key of the Pokemon has not changed, worse case O(n) if it moves to the end or
+                     faints, where n is the number of Pokemon in the team.
+
+        Args:
+            order_getter (Callable[[Pokemon], float]): The function returned by get_order_getter.
+        """
+        team = self.team
+        array = team.array
+        item = array[0]
+        pokemon = item.value
+        if not pokemon.is_alive():
+            team.delete_at_index(0)
+            if self.pool is not None:
+                self.pool.release_item(item)
+            return
+
+        key = order_getter(pokemon)
+        if self.flipped:
+            key = -key
+        # The Pokemon stays at the front if its key has not changed, unless the next Pokemon has the same key, where
+        # the search places it among the equal keys the same as ArraySortedList.add
+        if key == item.key and (team.length == 1 or array[1].key != key):
+            return
+        item.key = key
+
+        # Finds the position with the same binary search as ArraySortedList.add on the team without the front item
+        low = 1
+        high = team.length - 1
+        position = None
+        while low <= high:
+            mid = (low + high) // 2
+            mid_key = array[mid].key
+            if mid_key < key:
+                low = mid + 1
+            elif mid_key > key:
+                high = mid - 1
+            else:
+                position = mid
+                break
+        if position is None:
+            position = low
+
+        # Shifts the items before the new position forward by one, in place of removing and adding the item
+        target = position - 1
+        for i in range(target):
+            array[i] = array[i + 1]
+        array[target] = item
+
+    def update_optimise_team(self, pokemon: Pokemon, key: float, criterion: str, item: ListItem = None) -> None:
         """
         Updates the optimise team after a round of battle.
         
@@ -393,26 +851,41 @@ class PokeTeam:
 
         Args:
             pokemon (Pokemon): The trainer's Pokemon.
-            key (float): The order attribute of the Pokemon.
+            key (float): The order attribute of the Pokemon before the round.
             criterion (str): The criterion for sorting the battle team.
+            item (ListItem, optional): The item the Pokemon was removed from the team in, which is reused instead of
+                                       creating a new one. Defaults to None.
         """
         if pokemon.is_alive():
             order_attribute = self.get_order_attribute(pokemon, criterion)
-            if key < 0:
+            if self.flipped:
                 order_attribute = -order_attribute
-            pokemon_item = ListItem(pokemon, order_attribute)
-            self.team.add(pokemon_item)
+            if item is None:
+                item = self.create_item(pokemon, order_attribute)
+            else:
+                item.key = order_attribute
+            self.team.add(item)
+        elif item is not None and self.pool is not None:
+            self.pool.release_item(item)
 
 
 class Trainer:
-    def __init__(self, name="Unknown") -> None:
+    # The Pokedex completion for each number of types seen, rounded the same as get_pokedex_completion always was
+    COMPLETIONS = array("d", [round(seen / TypeEffectiveness.TYPE_COUNT, 2)
+                              for seen in range(TypeEffectiveness.TYPE_COUNT + 1)])
+
+    def __init__(self, name="Unknown", pool: TeamPool = None) -> None:
         """
         Initializes a new instance of the Trainer class.
         
         :complexity: Best and worse case O(1).
+
+        Args:
+            name (str, optional): The name of the trainer. Defaults to "Unknown".
+            pool (TeamPool, optional): The pool that the PokeTeam reuses Pokemon and ADTs from. Defaults to None.
         """
         self.name = name
-        self.poketeam = PokeTeam()
+        self.poketeam = PokeTeam(pool)
         self.pokedex = BSet(len(TypeEffectiveness()))
         self.lives = 0
 
@@ -441,6 +914,50 @@ class Trainer:
         for pokemon in self.get_team():
             self.register_pokemon(pokemon)
 
+    def pick_species(self, species: list) -> None:
+        """
+        Picks a team with one Pokemon of each given species, in the given order.
+
+        :complexity: Best and worse case O(n*m) where n is the number of species given and m is the number of Pokemon
+                     in the POKE_LIST.
+
+        Args:
+            species (list): The Pokemon classes, or the names of the Pokemon classes, in the team.
+        """
+        self.poketeam.choose_species(species)
+        for pokemon in self.get_team():
+            self.register_pokemon(pokemon)
+
+    def pick_counters(self, opponent: "Trainer") -> None:
+        """
+        Picks a team of the best counters of the types in the original team of an opponent.
+
+        :complexity: Best and worse case O(n*m) where n is the TEAM_LIMIT and m is the number of Pokemon in the
+                     POKE_LIST.
+
+        Args:
+            opponent (Trainer): The trainer to counter, who has already picked a team.
+        """
+        original_team = opponent.get_team().original_team
+        defend_types = []
+        for i in range(len(original_team)):
+            if original_team[i].get_poketype() not in defend_types:
+                defend_types.append(original_team[i].get_poketype())
+        self.poketeam.choose_counters(defend_types)
+        for pokemon in self.get_team():
+            self.register_pokemon(pokemon)
+
+    def release(self) -> None:
+        """
+        Returns the team of the trainer to its pool and clears the Pokedex and lives, so that the trainer can pick a
+        new team for another battle.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the team.
+        """
+        self.poketeam.release()
+        self.pokedex.clear()
+        self.lives = 0
+
     def get_team(self) -> PokeTeam:
         """
         Returns the PokeTeam of the trainer.
@@ -472,20 +989,42 @@ class Trainer:
         Args:
             pokemon (Pokemon): The Pokemon as seen on the trainer's Pokedex.
         """
-        pokemon_type = pokemon.get_poketype()
-        self.pokedex.add(pokemon_type.value + 1)
+        self.pokedex.add(pokemon.TYPE_ID + 1)
 
     def get_pokedex_completion(self) -> float:
         """
         Returns the rounded float ratio of the number of different types of pokemon seen over the total number of types
-        of Pokemon available rounded to 2 decimal places.
+        of Pokemon available rounded to 2 decimal places, looked up in COMPLETIONS by the number of types seen.
         
-        :complexity: Best and worse case O(n), where n is the size of the bit vector of the Pokedex.
+        :complexity: Best and worse case O(1)
 
         Returns:
             float: The Pokedex completion as a float.
         """
-        return round(len(self.pokedex) / len(TypeEffectiveness()), 2)
+        return self.COMPLETIONS[self.pokedex.elems.bit_count()]
+
+    def snapshot(self) -> tuple:
+        """
+        Returns the state of the trainer as a tuple of values, so that it can be restored later.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the original team.
+
+        Returns:
+            tuple: The lives of the trainer, the bit vector of the Pokedex and the state of the PokeTeam.
+        """
+        return (self.lives, self.pokedex.elems, self.poketeam.snapshot())
+
+    def restore(self, state: tuple) -> None:
+        """
+        Restores the trainer from a tuple returned by snapshot.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the original team.
+
+        Args:
+            state (tuple): The state of the trainer returned by snapshot.
+        """
+        self.lives, self.pokedex.elems, team_state = state
+        self.poketeam.restore(team_state)
 
     def __str__(self) -> str:
         """
@@ -1,12 +1,17 @@
 """
-This module contains the PokeType enum and TypeEffectiveness class
+This module contains the PokeType enum, TypeTables class and TypeEffectiveness class
 """
 
 __author__ = "Jonah Yip Mathivanan"
 
+import os
+import threading
+from array import array
 from enum import Enum
 from data_structures.referential_array import ArrayR
 
+MAX_EFFECTIVENESS = 4.0
+
 
 class PokeType(Enum):
     """
@@ -30,35 +35,204 @@ class PokeType(Enum):
     ROCK = 14
 
 
+class TypeTables:
+    """
+    Represents one version of the type effectiveness tables. A new TypeTables is built for every reload and never
+    changed, so code that keeps a reference to one always sees tables from the same file.
+    """
+
+    def __init__(self, version: int, path: str, modified: int, effect_table: ArrayR[ArrayR[float]], flat_table: array,
+                 dual_table: array) -> None:
+        """
+        Initializes a new instance of the TypeTables class.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            version (int): The version of the tables, starting at 0 and increased by every reload.
+            path (str): The CSV the tables were read from.
+            modified (int): The modification time of the CSV in nanoseconds when it was read.
+            effect_table (ArrayR[ArrayR[float]]): The nested type effectiveness table.
+            flat_table (array): The flat type effectiveness table.
+            dual_table (array): The dual type effectiveness table.
+        """
+        self.version = version
+        self.path = path
+        self.modified = modified
+        self.effect_table = effect_table
+        self.flat_table = flat_table
+        self.dual_table = dual_table
+
+
 class TypeEffectiveness:
     """
     Represents the type effectiveness of one Pokemon type against another.
+
+    The tables can be read again from the CSV while the program runs with reload, which builds and checks a new
+    TypeTables before swapping it into TABLES with one assignment and increasing VERSION. EFFECT_TABLE, FLAT_TABLE and
+    DUAL_TABLE are updated after TABLES, so code that needs every table from the same version, such as a Battle, keeps
+    a reference to TABLES instead.
     """
 
     def get_effect_table(path) -> ArrayR[ArrayR[float]]:
         """
         Returns a table with the type effectiveness of one Pokemon type against another, where the rows represent the
         attacking type and the columns represent the defending type.
-        
+
+        The header must name every PokeType in order, and there must be one row of one value per type for each type,
+        where every value is between 0 and MAX_EFFECTIVENESS.
+
         :complexity: Best and worse case O(n^2), where n is the number of types of Pokemon
 
+        Raises:
+            Exception: If the header does not match PokeType
+            Exception: If the table does not have one row and one column for each type
+            Exception: If a value is not a number between 0 and MAX_EFFECTIVENESS
+
         Returns:
             ArrayR[ArrayR[float]]: A nested referential array of floats representing the type effectiveness table.
         """
         with open(path) as file:
-            size = len(file.readline().split(","))
+            header = [name.strip().upper() for name in file.readline().split(",")]
+            if header != [poke_type.name for poke_type in PokeType]:
+                raise Exception("Invalid type effectiveness header")
+            size = len(header)
             table = ArrayR(size)
 
-            for row_index, line in enumerate(file):
+            row_index = 0
+            for line in file:
+                if not line.strip():
+                    continue
+                values = line.split(",")
+                if row_index >= size or len(values) != size:
+                    raise Exception("Invalid type effectiveness shape")
                 row = ArrayR(size)
-                for value_index, value in enumerate(line.split(",")):
-                    row[value_index] = float(value)
+                for value_index, value in enumerate(values):
+                    try:
+                        effectiveness = float(value)
+                    except ValueError:
+                        raise Exception("Invalid type effectiveness value")
+                    # Written so that NaN also fails the check
+                    if not 0 <= effectiveness <= MAX_EFFECTIVENESS:
+                        raise Exception("Invalid type effectiveness value")
+                    row[value_index] = effectiveness
                 table[row_index] = row
+                row_index += 1
+            if row_index != size:
+                raise Exception("Invalid type effectiveness shape")
             return table
 
+    def get_flat_table(table: ArrayR[ArrayR[float]]) -> array:
+        """
+        Returns the type effectiveness table as one contiguous array, where the effectiveness of attacking type a
+        against defending type d is at index a*n + d.
+
+        :complexity: Best and worse case O(n^2), where n is the number of types of Pokemon
+
+        Args:
+            table (ArrayR[ArrayR[float]]): The nested type effectiveness table.
+
+        Returns:
+            array: A flat array of doubles representing the type effectiveness table.
+        """
+        size = len(table)
+        flat_table = array("d", bytes(8 * size * size))
+        for attack_index in range(size):
+            row = table[attack_index]
+            for defend_index in range(size):
+                flat_table[attack_index * size + defend_index] = row[defend_index]
+        return flat_table
+
+    def get_dual_table(flat_table: array, size: int) -> array:
+        """
+        Returns the effectiveness of every attacking type against every pair of defending types, which is the product
+        of the effectiveness against each defending type. The effectiveness of attacking type a against defending
+        types d1 and d2 is at index (a*n + d1)*n + d2.
+
+        :complexity: Best and worse case O(n^3), where n is the number of types of Pokemon
+
+        Args:
+            flat_table (array): The flat type effectiveness table.
+            size (int): The number of types of Pokemon.
+
+        Returns:
+            array: A flat array of doubles representing the dual type effectiveness table.
+        """
+        dual_table = array("d", bytes(8 * size * size * size))
+        for attack_index in range(size):
+            offset = attack_index * size
+            for defend_index_1 in range(size):
+                effectiveness_1 = flat_table[offset + defend_index_1]
+                dual_offset = (offset + defend_index_1) * size
+                for defend_index_2 in range(size):
+                    dual_table[dual_offset + defend_index_2] = effectiveness_1 * flat_table[offset + defend_index_2]
+        return dual_table
+
     DEFAULT_PATH = "type_effectiveness.csv"
 
     EFFECT_TABLE = get_effect_table(DEFAULT_PATH)
+    TYPE_COUNT = len(EFFECT_TABLE)
+    FLAT_TABLE = get_flat_table(EFFECT_TABLE)
+    DUAL_TABLE = get_dual_table(FLAT_TABLE, TYPE_COUNT)
+    VERSION = 0
+    TABLES = TypeTables(VERSION, DEFAULT_PATH, os.stat(DEFAULT_PATH).st_mtime_ns, EFFECT_TABLE, FLAT_TABLE, DUAL_TABLE)
+    # Reentrant so that reload_if_modified can check the CSV again and reload while holding it
+    RELOAD_LOCK = threading.RLock()
+
+    @classmethod
+    def reload(cls, path: str = None) -> TypeTables:
+        """
+        Reads and checks the type effectiveness CSV, builds the new tables and swaps them in as the next version.
+        If the CSV is not valid, the current tables are kept.
+
+        :complexity: Best and worse case O(n^3), where n is the number of types of Pokemon
+
+        Args:
+            path (str, optional): The CSV to read. Defaults to None for the path of the current tables.
+
+        Raises:
+            Exception: If the CSV is not valid, as raised by get_effect_table
+
+        Returns:
+            TypeTables: The new tables.
+        """
+        with cls.RELOAD_LOCK:
+            path = cls.TABLES.path if path is None else path
+            modified = os.stat(path).st_mtime_ns
+            effect_table = cls.get_effect_table(path)
+            flat_table = cls.get_flat_table(effect_table)
+            dual_table = cls.get_dual_table(flat_table, len(effect_table))
+            tables = TypeTables(cls.VERSION + 1, path, modified, effect_table, flat_table, dual_table)
+
+            cls.TABLES = tables
+            cls.VERSION = tables.version
+            cls.EFFECT_TABLE = effect_table
+            cls.FLAT_TABLE = flat_table
+            cls.DUAL_TABLE = dual_table
+            return tables
+
+    @classmethod
+    def reload_if_modified(cls) -> bool:
+        """
+        Reloads the tables if the CSV of the current tables has been modified since it was read, so that long running
+        workers can pick up changes between tasks. The CSV is checked again while holding the RELOAD_LOCK, so threads
+        that see the same change reload it only once.
+
+        :complexity: Best case O(1) if the CSV has not been modified, and worse case the complexity of reload.
+
+        Returns:
+            bool: Whether the tables were reloaded.
+        """
+        tables = cls.TABLES
+        if os.stat(tables.path).st_mtime_ns == tables.modified:
+            return False
+        with cls.RELOAD_LOCK:
+            # Another thread may have reloaded the tables while this one waited for the lock
+            tables = cls.TABLES
+            if os.stat(tables.path).st_mtime_ns == tables.modified:
+                return False
+            cls.reload(tables.path)
+        return True
 
     @classmethod
     def get_effectiveness(cls, attack_type: PokeType, defend_type: PokeType) -> float:
@@ -74,7 +248,46 @@ class TypeEffectiveness:
         Returns:
             float: The effectiveness of the attack, as a float value between 0 and 4.
         """
-        return cls.EFFECT_TABLE[attack_type.value][defend_type.value]
+        return cls.FLAT_TABLE[attack_type.value * cls.TYPE_COUNT + defend_type.value]
+
+    @classmethod
+    def get_dual_effectiveness(cls, attack_type: PokeType, defend_type_1: PokeType, defend_type_2: PokeType) -> float:
+        """
+        Returns the effectiveness of one Pokemon type against a Pokemon with two types, as a float.
+
+        :complexity: Best and worse case O(1)
+
+        Parameters:
+            attack_type (PokeType): The type of the attacking Pokemon.
+            defend_type_1 (PokeType): The first type of the defending Pokemon.
+            defend_type_2 (PokeType): The second type of the defending Pokemon.
+
+        Returns:
+            float: The effectiveness of the attack, as a float value between 0 and 16.
+        """
+        size = cls.TYPE_COUNT
+        return cls.DUAL_TABLE[(attack_type.value * size + defend_type_1.value) * size + defend_type_2.value]
+
+    @classmethod
+    def effectiveness_many(cls, attack_ids, defend_ids) -> array:
+        """
+        Returns the effectiveness of each attacking type against the defending type at the same position, for attacks
+        given as sequences of PokeType values. This is a convenience wrapper that looks up each attack in the flat
+        table in turn, so it is no faster than calling get_effectiveness for each one and is not used by battles.
+
+        :complexity: Best and worse case O(n), where n is the number of attacks
+
+        Parameters:
+            attack_ids (Sequence[int]): The PokeType values of the attacking Pokemon.
+            defend_ids (Sequence[int]): The PokeType values of the defending Pokemon.
+
+        Returns:
+            array: The effectiveness of each attack, as an array of doubles.
+        """
+        flat_table = cls.FLAT_TABLE
+        size = cls.TYPE_COUNT
+        return array("d", [flat_table[attack_id * size + defend_id]
+                           for attack_id, defend_id in zip(attack_ids, defend_ids)])
 
     def __len__(self) -> int:
         """
@@ -1,4 +1,4 @@
-from pokemon_base import PokeType, Pokemon
+from pokemon_base import PokeType, Pokemon, BaseStats, TypeEffectiveness
 from data_structures.referential_array import ArrayR
 import inspect
 
@@ -1019,3 +1019,32 @@ def get_all_pokemon_types() -> ArrayR[Pokemon]:
             all_pokemon[i] = cls
             i += 1
     return all_pokemon
+
+
+def register_species() -> ArrayR[BaseStats]:
+    """
+    Gives every Pokemon class in the module its species ID, type ID and evolution stages, by creating one Pokemon of
+    each species, and returns the base stats of each species.
+
+    :complexity: O(n*m) where n is the number of classes in the module and m is the length of the longest evolution
+                 line.
+
+    Returns:
+        ArrayR[BaseStats]: The base stats of each species, indexed by species ID.
+    """
+    all_pokemon = get_all_pokemon_types()
+    species_stats = ArrayR(len(all_pokemon))
+    for species_id in range(len(all_pokemon)):
+        cls = all_pokemon[species_id]
+        base_stats = BaseStats(cls())
+        cls.SPECIES_ID = species_id
+        cls.TYPE_ID = base_stats.poketype.value
+        cls.TYPE_OFFSET = base_stats.poketype.value * TypeEffectiveness.TYPE_COUNT
+        cls.EVOLUTION_NAMES = tuple(base_stats.evolution_line)
+        cls.BASE_STAGE = base_stats.stage
+        cls.FINAL_STAGE = len(base_stats.evolution_line) - 1
+        species_stats[species_id] = base_stats
+    return species_stats
+
+
+SPECIES_STATS = register_species()
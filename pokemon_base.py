@@ -1,5 +1,5 @@
 """
-This module contains an abstract version of the Pokemon class
+This module contains an abstract version of the Pokemon class and the BaseStats class
 """
 
 __author__ = "Jonah Yip Mathivanan"
@@ -7,19 +7,63 @@ __author__ = "Jonah Yip Mathivanan"
 from abc import ABC
 from math import ceil
 from poke_type import PokeType, TypeEffectiveness
+from data_structures.referential_array import ArrayR
+
+
+def get_base_damage(attack: float, defence: float) -> float:
+    """
+    Returns the damage of an attack with a battle power against a defence before the type effectiveness. This is the
+    damage formula of Pokemon.attack, shared with code that estimates damage from base stats.
+
+    :complexity: Best and worse case O(1)
+
+    Args:
+        attack (float): The battle power of the attacker.
+        defence (float): The defence of the defender.
+
+    Returns:
+        float: The damage of the attack.
+    """
+    if defence < attack / 2:
+        return attack - defence
+    elif defence < attack:
+        return ceil(attack * 5 / 8 - defence / 4)
+    return ceil(attack / 4)
 
 
 class Pokemon(ABC):
     """
     Represents a base Pokemon class with properties and methods common to all Pokemon.
+
+    The integer IDs of each species are set on the class by register_species in the pokemon module, so that battles
+    can index tables directly instead of comparing names or looking up Enum values.
+
+    Attributes:
+        SPECIES_ID (int): The position of the species in get_all_pokemon_types
+        TYPE_ID (int): The value of the PokeType of the species
+        TYPE_OFFSET (int): The position of the row of the species type in TypeEffectiveness.FLAT_TABLE
+        EVOLUTION_NAMES (tuple[str, ...]): The name of the Pokemon at each stage of its evolution line
+        BASE_STAGE (int): The stage of the evolution line that a new Pokemon of the species starts at
+        FINAL_STAGE (int): The last stage of the evolution line
+
+    A Pokemon in a PokeTeam reports changes to its health and battle power to the TeamStats of the team, which is
+    stored in tracker along with the position of the Pokemon in the team.
     """
 
+    SPECIES_ID = -1
+    TYPE_ID = -1
+    TYPE_OFFSET = -1
+    EVOLUTION_NAMES = ()
+    BASE_STAGE = 0
+    FINAL_STAGE = 0
+
     def __init__(self):
         """
         Initializes a new instance of the Pokemon class.
         
         :complexity: Best and worse case O(1)
         """
+        self.stage = self.BASE_STAGE
         self.health = None
         self.level = None
         self.poketype = None
@@ -29,6 +73,8 @@ class Pokemon(ABC):
         self.experience = None
         self.defence = None
         self.speed = None
+        self.tracker = None
+        self.tracker_index = -1
 
     def get_name(self) -> str:
         """
@@ -129,7 +175,7 @@ class Pokemon(ABC):
         """
         return self.battle_power
 
-    def attack(self, other_pokemon) -> float:
+    def attack(self, other_pokemon, flat_table=None) -> float:
         """
         Calculates and returns the damage that this Pokemon inflicts on the
         other Pokemon during an attack.
@@ -138,21 +184,17 @@ class Pokemon(ABC):
 
         Args:
             other_pokemon (Pokemon): The Pokemon that this Pokemon is attacking.
+            flat_table (array, optional): The flat type effectiveness table to use. Defaults to None for the current
+                                          TypeEffectiveness.FLAT_TABLE.
 
         Returns:
             int: The damage that this Pokemon inflicts on the other Pokemon during an attack.
         """
-        attack = self.get_battle_power()
-        defense = other_pokemon.get_defence()
+        damage = get_base_damage(self.get_battle_power(), other_pokemon.get_defence())
 
-        if defense < attack / 2:
-            damage = attack - defense
-        elif defense < attack:
-            damage = ceil(attack * 5 / 8 - defense / 4)
-        else:
-            damage = ceil(attack / 4)
-
-        multiplier = TypeEffectiveness.get_effectiveness(self.get_poketype(), other_pokemon.get_poketype())
+        if flat_table is None:
+            flat_table = TypeEffectiveness.FLAT_TABLE
+        multiplier = flat_table[self.TYPE_OFFSET + other_pokemon.TYPE_ID]
         effective_damage = damage * multiplier
         return effective_damage
 
@@ -167,7 +209,20 @@ class Pokemon(ABC):
             damage (int): The amount of damage to be inflicted on the Pokemon.
         """
         effective_damage = damage / 2 if damage < self.get_defence() else damage
-        self.health = self.health - effective_damage
+        self.set_health(self.health - effective_damage)
+
+    def set_health(self, health: float) -> None:
+        """
+        Sets the health of the Pokemon and reports it to the TeamStats of its team.
+
+        :complexity: Best and worse case O(1), or the complexity of TeamStats.update_health if the Pokemon is tracked.
+
+        Args:
+            health (float): The new health of the Pokemon.
+        """
+        self.health = health
+        if self.tracker is not None:
+            self.tracker.update_health(self.tracker_index, health)
 
     def level_up(self) -> None:
         """
@@ -177,7 +232,7 @@ class Pokemon(ABC):
         :complexity: Best and worse case O(1)
         """
         self.level += 1
-        if len(self.evolution_line) > 0 and self.evolution_line.index(self.name) != len(self.evolution_line) - 1:
+        if self.stage < self.FINAL_STAGE:
             self._evolve()
 
     def _evolve(self) -> None:
@@ -187,12 +242,14 @@ class Pokemon(ABC):
         
         :complexity: Best and worse case O(1)
         """
-        index = self.get_evolution().index(self.get_name()) + 1
-        self.name = self.get_evolution()[index]
+        self.stage += 1
+        self.name = self.EVOLUTION_NAMES[self.stage]
         self.battle_power *= 1.5
-        self.health *= 1.5
+        self.set_health(self.health * 1.5)
         self.speed *= 1.5
         self.defence *= 1.5
+        if self.tracker is not None:
+            self.tracker.update_battle_power(self.tracker_index, self.battle_power)
 
     def is_alive(self) -> bool:
         """
@@ -205,6 +262,43 @@ class Pokemon(ABC):
         """
         return self.get_health() > 0
 
+    def get_stage(self) -> int:
+        """
+        Returns the index of the current stage of the Pokemon in its evolution line.
+
+        :complexity: Best and worse case O(1)
+
+        Returns:
+            int: The current evolution stage of the Pokemon.
+        """
+        return self.stage
+
+    def snapshot(self) -> tuple:
+        """
+        Returns the mutable state of the Pokemon as a tuple of values, so that it can be restored later.
+
+        :complexity: Best and worse case O(1)
+
+        Returns:
+            tuple: The health, level, battle power, evolution stage, experience, defence and speed of the Pokemon.
+        """
+        return (self.health, self.level, self.battle_power, self.stage, self.experience, self.defence, self.speed)
+
+    def restore(self, state: tuple) -> None:
+        """
+        Restores the mutable state of the Pokemon from a tuple returned by snapshot.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            state (tuple): The state of the Pokemon returned by snapshot.
+        """
+        (self.health, self.level, self.battle_power, self.stage, self.experience, self.defence, self.speed) = state
+        self.name = self.EVOLUTION_NAMES[self.stage]
+        if self.tracker is not None:
+            self.tracker.update_battle_power(self.tracker_index, self.battle_power)
+            self.tracker.update_health(self.tracker_index, self.health)
+
     def __str__(self) -> str:
         """
         Return a string representation of the Pokemon instance in the format:
@@ -216,4 +310,54 @@ class Pokemon(ABC):
             str: A string representation of the Pokemon instance.
         """
         return f"{self.name} (Level {self.level}) with {self.get_health()} health and {self.get_experience()} experience"
+
+
+class BaseStats:
+    """
+    Represents the stats that a newly created Pokemon of a species starts with, along with the maximum health at each
+    stage of its evolution line.
+    """
+
+    EVOLUTION_MULTIPLIER = 1.5
+
+    def __init__(self, pokemon: Pokemon) -> None:
+        """
+        Initializes a new instance of the BaseStats class from a newly created Pokemon.
+
+        :complexity: Best and worse case O(n), where n is the number of stages in the evolution line of the Pokemon.
+
+        Args:
+            pokemon (Pokemon): A newly created Pokemon of the species.
+        """
+        self.health = pokemon.get_health()
+        self.level = pokemon.get_level()
+        self.poketype = pokemon.get_poketype()
+        self.battle_power = pokemon.get_battle_power()
+        self.evolution_line = pokemon.get_evolution()
+        self.name = pokemon.get_name()
+        self.experience = pokemon.get_experience()
+        self.defence = pokemon.get_defence()
+        self.speed = pokemon.get_speed()
+        self.stage = self.evolution_line.index(self.name)
+
+        # Multiplies the health in the same order as _evolve, so the maximum health matches an evolved Pokemon
+        self.stage_health = ArrayR(len(self.evolution_line))
+        health = self.health
+        for stage in range(self.stage, len(self.evolution_line)):
+            self.stage_health[stage] = health
+            health *= self.EVOLUTION_MULTIPLIER
+
+    def get_max_health(self, stage: int) -> float:
+        """
+        Returns the maximum health of the species at a stage of its evolution line.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            stage (int): The index of the stage in the evolution line.
+
+        Returns:
+            float: The maximum health at the stage.
+        """
+        return self.stage_health[stage]
         
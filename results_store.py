@@ -0,0 +1,343 @@
+"""
+This module contains the ResultsStore class
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+import mmap
+import os
+import struct
+from array import array
+from battle import Battle
+from battle_mode import BattleMode
+from poke_team import PokeTeam
+
+
+class ResultsStore:
+    """
+    Stores the outcomes of battles as columns of typed arrays. Rows are buffered in memory and written to disk in
+    chunks, each chunk being a new file that is never changed, and queries read the chunks through memory maps so that
+    the rows are not loaded as Python objects.
+
+    Each chunk file starts with CHUNK_HEADER (the magic bytes, the version and the number of rows), followed by every
+    column in COLUMNS, each padded to a multiple of 8 bytes. The species columns hold TEAM_LIMIT species IDs per row,
+    padded with -1 for smaller teams.
+    """
+
+    MAGIC = b"PKRS"
+    VERSION = 1
+    CHUNK_HEADER = struct.Struct("<4sHI")
+    CHUNK_ROWS = 65536
+    TEAM_LIMIT = PokeTeam.TEAM_LIMIT
+
+    # The name, type code and number of values per row of each column
+    COLUMNS = (("seed", "q", 1), ("mode", "b", 1), ("criterion", "b", 1), ("winner", "b", 1), ("rounds", "I", 1),
+               ("health_1", "d", 1), ("health_2", "d", 1), ("team_1", "i", 1), ("team_2", "i", 1),
+               ("species_1", "b", TEAM_LIMIT), ("species_2", "b", TEAM_LIMIT))
+
+    # Values of the winner column
+    DRAW = 0
+    TRAINER_1 = 1
+    TRAINER_2 = 2
+
+    def __init__(self, directory: str, chunk_rows: int = CHUNK_ROWS) -> None:
+        """
+        Initializes a new instance of the ResultsStore class, creating the directory if it does not exist. Chunks
+        already in the directory are kept, and new rows are added after them.
+
+        :complexity: Best and worse case O(f) where f is the number of files in the directory.
+
+        Args:
+            directory (str): The directory of the chunk files.
+            chunk_rows (int, optional): The number of rows buffered before a chunk is written. Defaults to CHUNK_ROWS.
+        """
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        os.makedirs(directory, exist_ok=True)
+        self.chunk_count = len(self.get_chunk_paths())
+        self.buffer = self._new_columns()
+
+    def _new_columns(self) -> dict:
+        """
+        Returns an empty typed array for each column.
+
+        :complexity: Best and worse case O(c) where c is the number of columns.
+
+        Returns:
+            dict: The array of each column, keyed by name.
+        """
+        return {name: array(typecode) for name, typecode, _ in self.COLUMNS}
+
+    def get_chunk_paths(self) -> list[str]:
+        """
+        Returns the paths of the chunk files in the order they were written.
+
+        :complexity: Best and worse case O(f*log f) where f is the number of files in the directory.
+
+        Returns:
+            list[str]: The paths of the chunk files.
+        """
+        names = sorted(name for name in os.listdir(self.directory) if name.startswith("chunk_")
+                       and name.endswith(".bin"))
+        return [os.path.join(self.directory, name) for name in names]
+
+    def append(self, seed: int, battle_mode: BattleMode, criterion, winner: int, rounds: int, health_1: float,
+               health_2: float, species_1: list[int], species_2: list[int], team_1: int = -1, team_2: int = -1) -> None:
+        """
+        Adds the outcome of one battle, writing a chunk if the buffer is full.
+
+        :complexity: Best and worse case O(n) where n is the TEAM_LIMIT, or O(r) when a chunk is written, where r is
+                     the number of rows in a chunk.
+
+        Args:
+            seed (int): The seed of the battle.
+            battle_mode (BattleMode): The battle mode.
+            criterion (str | tuple | dict | None): The criterion of the battle, stored as its position in the
+                                                   CRITERION_LIST or -1 if it is not in the list.
+            winner (int): DRAW, TRAINER_1 or TRAINER_2.
+            rounds (int): The number of rounds played.
+            health_1 (float): The total health left in team 1.
+            health_2 (float): The total health left in team 2.
+            species_1 (list[int]): The species IDs of team 1.
+            species_2 (list[int]): The species IDs of team 2.
+            team_1 (int, optional): An ID for team 1 chosen by the caller. Defaults to -1.
+            team_2 (int, optional): An ID for team 2 chosen by the caller. Defaults to -1.
+
+        Raises:
+            Exception: If a team has more than TEAM_LIMIT Pokemon
+        """
+        if len(species_1) > self.TEAM_LIMIT or len(species_2) > self.TEAM_LIMIT:
+            raise Exception("Invalid number of Pokemon")
+        buffer = self.buffer
+        buffer["seed"].append(seed)
+        buffer["mode"].append(battle_mode.value)
+        buffer["criterion"].append(PokeTeam.CRITERION_LIST.index(criterion)
+                                   if isinstance(criterion, str) and criterion in PokeTeam.CRITERION_LIST else -1)
+        buffer["winner"].append(winner)
+        buffer["rounds"].append(rounds)
+        buffer["health_1"].append(health_1)
+        buffer["health_2"].append(health_2)
+        buffer["team_1"].append(team_1)
+        buffer["team_2"].append(team_2)
+        buffer["species_1"].extend(species_1)
+        buffer["species_1"].extend([-1] * (self.TEAM_LIMIT - len(species_1)))
+        buffer["species_2"].extend(species_2)
+        buffer["species_2"].extend([-1] * (self.TEAM_LIMIT - len(species_2)))
+        if len(buffer["seed"]) >= self.chunk_rows:
+            self.flush()
+
+    def append_battle(self, battle: Battle, seed: int = 0, team_1: int = -1, team_2: int = -1) -> None:
+        """
+        Adds the outcome of a battle that has been played with commence_battle.
+
+        :complexity: Best and worse case the same as append.
+
+        Args:
+            battle (Battle): The finished battle.
+            seed (int, optional): The seed of the battle. Defaults to 0.
+            team_1 (int, optional): An ID for team 1 chosen by the caller. Defaults to -1.
+            team_2 (int, optional): An ID for team 2 chosen by the caller. Defaults to -1.
+        """
+        winner = battle.get_winner()
+        if winner is battle.trainer_1:
+            result = self.TRAINER_1
+        elif winner is battle.trainer_2:
+            result = self.TRAINER_2
+        else:
+            result = self.DRAW
+        poke_team_1 = battle.trainer_1.get_team()
+        poke_team_2 = battle.trainer_2.get_team()
+        self.append(seed, battle.battle_mode, battle.criterion, result, battle.rounds_played,
+                    poke_team_1.get_total_health(), poke_team_2.get_total_health(),
+                    [pokemon.SPECIES_ID for pokemon in poke_team_1.original_team],
+                    [pokemon.SPECIES_ID for pokemon in poke_team_2.original_team], team_1, team_2)
+
+    def flush(self) -> None:
+        """
+        Writes the buffered rows as a new chunk file. The chunk is written to a temporary file and renamed, so a chunk
+        file is either complete or missing.
+
+        :complexity: Best and worse case O(r) where r is the number of buffered rows.
+        """
+        rows = len(self.buffer["seed"])
+        if rows == 0:
+            return
+        path = os.path.join(self.directory, f"chunk_{self.chunk_count:08d}.bin")
+        with open(path + ".tmp", "wb") as file:
+            file.write(self.CHUNK_HEADER.pack(self.MAGIC, self.VERSION, rows))
+            file.write(bytes(-self.CHUNK_HEADER.size % 8))
+            for name, _, _ in self.COLUMNS:
+                data = self.buffer[name].tobytes()
+                file.write(data)
+                file.write(bytes(-len(data) % 8))
+        os.replace(path + ".tmp", path)
+        self.chunk_count += 1
+        self.buffer = self._new_columns()
+
+    def read_chunks(self, columns: list[str]):
+        """
+        Yields the requested columns of each chunk as memoryviews of the memory mapped file, followed by the buffered
+        rows. The memoryviews are only valid until the next chunk is yielded.
+
+        :complexity: Best and worse case O(k) where k is the number of chunks, excluding the work of the caller.
+
+        Args:
+            columns (list[str]): The names of the columns to read.
+
+        Raises:
+            Exception: If a chunk file is not valid
+        """
+        for path in self.get_chunk_paths():
+            with open(path, "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            views = []
+            try:
+                magic, version, rows = self.CHUNK_HEADER.unpack_from(mapped)
+                if magic != self.MAGIC or version != self.VERSION:
+                    raise Exception("Invalid chunk")
+                offset = self.CHUNK_HEADER.size + -self.CHUNK_HEADER.size % 8
+                data = {}
+                whole = memoryview(mapped)
+                views.append(whole)
+                for name, typecode, width in self.COLUMNS:
+                    size = rows * width * array(typecode).itemsize
+                    if name in columns:
+                        view = whole[offset:offset + size].cast(typecode)
+                        views.append(view)
+                        data[name] = view
+                    offset += size + -size % 8
+                yield rows, data
+            finally:
+                for view in reversed(views):
+                    view.release()
+                mapped.close()
+
+        rows = len(self.buffer["seed"])
+        if rows > 0:
+            yield rows, {name: self.buffer[name] for name in columns}
+
+    def __len__(self) -> int:
+        """
+        Returns the number of rows in the store, including the buffered rows.
+
+        :complexity: Best and worse case O(k) where k is the number of chunks.
+
+        Returns:
+            int: The number of rows.
+        """
+        return sum(rows for rows, _ in self.read_chunks([]))
+
+    def aggregate(self, column: str) -> tuple[int, float, float, float]:
+        """
+        Returns the count, sum, minimum and maximum of a column with one value per row.
+
+        :complexity: Best and worse case O(r) where r is the number of rows.
+
+        Args:
+            column (str): The name of the column.
+
+        Returns:
+            tuple[int, float, float, float]: The count, sum, minimum and maximum, where the minimum and maximum are
+            None if the store is empty.
+        """
+        count = 0
+        total = 0
+        minimum = maximum = None
+        for rows, data in self.read_chunks([column]):
+            values = data[column]
+            count += rows
+            total += sum(values)
+            low = min(values)
+            high = max(values)
+            minimum = low if minimum is None else min(minimum, low)
+            maximum = high if maximum is None else max(maximum, high)
+        return count, total, minimum, maximum
+
+    def group_by(self, key_column: str, value_column: str = None) -> dict:
+        """
+        Groups the rows by a column with one value per row, and returns the number of rows and the sum of another
+        column in each group.
+
+        :complexity: Best and worse case O(r) where r is the number of rows.
+
+        Args:
+            key_column (str): The name of the column to group by.
+            value_column (str, optional): The name of the column to sum. Defaults to None, where only rows are counted.
+
+        Returns:
+            dict: The count and sum of each group, keyed by the value of the key column.
+        """
+        counts = {}
+        totals = {}
+        columns = [key_column] if value_column is None else [key_column, value_column]
+        for _, data in self.read_chunks(columns):
+            keys = data[key_column]
+            if value_column is None:
+                for key in keys:
+                    counts[key] = counts.get(key, 0) + 1
+            else:
+                for key, value in zip(keys, data[value_column]):
+                    counts[key] = counts.get(key, 0) + 1
+                    totals[key] = totals.get(key, 0) + value
+        return {key: (counts[key], totals.get(key, 0)) for key in counts}
+
+    def get_win_rate_by_mode(self) -> dict:
+        """
+        Returns the number of wins of trainer 1, draws and wins of trainer 2 in each battle mode.
+
+        :complexity: Best and worse case O(r) where r is the number of rows.
+
+        Returns:
+            dict: The wins of trainer 1, draws, wins of trainer 2 and win rate of trainer 1, keyed by BattleMode.
+        """
+        counts = array("q", bytes(8 * 3 * len(BattleMode)))
+        for _, data in self.read_chunks(["mode", "winner"]):
+            for mode_value, winner in zip(data["mode"], data["winner"]):
+                counts[mode_value * 3 + winner] += 1
+
+        results = {}
+        for battle_mode in BattleMode:
+            draws, wins_1, wins_2 = counts[battle_mode.value * 3:battle_mode.value * 3 + 3]
+            total = draws + wins_1 + wins_2
+            if total > 0:
+                results[battle_mode] = (wins_1, draws, wins_2, wins_1 / total)
+        return results
+
+    def get_win_rate_by_species(self, battle_mode: BattleMode = None) -> dict:
+        """
+        Returns how many battles a team with each species played and won, counting a species once per team even if the
+        team has more than one of it.
+
+        :complexity: Best and worse case O(r*n) where r is the number of rows and n is the TEAM_LIMIT.
+
+        Args:
+            battle_mode (BattleMode, optional): Only counts battles in this mode. Defaults to None for every mode.
+
+        Returns:
+            dict: The battles, wins and win rate of each species, keyed by the name of the species.
+        """
+        species_count = len(PokeTeam.POKE_LIST)
+        played = array("q", bytes(8 * species_count))
+        won = array("q", bytes(8 * species_count))
+        width = self.TEAM_LIMIT
+        for rows, data in self.read_chunks(["mode", "winner", "species_1", "species_2"]):
+            modes = data["mode"]
+            winners = data["winner"]
+            for side, column in ((self.TRAINER_1, "species_1"), (self.TRAINER_2, "species_2")):
+                species = data[column]
+                for row in range(rows):
+                    if battle_mode is not None and modes[row] != battle_mode.value:
+                        continue
+                    is_winner = winners[row] == side
+                    for species_id in set(species[row * width:(row + 1) * width]):
+                        if species_id >= 0:
+                            played[species_id] += 1
+                            if is_winner:
+                                won[species_id] += 1
+
+        results = {}
+        for species_id in range(species_count):
+            if played[species_id] > 0:
+                results[PokeTeam.POKE_LIST[species_id].__name__] = (played[species_id], won[species_id],
+                                                                    won[species_id] / played[species_id])
+        return results
@@ -0,0 +1,368 @@
+"""
+This module contains the SpeciesAnalytics class
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+import os
+import random
+import struct
+from array import array
+from battle import Battle
+from battle_mode import BattleMode
+from poke_team import PokeTeam, Trainer
+from poke_type import PokeType
+from worker_pool import run_bounded
+
+
+class SpeciesAnalytics:
+    """
+    Keeps running counts of the battles played, won, drawn and fainted in by the Pokemon of each species, each
+    PokeType and each evolution stage, in one flat array of FIELD_COUNT counts per group. Battles are added one at a
+    time, so memory does not grow with the number of battles, and the counts of analytics built in different processes
+    can be merged by adding them.
+
+    Species are indexed by their position in get_all_pokemon_types, types by their PokeType value and stages by the
+    stage reached by the Pokemon at the end of the battle. Every Pokemon in a team is counted, so a species that
+    appears twice in a team is counted twice.
+    """
+
+    MAGIC = b"PKSA"
+    VERSION = 1
+    SNAPSHOT_HEADER = struct.Struct("<4sHHHHq")
+
+    PLAYED = 0
+    WON = 1
+    DRAWN = 2
+    FAINTED = 3
+    FIELD_COUNT = 4
+
+    SPECIES_COUNT = len(PokeTeam.POKE_LIST)
+    TYPE_COUNT = len(PokeType)
+    STAGE_COUNT = max(PokeTeam.POKE_LIST[i].FINAL_STAGE for i in range(len(PokeTeam.POKE_LIST))) + 1
+    SPECIES_OFFSET = 0
+    TYPE_OFFSET = SPECIES_COUNT
+    STAGE_OFFSET = SPECIES_COUNT + TYPE_COUNT
+    GROUP_COUNT = SPECIES_COUNT + TYPE_COUNT + STAGE_COUNT
+
+    def __init__(self, snapshot_path: str = None, snapshot_interval: int = 10000) -> None:
+        """
+        Initializes a new instance of the SpeciesAnalytics class with every count at 0.
+
+        :complexity: Best and worse case O(g) where g is the number of groups.
+
+        Args:
+            snapshot_path (str, optional): The file that a snapshot is written to every snapshot_interval battles.
+                                           Defaults to None, where snapshots are only written by write_snapshot.
+            snapshot_interval (int, optional): The number of battles between snapshots. Defaults to 10000.
+        """
+        self.counts = array("q", bytes(8 * self.GROUP_COUNT * self.FIELD_COUNT))
+        self.battles = 0
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+
+    def _add_pokemon(self, species_id: int, type_id: int, stage: int, result: int, fainted: bool) -> None:
+        """
+        Adds one Pokemon that played a battle to the counts of its species, type and stage.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            species_id (int): The species ID of the Pokemon.
+            type_id (int): The PokeType value of the Pokemon.
+            stage (int): The evolution stage of the Pokemon.
+            result (int): WON, DRAWN or -1 for a loss.
+            fainted (bool): Whether the Pokemon fainted.
+        """
+        counts = self.counts
+        for group in (self.SPECIES_OFFSET + species_id, self.TYPE_OFFSET + type_id, self.STAGE_OFFSET + stage):
+            base = group * self.FIELD_COUNT
+            counts[base + self.PLAYED] += 1
+            if result != -1:
+                counts[base + result] += 1
+            if fainted:
+                counts[base + self.FAINTED] += 1
+
+    def _end_battle(self) -> None:
+        """
+        Counts a battle and writes a snapshot if the snapshot interval has been reached.
+
+        :complexity: Best and worse case O(1), or O(g) when a snapshot is written, where g is the number of groups.
+        """
+        self.battles += 1
+        if self.snapshot_path is not None and self.battles % self.snapshot_interval == 0:
+            self.write_snapshot(self.snapshot_path)
+
+    def add_battle(self, battle: Battle) -> None:
+        """
+        Adds a battle that has been played with commence_battle. A Pokemon fainted if its health is 0 or less at the
+        end of the battle.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in both teams.
+
+        Args:
+            battle (Battle): The finished battle.
+        """
+        winner = battle.get_winner()
+        for trainer in (battle.trainer_1, battle.trainer_2):
+            if winner is None:
+                result = self.DRAWN
+            else:
+                result = self.WON if winner is trainer else -1
+            team = trainer.get_team().original_team
+            for i in range(len(team)):
+                pokemon = team[i]
+                self._add_pokemon(pokemon.SPECIES_ID, pokemon.TYPE_ID, pokemon.stage, result, pokemon.health <= 0)
+        self._end_battle()
+
+    def add_outcome(self, species_1: list[int], species_2: list[int], winner: int) -> None:
+        """
+        Adds a battle from its teams and winner only, such as a row of a ResultsStore. Faints are not known, and every
+        Pokemon is counted at the base stage of its species.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in both teams.
+
+        Args:
+            species_1 (list[int]): The species IDs of team 1, where negative IDs are ignored.
+            species_2 (list[int]): The species IDs of team 2, where negative IDs are ignored.
+            winner (int): 0 for a draw, 1 if trainer 1 won or 2 if trainer 2 won.
+        """
+        poke_list = PokeTeam.POKE_LIST
+        for side, species in ((1, species_1), (2, species_2)):
+            if winner == 0:
+                result = self.DRAWN
+            else:
+                result = self.WON if winner == side else -1
+            for species_id in species:
+                if species_id >= 0:
+                    species_type = poke_list[species_id]
+                    self._add_pokemon(species_id, species_type.TYPE_ID, species_type.BASE_STAGE, result, False)
+        self._end_battle()
+
+    def add_results(self, store) -> None:
+        """
+        Adds every row of a ResultsStore, reading it one chunk at a time.
+
+        :complexity: Best and worse case O(r*n) where r is the number of rows and n is the TEAM_LIMIT.
+
+        Args:
+            store (ResultsStore): The results to add.
+        """
+        width = store.TEAM_LIMIT
+        for rows, data in store.read_chunks(["winner", "species_1", "species_2"]):
+            winners = data["winner"]
+            species_1 = data["species_1"]
+            species_2 = data["species_2"]
+            for row in range(rows):
+                self.add_outcome(species_1[row * width:(row + 1) * width], species_2[row * width:(row + 1) * width],
+                                 winners[row])
+
+    def merge(self, other: "SpeciesAnalytics") -> None:
+        """
+        Adds the counts of other analytics, such as those built by another process, to these.
+
+        :complexity: Best and worse case O(g) where g is the number of groups.
+
+        Args:
+            other (SpeciesAnalytics): The analytics to add.
+        """
+        counts = self.counts
+        for i, count in enumerate(other.counts):
+            counts[i] += count
+        self.battles += other.battles
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns the counts as bytes that can be sent between processes or saved.
+
+        :complexity: Best and worse case O(g) where g is the number of groups.
+
+        Returns:
+            bytes: The snapshot.
+        """
+        return self.SNAPSHOT_HEADER.pack(self.MAGIC, self.VERSION, self.SPECIES_COUNT, self.TYPE_COUNT,
+                                         self.STAGE_COUNT, self.battles) + self.counts.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SpeciesAnalytics":
+        """
+        Returns the analytics saved by to_bytes.
+
+        :complexity: Best and worse case O(g) where g is the number of groups.
+
+        Args:
+            data (bytes): The snapshot.
+
+        Returns:
+            SpeciesAnalytics: The analytics in the snapshot.
+
+        Raises:
+            Exception: If the snapshot was made with a different version or number of groups
+        """
+        magic, version, species_count, type_count, stage_count, battles = cls.SNAPSHOT_HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION or \
+                (species_count, type_count, stage_count) != (cls.SPECIES_COUNT, cls.TYPE_COUNT, cls.STAGE_COUNT):
+            raise Exception("Invalid snapshot")
+        analytics = cls()
+        analytics.counts = array("q", data[cls.SNAPSHOT_HEADER.size:])
+        analytics.battles = battles
+        return analytics
+
+    def write_snapshot(self, path: str) -> None:
+        """
+        Writes the counts to a file, replacing it only once the new snapshot is complete.
+
+        :complexity: Best and worse case O(g) where g is the number of groups.
+
+        Args:
+            path (str): The file to write to.
+        """
+        with open(path + ".tmp", "wb") as file:
+            file.write(self.to_bytes())
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def read_snapshot(cls, path: str) -> "SpeciesAnalytics":
+        """
+        Reads the analytics written by write_snapshot.
+
+        :complexity: Best and worse case O(g) where g is the number of groups.
+
+        Args:
+            path (str): The file to read from.
+
+        Returns:
+            SpeciesAnalytics: The analytics in the file.
+        """
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+    def get_counts(self, group: int) -> tuple[int, int, int, int]:
+        """
+        Returns the counts of a group.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            group (int): The index of the group, the species ID plus SPECIES_OFFSET, the PokeType value plus
+                         TYPE_OFFSET or the stage plus STAGE_OFFSET.
+
+        Returns:
+            tuple[int, int, int, int]: The Pokemon that played, won, drew and fainted.
+        """
+        base = group * self.FIELD_COUNT
+        return tuple(self.counts[base:base + self.FIELD_COUNT])
+
+    def _get_rates(self, offset: int, labels) -> dict:
+        """
+        Returns the counts, win rate and faint rate of each group in a range that played at least once.
+
+        :complexity: Best and worse case O(g) where g is the number of groups in the range.
+
+        Args:
+            offset (int): The index of the first group in the range.
+            labels (list): The key of each group in the range.
+
+        Returns:
+            dict: The played, won, drawn and fainted counts, win rate and faint rate of each group.
+        """
+        rates = {}
+        for i, label in enumerate(labels):
+            played, won, drawn, fainted = self.get_counts(offset + i)
+            if played > 0:
+                rates[label] = (played, won, drawn, fainted, won / played, fainted / played)
+        return rates
+
+    def get_species_rates(self) -> dict:
+        """
+        Returns the counts, win rate and faint rate of each species.
+
+        :complexity: Best and worse case O(s) where s is the number of species.
+
+        Returns:
+            dict: The played, won, drawn and fainted counts, win rate and faint rate, keyed by species name.
+        """
+        poke_list = PokeTeam.POKE_LIST
+        return self._get_rates(self.SPECIES_OFFSET, [poke_list[i].__name__ for i in range(self.SPECIES_COUNT)])
+
+    def get_type_rates(self) -> dict:
+        """
+        Returns the counts, win rate and faint rate of each PokeType.
+
+        :complexity: Best and worse case O(t) where t is the number of types.
+
+        Returns:
+            dict: The played, won, drawn and fainted counts, win rate and faint rate, keyed by PokeType.
+        """
+        return self._get_rates(self.TYPE_OFFSET, list(PokeType))
+
+    def get_stage_rates(self) -> dict:
+        """
+        Returns the counts, win rate and faint rate of each evolution stage.
+
+        :complexity: Best and worse case O(m) where m is the number of stages.
+
+        Returns:
+            dict: The played, won, drawn and fainted counts, win rate and faint rate, keyed by stage.
+        """
+        return self._get_rates(self.STAGE_OFFSET, list(range(self.STAGE_COUNT)))
+
+
+def _analyse_seeds(mode_value: int, criterion, seeds: list[int]) -> bytes:
+    """
+    Plays a battle between random teams for each seed and returns the analytics as bytes. The battles use the global
+    random number generator, which is seeded for each battle and restored afterwards, so that playing the seeds in the
+    calling process does not change its random state.
+
+    :complexity: Best and worse case O(c*b) where c is the number of seeds and b is the complexity of commence_battle.
+    """
+    battle_mode = BattleMode(mode_value)
+    analytics = SpeciesAnalytics()
+    state = random.getstate()
+    try:
+        for seed in seeds:
+            random.seed(seed)
+            battle = Battle(Trainer("Gary"), Trainer("Ash"), battle_mode, criterion)
+            battle._create_teams()
+            battle.commence_battle()
+            analytics.add_battle(battle)
+    finally:
+        random.setstate(state)
+    return analytics.to_bytes()
+
+
+def analyse_battles(seeds: list[int], battle_mode: BattleMode, criterion="health", workers: int = None,
+                    chunk_size: int = 1000, snapshot_path: str = None) -> SpeciesAnalytics:
+    """
+    Plays a battle between random teams for each seed, one chunk of seeds at a time, merging the analytics of each
+    chunk as it finishes and writing a snapshot after each merge. The chunks are played with run_bounded, in worker
+    processes with more than one worker, and are merged in the order they finish. The battles seed the global random
+    number generator, and its state is restored after each chunk.
+
+    :complexity: Best and worse case O(c*b/w) where c is the number of seeds, b is the complexity of commence_battle
+                 and w is the number of workers.
+
+    Args:
+        seeds (list[int]): The seed of each battle.
+        battle_mode (BattleMode): The battle mode.
+        criterion (str | tuple | dict, optional): The criterion for OPTIMISE battles. Defaults to "health".
+        workers (int, optional): The number of worker processes, where 1 plays every battle in this process. Defaults
+                                 to None for the number of CPUs.
+        chunk_size (int, optional): The number of seeds given to a worker at a time. Defaults to 1000.
+        snapshot_path (str, optional): The file to write snapshots to. Defaults to None.
+
+    Returns:
+        SpeciesAnalytics: The merged analytics of every battle.
+    """
+    analytics = SpeciesAnalytics()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = (seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size))
+
+    def merge(data: bytes) -> None:
+        analytics.merge(SpeciesAnalytics.from_bytes(data))
+        if snapshot_path is not None:
+            analytics.write_snapshot(snapshot_path)
+
+    run_bounded(_analyse_seeds, ((battle_mode.value, criterion, chunk) for chunk in chunks), merge, workers)
+    return analytics
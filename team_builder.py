@@ -0,0 +1,402 @@
+"""
+This module contains the GenerationStats and TeamBuilder classes
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from battle import play_match
+from battle_mode import BattleMode
+from counter_index import get_counter_index
+from outcome import WIN, DRAW
+from poke_type import TypeEffectiveness
+from pokemon import get_all_pokemon_types
+
+ALL_SPECIES = [pokemon_type.__name__ for pokemon_type in get_all_pokemon_types()]
+ALL_TYPE_IDS = [pokemon_type.TYPE_ID for pokemon_type in get_all_pokemon_types()]
+
+
+def evaluate_team(team: tuple, reference_pool: list, mode_value: int, criterion: str) -> float:
+    """
+    Plays a battle between a team and every team in the reference pool, and returns the fraction of points won, where
+    a win is worth 1 point and a draw half a point.
+
+    :complexity: Best and worse case O(r*(n*m + b)), where r is the number of reference teams, n is the number of
+                 Pokemon in each team, m is the number of Pokemon in the POKE_LIST and b is the complexity of
+                 commence_battle.
+
+    Args:
+        team (tuple): The species IDs of the team.
+        reference_pool (list): The species IDs of each reference team.
+        mode_value (int): The value of the battle mode.
+        criterion (str): The criterion to sort the teams for Optimise mode.
+
+    Returns:
+        float: The fitness of the team between 0 and 1.
+    """
+    battle_mode = BattleMode(mode_value)
+    species = [ALL_SPECIES[species_id] for species_id in team]
+    points = 0
+    for reference in reference_pool:
+        outcome = play_match(species, [ALL_SPECIES[species_id] for species_id in reference], battle_mode, criterion)
+        if outcome == WIN:
+            points += 2
+        elif outcome == DRAW:
+            points += 1
+    return points / (2 * len(reference_pool))
+
+
+def evaluate_teams(teams: list, reference_pool: list, mode_value: int, criterion: str) -> list[float]:
+    """
+    Finds the fitness of a batch of teams in a worker process of the TeamBuilder, reloading the type effectiveness
+    tables first if their CSV has been modified, so that workers pick up changes without being restarted.
+
+    :complexity: Best and worse case O(t*e) where t is the number of teams and e is the complexity of evaluate_team,
+                 plus the complexity of reload if the CSV has been modified.
+
+    Args:
+        teams (list): The species IDs of each team.
+        reference_pool (list): The species IDs of each reference team.
+        mode_value (int): The value of the battle mode.
+        criterion (str): The criterion to sort the teams for Optimise mode.
+
+    Returns:
+        list[float]: The fitness of each team.
+    """
+    TypeEffectiveness.reload_if_modified()
+    return [evaluate_team(team, reference_pool, mode_value, criterion) for team in teams]
+
+
+class GenerationStats:
+    """
+    Represents the progress of the TeamBuilder after one generation.
+    """
+
+    def __init__(self, generation: int, best_team: tuple, best_fitness: float, mean_fitness: float, evaluations: int,
+                 cache_hits: int, seconds: float, reference_size: int) -> None:
+        """
+        Initializes a new instance of the GenerationStats class.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            generation (int): The number of the generation, starting from 0 for the first population.
+            best_team (tuple): The species IDs of the fittest team.
+            best_fitness (float): The fitness of the fittest team.
+            mean_fitness (float): The mean fitness of the population.
+            evaluations (int): The number of teams evaluated with battles in this generation.
+            cache_hits (int): The number of teams whose fitness was already known.
+            seconds (float): The time taken by the generation in seconds.
+            reference_size (int): The number of teams in the reference pool.
+        """
+        self.generation = generation
+        self.best_team = best_team
+        self.best_fitness = best_fitness
+        self.mean_fitness = mean_fitness
+        self.evaluations = evaluations
+        self.cache_hits = cache_hits
+        self.seconds = seconds
+        self.battles = evaluations * reference_size
+
+    def get_best_species(self) -> list[str]:
+        """
+        Returns the names of the species in the fittest team.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the team.
+
+        Returns:
+            list[str]: The names of the species.
+        """
+        return [ALL_SPECIES[species_id] for species_id in self.best_team]
+
+    def get_throughput(self) -> float:
+        """
+        Returns the number of battles played per second in this generation.
+
+        :complexity: Best and worse case O(1)
+
+        Returns:
+            float: The battles per second.
+        """
+        return self.battles / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        """
+        Returns a string of the following format:
+        Generation <generation>: best <best>, mean <mean>, <evaluations> evaluated, <hits> cached, <rate> battles/s
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the team.
+
+        Returns:
+            str: The stats as a string.
+        """
+        return (f"Generation {self.generation}: best {self.best_fitness:.3f} {self.get_best_species()}, "
+                f"mean {self.mean_fitness:.3f}, {self.evaluations} evaluated, {self.cache_hits} cached, "
+                f"{self.get_throughput():.0f} battles/s")
+
+
+class TeamBuilder:
+    """
+    Evolves teams with a genetic algorithm, where each team is a list of species IDs and its fitness is the fraction of
+    points it wins in battles against a reference pool of teams.
+    """
+
+    TEAM_SIZE = 6
+    TOURNAMENT_SIZE = 3
+    ELITE_COUNT = 2
+    COUNTER_DEPTH = 5
+
+    def __init__(self, reference_pool: list, battle_mode: BattleMode, criterion: str = "health",
+                 population_size: int = 20, mutation_rate: float = 0.2, seed: int = 0, workers: int = 1,
+                 counter_rate: float = 0.0) -> None:
+        """
+        Initializes a new instance of the TeamBuilder class with a random population.
+
+        :complexity: Best and worse case O(p*n + r*n*m) where p is the population size, n is the TEAM_SIZE, r is the
+                     number of reference teams and m is the number of Pokemon in the POKE_LIST.
+
+        Args:
+            reference_pool (list): The species of each reference team, as Pokemon classes or their names.
+            battle_mode (BattleMode): The battle mode of every battle.
+            criterion (str, optional): The criterion to sort the teams for Optimise mode. Defaults to "health".
+            population_size (int, optional): The number of teams in each generation. Defaults to 20.
+            mutation_rate (float, optional): The chance of each species in a child team being replaced by a random
+                                             species. Defaults to 0.2.
+            seed (int, optional): The seed of the random number generator. Defaults to 0.
+            workers (int, optional): The number of worker processes, where 1 plays every battle in this process.
+                                     Defaults to 1.
+            counter_rate (float, optional): The chance of a mutated species being one of the COUNTER_DEPTH best
+                                            counters of a type in the reference pool instead of a random species.
+                                            Defaults to 0.0.
+
+        Raises:
+            Exception: If the reference pool is empty
+            Exception: If the population size is smaller than ELITE_COUNT
+        """
+        if len(reference_pool) == 0:
+            raise Exception("Invalid reference pool")
+        if population_size < self.ELITE_COUNT:
+            raise Exception("Invalid population size")
+
+        self.reference_pool = [tuple(self.get_species_id(species) for species in team) for team in reference_pool]
+        self.battle_mode = battle_mode
+        self.criterion = criterion
+        self.population_size = population_size
+        self.mutation_rate = mutation_rate
+        self.workers = workers
+        self.counter_rate = counter_rate
+        self.counter_types = sorted({ALL_TYPE_IDS[species_id] for team in self.reference_pool for species_id in team})
+        self.generator = random.Random(seed)
+        self.fitness = {}
+        self.version = TypeEffectiveness.VERSION
+        self.generation = 0
+        self.population = [self.random_team() for _ in range(population_size)]
+
+    @staticmethod
+    def get_species_id(species) -> int:
+        """
+        Returns the species ID of a Pokemon class or the name of a Pokemon class.
+
+        :complexity: Best case O(1) if a Pokemon class is given and worse case O(m) if a name is given, where m is the
+                     number of Pokemon in the POKE_LIST.
+
+        Args:
+            species (type[Pokemon] | str): The Pokemon class or the name of the Pokemon class.
+
+        Raises:
+            Exception: If the species does not exist
+
+        Returns:
+            int: The species ID.
+        """
+        if not isinstance(species, str):
+            return species.SPECIES_ID
+        if species not in ALL_SPECIES:
+            raise Exception("Invalid Pokemon")
+        return ALL_SPECIES.index(species)
+
+    def random_team(self) -> tuple:
+        """
+        Returns a team of TEAM_SIZE random species.
+
+        :complexity: Best and worse case O(n) where n is the TEAM_SIZE.
+
+        Returns:
+            tuple: The species IDs of the team.
+        """
+        return tuple(self.generator.randrange(len(ALL_SPECIES)) for _ in range(self.TEAM_SIZE))
+
+    def select(self) -> tuple:
+        """
+        Picks a parent from the population with a tournament between TOURNAMENT_SIZE random teams.
+
+        :complexity: Best and worse case O(t) where t is the TOURNAMENT_SIZE.
+
+        Returns:
+            tuple: The species IDs of the fittest team in the tournament.
+        """
+        contestants = [self.generator.choice(self.population) for _ in range(self.TOURNAMENT_SIZE)]
+        return max(contestants, key=lambda team: self.fitness[team])
+
+    def crossover(self, parent_1: tuple, parent_2: tuple) -> tuple:
+        """
+        Returns a child team made of the start of one parent and the end of the other, split at a random position.
+
+        :complexity: Best and worse case O(n) where n is the TEAM_SIZE.
+
+        Args:
+            parent_1 (tuple): The species IDs of the first parent.
+            parent_2 (tuple): The species IDs of the second parent.
+
+        Returns:
+            tuple: The species IDs of the child.
+        """
+        split = self.generator.randrange(1, self.TEAM_SIZE)
+        return parent_1[:split] + parent_2[split:]
+
+    def mutate(self, team: tuple) -> tuple:
+        """
+        Returns a copy of a team where each species is replaced with a chance of mutation_rate, by one of the best
+        counters of a random type in the reference pool with a chance of counter_rate, or by a random species otherwise.
+
+        :complexity: Best and worse case O(n) where n is the TEAM_SIZE.
+
+        Args:
+            team (tuple): The species IDs of the team.
+
+        Returns:
+            tuple: The species IDs of the mutated team.
+        """
+        return tuple(self.mutate_species() if self.generator.random() < self.mutation_rate else species_id
+                     for species_id in team)
+
+    def mutate_species(self) -> int:
+        """
+        Returns the species that replaces a mutated species.
+
+        :complexity: Best and worse case O(1)
+
+        Returns:
+            int: The species ID of the new species.
+        """
+        if self.counter_rate > 0 and self.generator.random() < self.counter_rate:
+            type_id = self.generator.choice(self.counter_types)
+            return get_counter_index().get_counter(type_id, self.generator.randrange(self.COUNTER_DEPTH))
+        return self.generator.randrange(len(ALL_SPECIES))
+
+    def evaluate(self, teams: list, executor: ProcessPoolExecutor = None) -> tuple[int, int]:
+        """
+        Finds the fitness of every team that has not been evaluated before, in parallel if there is more than one
+        worker, where each worker is given one batch of teams. Teams are remembered by their species IDs in order,
+        since the order changes the battles. If the type effectiveness CSV has been modified, the tables are reloaded
+        once for the generation and every remembered fitness is forgotten.
+
+        :complexity: Best case O(p) if every team has been evaluated, and worse case O(p*e) otherwise, where p is the
+                     number of teams and e is the complexity of evaluate_team.
+
+        Args:
+            teams (list): The species IDs of each team.
+            executor (ProcessPoolExecutor, optional): The pool to evaluate the teams in. Defaults to None, where a
+                                                      pool is created for this call if there is more than one worker.
+
+        Returns:
+            tuple[int, int]: The number of teams evaluated and the number of teams that were already known.
+        """
+        TypeEffectiveness.reload_if_modified()
+        if self.version != TypeEffectiveness.VERSION:
+            self.fitness = {}
+            self.version = TypeEffectiveness.VERSION
+
+        new_teams = []
+        for team in teams:
+            if team not in self.fitness and team not in new_teams:
+                new_teams.append(team)
+
+        count = len(new_teams)
+        if count > 0 and (executor is not None or (self.workers > 1 and count > 1)):
+            # Each worker reloads the tables at most once for its batch
+            size = -(-count // self.workers)
+            batches = [new_teams[i:i + size] for i in range(0, count, size)]
+            arguments = ([self.reference_pool] * len(batches), [self.battle_mode.value] * len(batches),
+                         [self.criterion] * len(batches))
+            if executor is not None:
+                results = [fitness for batch in executor.map(evaluate_teams, batches, *arguments) for fitness in batch]
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    results = [fitness for batch in executor.map(evaluate_teams, batches, *arguments)
+                               for fitness in batch]
+        else:
+            results = [evaluate_team(team, self.reference_pool, self.battle_mode.value, self.criterion)
+                       for team in new_teams]
+
+        for team, fitness in zip(new_teams, results):
+            self.fitness[team] = fitness
+        return count, len(teams) - count
+
+    def next_generation(self) -> list:
+        """
+        Returns the next population, keeping the ELITE_COUNT fittest teams and filling the rest with mutated children
+        of selected parents.
+
+        :complexity: Best and worse case O(p*(n + t) + p*log p) where p is the population size, n is the TEAM_SIZE and
+                     t is the TOURNAMENT_SIZE.
+
+        Returns:
+            list: The species IDs of each team in the next population.
+        """
+        ranked = sorted(self.population, key=lambda team: self.fitness[team], reverse=True)
+        population = ranked[:self.ELITE_COUNT]
+        while len(population) < self.population_size:
+            child = self.crossover(self.select(), self.select())
+            population.append(self.mutate(child))
+        return population
+
+    def evolve(self, generations: int):
+        """
+        Evolves the population for a number of generations, yielding a GenerationStats after each one so that the
+        progress can be tracked. The first generation evaluates the current population.
+
+        :complexity: Best and worse case O(g*(p*e + p*log p)) where g is the number of generations, p is the population
+                     size and e is the complexity of evaluate_team.
+
+        Args:
+            generations (int): The number of generations.
+        """
+        # The same worker processes are used for every generation
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            for _ in range(generations):
+                start = time.perf_counter()
+                if self.generation > 0:
+                    self.population = self.next_generation()
+                evaluations, cache_hits = self.evaluate(self.population, executor)
+
+                scores = [self.fitness[team] for team in self.population]
+                best_team = max(self.population, key=lambda team: self.fitness[team])
+                stats = GenerationStats(self.generation, best_team, self.fitness[best_team],
+                                        sum(scores) / len(scores), evaluations, cache_hits,
+                                        time.perf_counter() - start, len(self.reference_pool))
+                self.generation += 1
+                yield stats
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def run(self, generations: int) -> tuple[list[str], float]:
+        """
+        Evolves the population for a number of generations and returns the fittest team found.
+
+        :complexity: Best and worse case the same as evolve.
+
+        Args:
+            generations (int): The number of generations.
+
+        Returns:
+            tuple[list[str], float]: The names of the species of the fittest team and its fitness.
+        """
+        for _ in self.evolve(generations):
+            pass
+        best_team = max(self.fitness, key=self.fitness.get)
+        return [ALL_SPECIES[species_id] for species_id in best_team], self.fitness[best_team]
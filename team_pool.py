@@ -0,0 +1,152 @@
+"""
+This module contains the TeamPool class
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+from pokemon import Pokemon, SPECIES_STATS
+from data_structures.referential_array import ArrayR
+from data_structures.array_sorted_list import ArraySortedList
+from data_structures.sorted_list_adt import ListItem
+
+
+class TeamPool:
+    """
+    Keeps the Pokemon, ListItems, arrays and team ADTs released by a PokeTeam so that later teams can reuse them
+    instead of creating new ones. Everything taken from the pool is reset in place to the state of a new instance.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new instance of the TeamPool class.
+
+        :complexity: Best and worst case is O(1)
+        """
+        self.pokemon = {}
+        self.items = []
+        self.structures = {}
+        self.created = 0
+        self.reused = 0
+
+    def acquire_pokemon(self, pokemon_type: type[Pokemon]) -> Pokemon:
+        """
+        Returns a Pokemon of a species with the stats of a new Pokemon.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            pokemon_type (type[Pokemon]): The species of the Pokemon.
+
+        Returns:
+            Pokemon: A reused or new Pokemon.
+        """
+        free = self.pokemon.get(pokemon_type.SPECIES_ID)
+        if not free:
+            self.created += 1
+            return pokemon_type()
+        self.reused += 1
+        pokemon = free.pop()
+        stats = SPECIES_STATS[pokemon_type.SPECIES_ID]
+        pokemon.restore((stats.health, stats.level, stats.battle_power, stats.stage, stats.experience, stats.defence,
+                         stats.speed))
+        return pokemon
+
+    def release_pokemon(self, pokemon: Pokemon) -> None:
+        """
+        Returns a Pokemon to the pool, so that it no longer reports to the TeamStats of its team.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            pokemon (Pokemon): A Pokemon that is no longer used.
+        """
+        pokemon.tracker = None
+        pokemon.tracker_index = -1
+        free = self.pokemon.get(pokemon.SPECIES_ID)
+        if free is None:
+            free = self.pokemon[pokemon.SPECIES_ID] = []
+        free.append(pokemon)
+
+    def acquire_item(self, value: Pokemon, key: float) -> ListItem:
+        """
+        Returns a ListItem holding a value and key.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            value (Pokemon): The value of the item.
+            key (float): The key of the item.
+
+        Returns:
+            ListItem: A reused or new ListItem.
+        """
+        if not self.items:
+            self.created += 1
+            return ListItem(value, key)
+        self.reused += 1
+        item = self.items.pop()
+        item.value = value
+        item.key = key
+        return item
+
+    def release_item(self, item: ListItem) -> None:
+        """
+        Returns a ListItem to the pool.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            item (ListItem): A ListItem that is no longer used.
+        """
+        item.value = None
+        self.items.append(item)
+
+    def acquire(self, structure_type: type, capacity: int):
+        """
+        Returns an empty ArrayR, ArrayStack, CircularQueue or ArraySortedList with a capacity.
+
+        :complexity: Best and worse case O(1) if a structure is reused, and O(n) if one is created, where n is the
+                     capacity.
+
+        Args:
+            structure_type (type): The class of the structure.
+            capacity (int): The capacity of the structure.
+
+        Returns:
+            ArrayR | ArrayStack | CircularQueue | ArraySortedList: A reused or new empty structure.
+        """
+        free = self.structures.get((structure_type, capacity))
+        if not free:
+            self.created += 1
+            return structure_type(capacity)
+        self.reused += 1
+        structure = free.pop()
+        if structure_type is ArraySortedList:
+            structure.reset()
+        elif structure_type is not ArrayR:
+            structure.clear()
+        return structure
+
+    def release(self, structure) -> None:
+        """
+        Returns an ArrayR, ArrayStack, CircularQueue or ArraySortedList to the pool. The items of an ArraySortedList
+        are released with it, but the Pokemon in any structure are not.
+
+        :complexity: Best and worse case O(1), or O(n) for an ArraySortedList, where n is the number of items in it.
+
+        Args:
+            structure (ArrayR | ArrayStack | CircularQueue | ArraySortedList): A structure that is no longer used.
+        """
+        if type(structure) is ArraySortedList:
+            for i in range(len(structure)):
+                self.release_item(structure.array[i])
+            capacity = len(structure.array)
+        elif type(structure) is ArrayR:
+            capacity = len(structure)
+        else:
+            capacity = len(structure.array)
+        key = (type(structure), capacity)
+        free = self.structures.get(key)
+        if free is None:
+            free = self.structures[key] = []
+        free.append(structure)
@@ -0,0 +1,149 @@
+"""
+This module contains the TeamStats class
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+from array import array
+
+
+class TeamStats:
+    """
+    Keeps the health and battle power of every Pokemon in a team in parallel arrays, along with running aggregates of
+    the team, so that they can be read in O(1) without going through the battle team ADT. Each Pokemon reports its
+    changes by calling update_health and update_battle_power.
+    """
+
+    def __init__(self, team) -> None:
+        """
+        Initializes a new instance of the TeamStats class and makes every Pokemon in the team report to it.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the team.
+
+        Args:
+            team (ArrayR[Pokemon]): The original team.
+        """
+        self.members = [team[i] for i in range(len(team))]
+        self.health = array("d", bytes(8 * len(self.members)))
+        self.battle_power = array("d", bytes(8 * len(self.members)))
+        self.alive_count = 0
+        self.total_health = 0
+        self.strongest = -1
+        for index, pokemon in enumerate(self.members):
+            pokemon.tracker = self
+            pokemon.tracker_index = index
+            self.battle_power[index] = pokemon.battle_power
+            self.update_health(index, pokemon.health)
+
+    def detach(self) -> None:
+        """
+        Stops the Pokemon in the team from reporting to these stats.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the team.
+        """
+        for pokemon in self.members:
+            if pokemon.tracker is self:
+                pokemon.tracker = None
+                pokemon.tracker_index = -1
+
+    def update_health(self, index: int, health: float) -> None:
+        """
+        Records the new health of the Pokemon at an index, updating the alive count and total health, and finding the
+        strongest Pokemon again if it fainted.
+
+        :complexity: Best and worse case O(1), or O(n) if the alive state of the Pokemon changed, where n is the
+                     number of Pokemon in the team.
+
+        Args:
+            index (int): The position of the Pokemon in the team.
+            health (float): The new health of the Pokemon.
+        """
+        old_health = self.health[index]
+        self.health[index] = health
+        was_alive = old_health > 0
+        is_alive = health > 0
+        if is_alive:
+            self.total_health += health
+        if was_alive:
+            self.total_health -= old_health
+
+        if was_alive != is_alive:
+            self.alive_count += 1 if is_alive else -1
+            self._find_strongest()
+
+    def update_battle_power(self, index: int, battle_power: float) -> None:
+        """
+        Records the new battle power of the Pokemon at an index, updating the strongest Pokemon.
+
+        :complexity: Best and worse case O(1) if the battle power increased, or O(n) if the strongest Pokemon lost
+                     battle power, where n is the number of Pokemon in the team.
+
+        Args:
+            index (int): The position of the Pokemon in the team.
+            battle_power (float): The new battle power of the Pokemon.
+        """
+        old_battle_power = self.battle_power[index]
+        self.battle_power[index] = battle_power
+        if self.health[index] <= 0:
+            return
+        if battle_power >= old_battle_power:
+            if self.strongest == -1 or battle_power > self.battle_power[self.strongest]:
+                self.strongest = index
+        elif index == self.strongest:
+            self._find_strongest()
+
+    def _find_strongest(self) -> None:
+        """
+        Finds the alive Pokemon with the highest battle power, preferring the earliest one in the team when tied.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the team.
+        """
+        strongest = -1
+        for index in range(len(self.members)):
+            if self.health[index] > 0 and (strongest == -1 or self.battle_power[index] > self.battle_power[strongest]):
+                strongest = index
+        self.strongest = strongest
+
+    def get_alive_count(self) -> int:
+        """
+        Returns the number of Pokemon in the team that have not fainted.
+
+        :complexity: Best and worse case O(1)
+
+        Returns:
+            int: The number of alive Pokemon.
+        """
+        return self.alive_count
+
+    def get_total_health(self) -> float:
+        """
+        Returns the sum of the health of the Pokemon in the team that have not fainted.
+
+        :complexity: Best and worse case O(1)
+
+        Returns:
+            float: The total health left in the team.
+        """
+        return self.total_health
+
+    def get_strongest(self):
+        """
+        Returns the alive Pokemon with the highest battle power.
+
+        :complexity: Best and worse case O(1)
+
+        Returns:
+            Pokemon | None: The strongest alive Pokemon, None if every Pokemon has fainted.
+        """
+        return self.members[self.strongest] if self.strongest != -1 else None
+
+    def get_max_battle_power(self) -> float:
+        """
+        Returns the highest battle power of the alive Pokemon in the team.
+
+        :complexity: Best and worse case O(1)
+
+        Returns:
+            float: The highest battle power, 0 if every Pokemon has fainted.
+        """
+        return self.battle_power[self.strongest] if self.strongest != -1 else 0
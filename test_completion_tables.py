@@ -0,0 +1,51 @@
+"""
+This module contains the tests of the Pokedex completion tables, run with: python -m pytest
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+import random
+import pytest
+from battle import Battle
+from battle_mode import BattleMode
+from completion_reference import DivisionBattle, check_completion_tables
+from poke_team import PokeTeam, Trainer
+
+SEEDS = range(40)
+
+
+def play_battle(battle_class: type, battle_mode: BattleMode, seed: int) -> tuple:
+    """
+    Plays a battle between random teams and returns everything it changed.
+
+    :complexity: Best and worse case the complexity of commence_battle.
+
+    Args:
+        battle_class (type): Battle or DivisionBattle.
+        battle_mode (BattleMode): The battle mode.
+        seed (int): The seed used to pick the teams and the criterion.
+
+    Returns:
+        tuple: The name of the winning trainer, None for a draw, the number of rounds played, and the final health
+        and level of each Pokemon of both teams.
+    """
+    random.seed(seed)
+    criterion = PokeTeam.CRITERION_LIST[seed % len(PokeTeam.CRITERION_LIST)]
+    trainer_1 = Trainer("Gary")
+    trainer_2 = Trainer("Ash")
+    battle = battle_class(trainer_1, trainer_2, battle_mode, criterion)
+    battle._create_teams()
+    winner = battle.commence_battle()
+    pokemon = [(p.get_name(), p.get_health(), p.get_level())
+               for trainer in (trainer_1, trainer_2) for p in trainer.get_team().original_team]
+    return winner.get_name() if winner is not None else None, battle.rounds_played, pokemon
+
+
+def test_tables_match_division():
+    check_completion_tables()
+
+
+@pytest.mark.parametrize("battle_mode", list(BattleMode), ids=lambda battle_mode: battle_mode.name)
+def test_battles_match_division(battle_mode):
+    for seed in SEEDS:
+        assert play_battle(Battle, battle_mode, seed) == play_battle(DivisionBattle, battle_mode, seed), seed
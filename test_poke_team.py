@@ -0,0 +1,51 @@
+"""
+This module contains the tests of the OPTIMISE mode team order, run with: python -m pytest
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+import random
+import pytest
+from poke_team import PokeTeam
+
+SEEDS = range(300)
+
+
+def get_keys(team: PokeTeam) -> list:
+    """
+    Returns the keys of the OPTIMISE team in order.
+
+    :complexity: Best and worse case O(n) where n is the number of Pokemon in the team.
+
+    Args:
+        team (PokeTeam): The team.
+
+    Returns:
+        list: The keys of the team.
+    """
+    return [team.team[i].key for i in range(len(team.team))]
+
+
+@pytest.mark.parametrize("criterion", [{"speed": -1}, {"battle_power": 1, "defence": -2}, "experience"],
+                         ids=["negative", "mixed", "zero"])
+def test_reorder_front_keeps_order(criterion):
+    order_getter = PokeTeam.get_order_getter(criterion)
+    for seed in SEEDS:
+        random.seed(seed)
+        team = PokeTeam()
+        team.choose_randomly()
+        team.assign_team(criterion)
+        expected = get_keys(team)
+        team.reorder_front(order_getter)
+        assert get_keys(team) == expected, seed
+
+        team.optimise_special()
+        flipped = [-key for key in reversed(expected)]
+        assert team.flipped and get_keys(team) == flipped, seed
+        team.reorder_front(order_getter)
+        team.reorder_front(order_getter)
+        assert get_keys(team) == flipped, seed
+        assert get_keys(team) == sorted(-order_getter(item.value) for item in team.team.array[:len(team.team)]), seed
+
+        team.optimise_special()
+        assert not team.flipped and get_keys(team) == expected, seed
@@ -0,0 +1,316 @@
+"""
+This module contains the TournamentPlayer and Tournament classes
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+import os
+from array import array
+from battle import Battle
+from battle_mode import BattleMode
+from poke_team import Trainer
+from worker_pool import run_bounded
+# Outcome of a match from the point of view of the trainer in the row of the result matrix
+from outcome import UNPLAYED, WIN, LOSS, DRAW, get_outcome
+
+
+class TournamentPlayer:
+    """
+    Plays matches between trainers, restoring both trainers to their state at the start of the tournament before every
+    match instead of regenerating their teams.
+    """
+
+    def __init__(self, trainers: list[Trainer], battle_mode: BattleMode, criterion: str = "health") -> None:
+        """
+        Initializes a new instance of the TournamentPlayer class, healing and structuring every team for the battle
+        mode with regenerate_team and taking a snapshot of every trainer.
+
+        :complexity: Best and worse case O(k*n) for SET and ROTATE, and O(k*n^2) for OPTIMISE, where k is the number of
+                     trainers and n is the number of Pokemon in each team.
+
+        Args:
+            trainers (list[Trainer]): The trainers in the tournament.
+            battle_mode (BattleMode): The battle mode of every match.
+            criterion (str, optional): The criterion to sort the teams for Optimise mode. Defaults to "health".
+        """
+        self.trainers = trainers
+        self.battle_mode = battle_mode
+        self.criterion = criterion
+        self.states = []
+        for trainer in trainers:
+            trainer.get_team().regenerate_team(battle_mode, criterion)
+            self.states.append(trainer.snapshot())
+
+    @classmethod
+    def from_specs(cls, specs: list[tuple], battle_mode: BattleMode, criterion: str) -> "TournamentPlayer":
+        """
+        Creates a TournamentPlayer from the specs returned by get_specs, for use in a worker process.
+
+        :complexity: Best and worse case O(k*n*m) where k is the number of trainers, n is the number of Pokemon in each
+                     team and m is the number of Pokemon in the POKE_LIST.
+
+        Args:
+            specs (list[tuple]): The name, species and state of each trainer.
+            battle_mode (BattleMode): The battle mode of every match.
+            criterion (str): The criterion to sort the teams for Optimise mode.
+
+        Returns:
+            TournamentPlayer: A player with a copy of every trainer.
+        """
+        player = cls([], battle_mode, criterion)
+        for name, species, state in specs:
+            trainer = Trainer(name)
+            trainer.pick_species(species)
+            trainer.restore(state)
+            player.trainers.append(trainer)
+            player.states.append(state)
+        return player
+
+    def get_specs(self) -> list[tuple]:
+        """
+        Returns the name, species and state of each trainer as values, so that the trainers can be sent to worker
+        processes.
+
+        :complexity: Best and worse case O(k*n) where k is the number of trainers and n is the number of Pokemon in
+                     each team.
+
+        Returns:
+            list[tuple]: The name, species names and snapshot of each trainer.
+        """
+        specs = []
+        for trainer, state in zip(self.trainers, self.states):
+            species = [type(pokemon).__name__ for pokemon in trainer.get_team().original_team]
+            specs.append((trainer.get_name(), species, state))
+        return specs
+
+    def play(self, index_1: int, index_2: int) -> int:
+        """
+        Plays a match between two trainers from their state at the start of the tournament.
+
+        :complexity: Best and worse case O(n + b) where n is the number of Pokemon in each team and b is the complexity
+                     of commence_battle.
+
+        Args:
+            index_1 (int): The index of the first trainer.
+            index_2 (int): The index of the second trainer.
+
+        Returns:
+            int: WIN, LOSS or DRAW for the first trainer.
+        """
+        trainer_1 = self.trainers[index_1]
+        trainer_2 = self.trainers[index_2]
+        trainer_1.restore(self.states[index_1])
+        trainer_2.restore(self.states[index_2])
+        winner = Battle(trainer_1, trainer_2, self.battle_mode, self.criterion).commence_battle()
+        return get_outcome(winner, trainer_1, trainer_2)
+
+    def play_segment(self, row: int, start: int, end: int) -> bytes:
+        """
+        Plays the trainer at row against every trainer from start up to but not including end.
+
+        :complexity: Best and worse case O(s*(n + b)) where s is the length of the segment, n is the number of Pokemon
+                     in each team and b is the complexity of commence_battle.
+
+        Args:
+            row (int): The index of the trainer in the row.
+            start (int): The index of the first opponent.
+            end (int): The index after the last opponent.
+
+        Returns:
+            bytes: The outcome of each match for the trainer in the row.
+        """
+        return bytes(self.play(row, column) for column in range(start, end))
+
+
+_worker_player = None
+
+
+def _initialise_worker(specs: list[tuple], mode_value: int, criterion: str) -> None:
+    """
+    Creates the trainers of a worker process once, before it plays any segments.
+
+    :complexity: Best and worse case O(k*n*m), the complexity of TournamentPlayer.from_specs.
+    """
+    global _worker_player
+    _worker_player = TournamentPlayer.from_specs(specs, BattleMode(mode_value), criterion)
+
+
+def _play_worker_segment(row: int, start: int, end: int) -> tuple[int, int, bytes]:
+    """
+    Plays a segment in a worker process.
+
+    :complexity: Best and worse case O(s*(n + b)), the complexity of TournamentPlayer.play_segment.
+    """
+    return row, start, _worker_player.play_segment(row, start, end)
+
+
+class Tournament:
+    """
+    Plays a round robin tournament where every pair of trainers battles once, storing the outcomes in a dense k*k
+    matrix. Matches are scheduled in segments of one row of the matrix, so the schedule is never stored, and a
+    tournament saved part way can be resumed by skipping the matches that have already been played.
+    """
+
+    SEGMENT_SIZE = 64
+
+    def __init__(self, trainers: list[Trainer], battle_mode: BattleMode, criterion: str = "health",
+                 workers: int = 1) -> None:
+        """
+        Initializes a new instance of the Tournament class.
+
+        :complexity: Best and worse case O(k^2 + k*n) for SET and ROTATE, and O(k^2 + k*n^2) for OPTIMISE, where k is
+                     the number of trainers and n is the number of Pokemon in each team.
+
+        Args:
+            trainers (list[Trainer]): The trainers in the tournament, each with a team already picked.
+            battle_mode (BattleMode): The battle mode of every match.
+            criterion (str, optional): The criterion to sort the teams for Optimise mode. Defaults to "health".
+            workers (int, optional): The number of worker processes, where 1 plays every match in this process.
+                                     Defaults to 1.
+        """
+        self.player = TournamentPlayer(trainers, battle_mode, criterion)
+        self.size = len(trainers)
+        self.workers = workers
+        self.results = array("b", bytes(self.size * self.size))
+
+    def get_result(self, index_1: int, index_2: int) -> int:
+        """
+        Returns the outcome of the match between two trainers.
+
+        :complexity: Best and worse case O(1)
+
+        Args:
+            index_1 (int): The index of the first trainer.
+            index_2 (int): The index of the second trainer.
+
+        Returns:
+            int: UNPLAYED, WIN, LOSS or DRAW for the first trainer.
+        """
+        return self.results[index_1 * self.size + index_2]
+
+    def _record(self, row: int, start: int, outcomes: bytes) -> None:
+        """
+        Records the outcomes of a segment in both halves of the result matrix.
+
+        :complexity: Best and worse case O(s) where s is the length of the segment.
+        """
+        mirror = (UNPLAYED, LOSS, WIN, DRAW)
+        for offset, outcome in enumerate(outcomes):
+            column = start + offset
+            self.results[row * self.size + column] = outcome
+            self.results[column * self.size + row] = mirror[outcome]
+
+    def segments(self):
+        """
+        Yields each segment of unplayed matches as the row, the first column and the column after the last, where
+        every column is after the row so each pair is played once.
+
+        :complexity: Best and worse case O(k^2) over all segments, where k is the number of trainers.
+        """
+        for row in range(self.size - 1):
+            offset = row * self.size
+            start = None
+            for column in range(row + 1, self.size):
+                if self.results[offset + column] == UNPLAYED:
+                    if start is None:
+                        start = column
+                    if column + 1 - start == self.SEGMENT_SIZE:
+                        yield row, start, column + 1
+                        start = None
+                elif start is not None:
+                    yield row, start, column
+                    start = None
+            if start is not None:
+                yield row, start, self.size
+
+    def is_complete(self) -> bool:
+        """
+        Returns True if every pair of trainers has played.
+
+        :complexity: Best and worse case O(k^2) where k is the number of trainers.
+        """
+        return self.results.count(UNPLAYED) == self.size
+
+    def run(self, path: str = None, checkpoint_interval: int = 1000) -> None:
+        """
+        Plays every unplayed match, saving the result matrix to a file every checkpoint_interval segments if a path is
+        given, so that the tournament can be resumed with load.
+
+        :complexity: Best and worse case O(k^2 * (n + b)) where k is the number of trainers, n is the number of Pokemon
+                     in each team and b is the complexity of commence_battle.
+
+        Args:
+            path (str, optional): The file to save the result matrix to. Defaults to None.
+            checkpoint_interval (int, optional): The number of segments between saves. Defaults to 1000.
+        """
+        recorded = 0
+
+        def play_segment(row: int, start: int, end: int) -> tuple[int, int, bytes]:
+            return row, start, self.player.play_segment(row, start, end)
+
+        def record(result: tuple[int, int, bytes]) -> None:
+            nonlocal recorded
+            self._record(*result)
+            recorded += 1
+            if path is not None and recorded % checkpoint_interval == 0:
+                self.save(path)
+
+        # The worker processes create their trainers once, and the schedule is generated lazily
+        initargs = (self.player.get_specs(), self.player.battle_mode.value, self.player.criterion) \
+            if self.workers > 1 else ()
+        run_bounded(_play_worker_segment, self.segments(), record, self.workers, play_segment, _initialise_worker,
+                    initargs)
+        if path is not None:
+            self.save(path)
+
+    def save(self, path: str) -> None:
+        """
+        Saves the number of trainers, the battle mode and the result matrix to a binary file. The file is written to
+        a temporary file and renamed, so a crash during a save leaves the previous save to resume from.
+
+        :complexity: Best and worse case O(k^2) where k is the number of trainers.
+
+        Args:
+            path (str): The file to save to.
+        """
+        with open(path + ".tmp", "wb") as file:
+            file.write(self.size.to_bytes(4, "little"))
+            file.write(self.player.battle_mode.value.to_bytes(1, "little"))
+            self.results.tofile(file)
+        os.replace(path + ".tmp", path)
+
+    def load(self, path: str) -> None:
+        """
+        Loads the result matrix saved by save, so that run only plays the remaining matches.
+
+        :complexity: Best and worse case O(k^2) where k is the number of trainers.
+
+        Args:
+            path (str): The file to load from.
+
+        Raises:
+            Exception: If the file was saved by a tournament with a different number of trainers or battle mode
+        """
+        with open(path, "rb") as file:
+            size = int.from_bytes(file.read(4), "little")
+            mode_value = int.from_bytes(file.read(1), "little")
+            if size != self.size or mode_value != self.player.battle_mode.value:
+                raise Exception("Saved tournament does not match")
+            results = array("b")
+            results.fromfile(file, size * size)
+        self.results = results
+
+    def get_standings(self) -> array:
+        """
+        Returns the number of wins of each trainer.
+
+        :complexity: Best and worse case O(k^2) where k is the number of trainers.
+
+        Returns:
+            array: The number of wins of each trainer, in the same order as the trainers.
+        """
+        wins = array("i", bytes(4 * self.size))
+        for index in range(self.size):
+            offset = index * self.size
+            wins[index] = self.results[offset:offset + self.size].count(WIN)
+        return wins
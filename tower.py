@@ -75,24 +75,55 @@ class BattleTower:
         """
         return self.enemy_lives > 0 and self.trainer.lives > 0
 
-    def next_battle(self) -> Tuple[Trainer, Trainer, Trainer, int, int]:
+    def play_battle(self, enemy: Trainer) -> Trainer | None:
         """
-        Simulates one battle in the tower, between the player team and the next enemy team. 
-        
-        :complexity: Best and worse case O(n*max(k1,k2) + r), where n is the number of rounds played until one of the 
+        Simulates one battle in the tower, between the player team and an enemy team that has been served from the
+        queue, and updates the lives of both. Returns only the winner, so callers that do not need the full battle
+        result can avoid building it.
+
+        :complexity: Best and worse case O(n*max(k1,k2) + r), where n is the number of rounds played until one of the
                      teams win, k1 and k2 are the size of the bit vector of the Pokedex for trainer 1 and 2 and r is the
-                     complexity of the regenerate_team method in the PokeTeam class, which is affected by the number of
-                     Pokemon in the team and the battle mode.
+                     complexity of the regenerate_team method in the PokeTeam class.
+
+        Args:
+            enemy (Trainer): The enemy trainer served from the queue.
 
         Returns:
-            Tuple[Trainer, Trainer, Trainer, int, int]: The battle result, the player trainer, the enemy trainer, 
-            the player lives remaining after the battle, and the enemy lives remaining after the battle
+            Trainer | None: The winning trainer of the battle, None if it is a draw
+        """
+        battle = self.prepare_battle(enemy)
+        winner = battle.commence_battle()
+        self.record_battle(enemy, winner)
+        return winner
+
+    def prepare_battle(self, enemy: Trainer) -> Battle:
+        """
+        Regenerates the player team and an enemy team and creates the battle between them, without playing it.
+
+        :complexity: Best and worse case O(r), where r is the complexity of the regenerate_team method in the PokeTeam
+                     class.
+
+        Args:
+            enemy (Trainer): The enemy trainer served from the queue.
+
+        Returns:
+            Battle: The battle between the player and the enemy.
         """
-        enemy = self.enemies.serve()
         self.trainer.get_team().regenerate_team(BattleMode.ROTATE)
         enemy.get_team().regenerate_team(BattleMode.ROTATE)
-        battle = Battle(self.trainer, enemy, BattleMode.ROTATE)
-        winner = battle.commence_battle()
+        return Battle(self.trainer, enemy, BattleMode.ROTATE)
+
+    def record_battle(self, enemy: Trainer, winner: Trainer | None) -> None:
+        """
+        Updates the lives of the player and an enemy after their battle, and returns the enemy to the queue if it has
+        lives left.
+
+        :complexity: Best and worst case is O(1)
+
+        Args:
+            enemy (Trainer): The enemy trainer served from the queue.
+            winner (Trainer | None): The winning trainer of the battle, None if it is a draw
+        """
         if winner is self.trainer:
             enemy.lives -= 1
             self.enemy_lives -= 1
@@ -102,8 +133,25 @@ class BattleTower:
         elif winner is None:
             self.trainer.lives -= 1
             enemy.lives -= 1
+            self.enemy_lives -= 1
         if enemy.lives > 0:
             self.enemies.append(enemy)
+
+    def next_battle(self) -> Tuple[Trainer, Trainer, Trainer, int, int]:
+        """
+        Simulates one battle in the tower, between the player team and the next enemy team. 
+        
+        :complexity: Best and worse case O(n*max(k1,k2) + r), where n is the number of rounds played until one of the 
+                     teams win, k1 and k2 are the size of the bit vector of the Pokedex for trainer 1 and 2 and r is the
+                     complexity of the regenerate_team method in the PokeTeam class, which is affected by the number of
+                     Pokemon in the team and the battle mode.
+
+        Returns:
+            Tuple[Trainer, Trainer, Trainer, int, int]: The battle result, the player trainer, the enemy trainer, 
+            the player lives remaining after the battle, and the enemy lives remaining after the battle
+        """
+        enemy = self.enemies.serve()
+        winner = self.play_battle(enemy)
         return winner, self.trainer, enemy, self.trainer.lives, self.enemy_lives
 
     def enemies_defeated(self) -> int:
@@ -0,0 +1,119 @@
+"""
+This module contains the TowerBatch class
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+import random
+from array import array
+from battle_mode import BattleMode
+from poke_team import Trainer
+from tower import BattleTower
+
+
+class TowerBatch:
+    """
+    Runs many independent battle towers to completion and stores the result of each tower in compact arrays, where
+    index i of every array belongs to the tower made from the ith spec.
+    """
+
+    def __init__(self, specs: list[tuple[int, int, int, int]]) -> None:
+        """
+        Initializes a new instance of the TowerBatch class.
+
+        :complexity: Best and worse case O(t) where t is the number of towers.
+
+        Args:
+            specs (list[tuple[int, int, int, int]]): The seed, minimum lives, maximum lives and number of enemy
+                                                     trainers of each tower.
+        """
+        self.specs = specs
+        self.enemies_defeated = array("i", bytes(4 * len(specs)))
+        self.battles_played = array("i", bytes(4 * len(specs)))
+        self.lives_left = array("i", bytes(4 * len(specs)))
+
+    def run_tower(self, seed: int, min_lives: int, max_lives: int, num_enemies: int) -> tuple[int, int, int]:
+        """
+        Runs one battle tower to completion, with a random player team in ROTATE mode like the TowerExample. The
+        battles use the global random number generator, which is seeded for the tower and restored to the state of the
+        caller afterwards.
+
+        :complexity: Best and worse case O(b*p) where b is the number of battles played and p is the complexity of the
+                     play_battle method in the BattleTower class.
+
+        Args:
+            seed (int): The seed used to pick the teams and lives.
+            min_lives (int): The minimum lives of each trainer.
+            max_lives (int): The maximum lives of each trainer.
+            num_enemies (int): The number of enemy trainers.
+
+        Returns:
+            tuple[int, int, int]: The number of enemies defeated, battles played and player lives left.
+        """
+        state = random.getstate()
+        random.seed(seed)
+        try:
+            player = Trainer()
+            player.pick_team("Random")
+            player.get_team().assemble_team(BattleMode.ROTATE)
+
+            tower = BattleTower()
+            tower.MIN_LIVES = min_lives
+            tower.MAX_LIVES = max_lives
+            tower.set_my_trainer(player)
+            tower.generate_enemy_trainers(num_enemies)
+
+            # Plays each battle without building the result tuple of next_battle
+            battles = 0
+            while tower.battles_remaining():
+                tower.play_battle(tower.enemies.serve())
+                battles += 1
+            return tower.enemies_defeated(), battles, player.lives
+        finally:
+            random.setstate(state)
+
+    def run(self) -> None:
+        """
+        Runs every tower in the batch and stores its results.
+
+        :complexity: Best and worse case O(t*r) where t is the number of towers and r is the complexity of run_tower.
+        """
+        for index, spec in enumerate(self.specs):
+            defeated, battles, lives = self.run_tower(*spec)
+            self.enemies_defeated[index] = defeated
+            self.battles_played[index] = battles
+            self.lives_left[index] = lives
+
+    @staticmethod
+    def get_distribution(values: array) -> array:
+        """
+        Returns the number of towers with each value of a result, where index v of the returned array is the number of
+        towers with the value v.
+
+        :complexity: Best and worse case O(t + m) where t is the number of towers and m is the largest value.
+
+        Args:
+            values (array): One of the result arrays of the batch.
+
+        Returns:
+            array: The count of each value.
+        """
+        counts = array("i", bytes(4 * (max(values, default=0) + 1)))
+        for value in values:
+            counts[value] += 1
+        return counts
+
+    @staticmethod
+    def get_mean(values: array) -> float:
+        """
+        Returns the mean of a result over every tower.
+
+        :complexity: Best and worse case O(t) where t is the number of towers.
+
+        Args:
+            values (array): One of the result arrays of the batch.
+
+        Returns:
+            float: The mean value, or 0 if the batch is empty.
+        """
+        return sum(values) / len(values) if len(values) > 0 else 0.0
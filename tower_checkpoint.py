@@ -0,0 +1,343 @@
+"""
+This module contains the TowerCheckpoint class
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+import os
+import random
+import struct
+from poke_team import PokeTeam, Trainer
+from tower import BattleTower
+from data_structures.queue_adt import CircularQueue
+
+
+class TowerCheckpoint:
+    """
+    Saves the state of a BattleTower to a binary file and loads it back. The file is a sequence of records, where a
+    full record holds the whole state and a delta record only holds the bytes that changed since the previous record,
+    so saving after every battle only writes what the battle changed.
+
+    Each record is a one byte kind, followed by the length of its payload as a 4 byte unsigned integer.
+    """
+
+    FULL = b"F"
+    DELTA = b"D"
+    FULL_INTERVAL = 100
+
+    RECORD_HEADER = struct.Struct("<cI")
+    RUN_HEADER = struct.Struct("<IH")
+    TOWER_HEADER = struct.Struct("<iiiiiii")
+    RANDOM_STATE = struct.Struct("<i625I?d")
+    TRAINER_HEADER = struct.Struct("<iIbiB")
+    POKEMON = struct.Struct("<BBBdddddd")
+
+    MAX_RUN = 0xFFFF
+
+    def __init__(self, path: str) -> None:
+        """
+        Initializes a new instance of the TowerCheckpoint class. Records are appended to the file at path.
+
+        :complexity: Best and worst case is O(1)
+
+        Args:
+            path (str): The file to save the checkpoints to.
+        """
+        self.path = path
+        self.previous = None
+        self.deltas = 0
+        # The end of the last complete record found by load, if a partly written record follows it
+        self.truncate_at = None
+
+    def encode(self, tower: BattleTower) -> bytes:
+        """
+        Encodes the state of the tower as bytes, including the order of the enemy queue, the state of every trainer
+        and the state of the random number generator.
+
+        :complexity: Best and worse case O(t*n) where t is the number of trainers and n is the number of Pokemon in
+                     each team.
+
+        Args:
+            tower (BattleTower): The tower to encode.
+
+        Returns:
+            bytes: The encoded state.
+        """
+        enemies = tower.enemies
+        parts = [self.TOWER_HEADER.pack(tower.MIN_LIVES, tower.MAX_LIVES, tower.enemy_lives, tower.defeated_enemies,
+                                        len(enemies.array), enemies.front, len(enemies))]
+
+        version, internal_state, gauss_next = random.getstate()
+        parts.append(self.RANDOM_STATE.pack(version, *internal_state, gauss_next is not None,
+                                            gauss_next if gauss_next is not None else 0.0))
+
+        # Enemies are stored in the order of their slots in the queue rather than from the front. Serving an enemy and
+        # appending it again to a full queue keeps it in the same slot, so the bytes of each enemy stay in place
+        parts.append(self.encode_trainer(tower.trainer))
+        for slot in self.get_queue_slots(enemies):
+            parts.append(self.encode_trainer(enemies.array[slot]))
+        return b"".join(parts)
+
+    @staticmethod
+    def get_queue_slots(queue: CircularQueue) -> list[int]:
+        """
+        Returns the positions in the array of a circular queue that hold an element, in increasing order.
+
+        :complexity: Best and worse case O(n) where n is the capacity of the queue.
+
+        Args:
+            queue (CircularQueue): The queue.
+
+        Returns:
+            list[int]: The occupied positions in the array.
+        """
+        size = len(queue.array)
+        return sorted((queue.front + i) % size for i in range(len(queue)))
+
+    def encode_trainer(self, trainer: Trainer) -> bytes:
+        """
+        Encodes the name, lives, Pokedex and team of a trainer as bytes.
+
+        :complexity: Best and worse case O(n) where n is the number of Pokemon in the team.
+
+        Args:
+            trainer (Trainer): The trainer to encode.
+
+        Returns:
+            bytes: The encoded trainer.
+        """
+        lives, pokedex, (structure, team_count, order, keys, flipped, states) = trainer.snapshot()
+        trainer_name = trainer.get_name().encode()
+        original_team = trainer.get_team().original_team
+        parts = [struct.pack("<H", len(trainer_name)), trainer_name,
+                 self.TRAINER_HEADER.pack(lives, pokedex, structure, team_count, len(original_team)),
+                 struct.pack("<B", len(order))]
+        # Pads the order and keys to the size of the original team, so the encoded trainer has the same size whenever
+        # Pokemon faint and saves can be made as deltas
+        padding = len(original_team) - len(order)
+        parts.append(bytes(order) + bytes(padding))
+        # The flags byte records whether there are keys, and whether they are flipped in its second bit
+        if keys is not None:
+            parts.append(struct.pack(f"<B{len(original_team)}d", 1 | flipped << 1, *keys,
+                                     *(0.0 for _ in range(padding))))
+        else:
+            parts.append(struct.pack(f"<B{len(original_team)}d", 0, *(0.0 for _ in range(len(original_team)))))
+
+        for pokemon, (health, level, battle_power, stage, experience, defence, speed) in zip(original_team, states):
+            values = (health, level, battle_power, experience, defence, speed)
+            # Records which values are integers, so they are not turned into floats when loaded
+            integers = 0
+            for bit, value in enumerate(values):
+                if isinstance(value, int):
+                    integers |= 1 << bit
+            parts.append(self.POKEMON.pack(pokemon.SPECIES_ID, stage, integers, *values))
+        return b"".join(parts)
+
+    def decode(self, data: bytes) -> BattleTower:
+        """
+        Creates a tower from the bytes returned by encode, and restores the state of the random number generator.
+
+        :complexity: Best and worse case O(t*n*m) where t is the number of trainers, n is the number of Pokemon in
+                     each team and m is the number of Pokemon in the POKE_LIST.
+
+        Args:
+            data (bytes): The encoded state.
+
+        Returns:
+            BattleTower: The tower in the encoded state.
+        """
+        min_lives, max_lives, enemy_lives, defeated_enemies, capacity, front, queued = \
+            self.TOWER_HEADER.unpack_from(data)
+        offset = self.TOWER_HEADER.size
+
+        random_state = self.RANDOM_STATE.unpack_from(data, offset)
+        offset += self.RANDOM_STATE.size
+        gauss_next = random_state[-1] if random_state[-2] else None
+        random.setstate((random_state[0], tuple(random_state[1:-2]), gauss_next))
+
+        tower = BattleTower()
+        tower.MIN_LIVES = min_lives
+        tower.MAX_LIVES = max_lives
+        tower.enemy_lives = enemy_lives
+        tower.defeated_enemies = defeated_enemies
+        tower.trainer, offset = self.decode_trainer(data, offset)
+        # Puts each enemy back in the slot it was saved from
+        enemies = CircularQueue(capacity)
+        enemies.front = front
+        enemies.rear = (front + queued) % capacity
+        enemies.length = queued
+        for slot in self.get_queue_slots(enemies):
+            enemies.array[slot], offset = self.decode_trainer(data, offset)
+        tower.enemies = enemies
+        return tower
+
+    def decode_trainer(self, data: bytes, offset: int) -> tuple[Trainer, int]:
+        """
+        Creates a trainer from the bytes returned by encode_trainer.
+
+        :complexity: Best and worse case O(n*m) where n is the number of Pokemon in the team and m is the number of
+                     Pokemon in the POKE_LIST.
+
+        Args:
+            data (bytes): The encoded state.
+            offset (int): The position of the trainer in data.
+
+        Returns:
+            tuple[Trainer, int]: The trainer and the position after it in data.
+        """
+        (name_length,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        trainer_name = data[offset:offset + name_length].decode()
+        offset += name_length
+        lives, pokedex, structure, team_count, team_size = self.TRAINER_HEADER.unpack_from(data, offset)
+        offset += self.TRAINER_HEADER.size
+        order_length = data[offset]
+        offset += 1
+        order = tuple(data[offset:offset + order_length])
+        offset += team_size
+        flags, *keys = struct.unpack_from(f"<B{team_size}d", data, offset)
+        offset += 1 + 8 * team_size
+        keys = tuple(keys[:order_length]) if flags & 1 else None
+        flipped = bool(flags & 2)
+
+        species = []
+        states = []
+        for _ in range(team_size):
+            species_index, stage, integers, *values = self.POKEMON.unpack_from(data, offset)
+            offset += self.POKEMON.size
+            for bit in range(len(values)):
+                if integers >> bit & 1:
+                    values[bit] = int(values[bit])
+            pokemon_type = PokeTeam.POKE_LIST[species_index]
+            species.append(pokemon_type)
+            health, level, battle_power, experience, defence, speed = values
+            states.append((health, level, battle_power, stage, experience, defence, speed))
+
+        trainer = Trainer(trainer_name)
+        trainer.pick_species(species)
+        trainer.restore((lives, pokedex, (structure, team_count, order, keys, flipped, tuple(states))))
+        return trainer, offset
+
+    def delta(self, previous: bytes, current: bytes) -> bytes:
+        """
+        Returns the runs of bytes in current that differ from previous, each as its offset, its length and the new
+        bytes. Both states must be the same length.
+
+        :complexity: Best and worse case O(s) where s is the length of the states.
+
+        Args:
+            previous (bytes): The previously saved state.
+            current (bytes): The current state.
+
+        Returns:
+            bytes: The encoded runs.
+        """
+        parts = []
+        size = len(current)
+        index = 0
+        while index < size:
+            if previous[index] == current[index]:
+                index += 1
+                continue
+            start = index
+            while index < size and previous[index] != current[index] and index - start < self.MAX_RUN:
+                index += 1
+            parts.append(self.RUN_HEADER.pack(start, index - start))
+            parts.append(current[start:index])
+        return b"".join(parts)
+
+    def apply_delta(self, previous: bytes, delta: bytes) -> bytes:
+        """
+        Returns the state made by applying the runs returned by delta to the previous state.
+
+        :complexity: Best and worse case O(s) where s is the length of the states.
+
+        Args:
+            previous (bytes): The state the delta was made against.
+            delta (bytes): The encoded runs.
+
+        Returns:
+            bytes: The new state.
+        """
+        state = bytearray(previous)
+        offset = 0
+        while offset < len(delta):
+            start, length = self.RUN_HEADER.unpack_from(delta, offset)
+            offset += self.RUN_HEADER.size
+            state[start:start + length] = delta[offset:offset + length]
+            offset += length
+        return bytes(state)
+
+    def save(self, tower: BattleTower) -> None:
+        """
+        Appends the state of the tower to the file, as a delta against the previous save if the size of the state has
+        not changed, or as a full record otherwise and after every FULL_INTERVAL deltas. A partly written record found
+        by load is cut off the file first, so that the new record directly follows the last complete one.
+
+        :complexity: Best and worse case O(t*n) where t is the number of trainers and n is the number of Pokemon in
+                     each team.
+
+        Args:
+            tower (BattleTower): The tower to save.
+        """
+        current = self.encode(tower)
+        if self.previous is not None and len(self.previous) == len(current) and self.deltas < self.FULL_INTERVAL:
+            kind = self.DELTA
+            payload = self.delta(self.previous, current)
+            self.deltas += 1
+        else:
+            kind = self.FULL
+            payload = current
+            self.deltas = 0
+        if self.truncate_at is not None:
+            os.truncate(self.path, self.truncate_at)
+            self.truncate_at = None
+        with open(self.path, "ab") as file:
+            file.write(self.RECORD_HEADER.pack(kind, len(payload)))
+            file.write(payload)
+        self.previous = current
+
+    def load(self) -> BattleTower:
+        """
+        Loads the tower from the last complete record in the file, and restores the state of the random number
+        generator, so that continuing the tower gives the same results as if it had not been stopped. Later saves are
+        made as deltas against the loaded state.
+
+        :complexity: Best and worse case O(f + t*n*m) where f is the size of the file, t is the number of trainers, n
+                     is the number of Pokemon in each team and m is the number of Pokemon in the POKE_LIST.
+
+        Raises:
+            Exception: If the file has no complete full record
+
+        Returns:
+            BattleTower: The tower in the saved state.
+        """
+        with open(self.path, "rb") as file:
+            data = file.read()
+
+        state = None
+        deltas = 0
+        offset = 0
+        end = 0
+        # Stops at a record that was only partly written
+        while offset + self.RECORD_HEADER.size <= len(data):
+            kind, length = self.RECORD_HEADER.unpack_from(data, offset)
+            offset += self.RECORD_HEADER.size
+            if offset + length > len(data):
+                break
+            payload = data[offset:offset + length]
+            offset += length
+            end = offset
+            if kind == self.FULL:
+                state = payload
+                deltas = 0
+            elif state is not None:
+                state = self.apply_delta(state, payload)
+                deltas += 1
+
+        if state is None:
+            raise Exception("No checkpoint saved")
+        self.previous = state
+        self.deltas = deltas
+        self.truncate_at = end if end < len(data) else None
+        return self.decode(state)
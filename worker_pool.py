@@ -0,0 +1,54 @@
+"""
+This module contains the run_bounded function
+"""
+
+__author__ = "Jonah Yip Mathivanan"
+
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+
+def run_bounded(function, tasks, handle, workers: int, local_function=None, initializer=None,
+                initargs: tuple = ()) -> None:
+    """
+    Calls a function with the arguments of each task and passes each result to handle. With more than one worker the
+    tasks are run in worker processes, with at most two tasks per worker in flight so that tasks can be generated
+    lazily, and the results are handled in the order they finish. With one worker, or if processes are not available
+    on this platform, the tasks are run in this process in order with local_function.
+
+    :complexity: Best and worse case O(t*(f + h)) where t is the number of tasks, f is the complexity of the function
+                 and h is the complexity of handle.
+
+    Args:
+        function (Callable): A module level function run in the worker processes.
+        tasks (Iterable[tuple]): The arguments of each call.
+        handle (Callable[[Any], None]): Called in this process with the result of each call.
+        workers (int): The number of worker processes.
+        local_function (Callable, optional): The function run in this process instead. Defaults to None for function.
+        initializer (Callable, optional): Called once in each worker process before its first task. Defaults to None.
+        initargs (tuple, optional): The arguments of the initializer. Defaults to ().
+    """
+    executor = None
+    if workers > 1:
+        try:
+            executor = ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs)
+        except (ImportError, NotImplementedError, OSError):
+            executor = None
+
+    if executor is None:
+        local_function = function if local_function is None else local_function
+        for task in tasks:
+            handle(local_function(*task))
+        return
+
+    with executor:
+        running = set()
+        for task in tasks:
+            running.add(executor.submit(function, *task))
+            if len(running) >= 2 * workers:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    handle(future.result())
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                handle(future.result())